@@ -0,0 +1,48 @@
+"""Compares re.search with raw pattern strings against the precompiled company number regex registry.
+
+With more distinct patterns than re's internal cache holds (re._MAXCACHE), re.search recompiles on most calls.
+
+Run from the repository root:
+    python -m benchmarks.company_number_regex_benchmark
+"""
+import random
+import re
+import string
+import time
+
+from src.business.company_number_registry import CompanyNumberRegexRegistry
+
+COUNTRY_COUNTS = (2, 100, 1_000)
+LOOKUPS = 100_000
+
+
+def country_patterns(count: int):
+    # One distinct pattern per country, shaped like the UK pattern in the sample data
+    return [(f"C{i}", f"^({string.ascii_uppercase[i % 26]}{i}[0-9]{{6}}|[0-9]{{9}})$") for i in range(count)]
+
+
+def main():
+    print(f"{'countries':>10} {'re.search (ms)':>15} {'registry (ms)':>14} {'speedup':>8}")
+    for count in COUNTRY_COUNTS:
+        patterns = country_patterns(count)
+        rng = random.Random(42)
+        lookups = [(patterns[rng.randrange(count)], str(rng.randrange(10 ** 8, 10 ** 9))) for _ in range(LOOKUPS)]
+        registry = CompanyNumberRegexRegistry()
+        for code, regex in patterns:
+            registry.register(code, regex)
+
+        re.purge()
+        start = time.perf_counter()
+        raw_results = [re.search(regex, number) is not None for (_, regex), number in lookups]
+        raw = time.perf_counter() - start
+
+        start = time.perf_counter()
+        registry_results = [registry.validate(code, number, regex) for (code, regex), number in lookups]
+        compiled = time.perf_counter() - start
+
+        assert raw_results == registry_results
+        print(f"{count:>10} {raw * 1e3:>15.1f} {compiled * 1e3:>14.1f} {raw / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
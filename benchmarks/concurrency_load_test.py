@@ -0,0 +1,70 @@
+"""Fires concurrent requests at a running instance of the app and reports throughput and latency.
+
+Start the app in each mode and compare, e.g.:
+    DB_MODE=sync uvicorn main:app --port 8080
+    DB_MODE=async uvicorn main:app --port 8080
+    python -m benchmarks.concurrency_load_test --url http://localhost:8080 --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = ("/country", "/country/GB", "/company?limit=10")
+
+
+async def run_worker(client: httpx.AsyncClient, paths: list[str], queue: asyncio.Queue, latencies: list[float],
+                     errors: list):
+    while True:
+        try:
+            i = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            response = await client.get(paths[i % len(paths)])
+        except httpx.TransportError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 500:
+            errors.append(response.status_code)
+
+
+async def run(url: str, concurrency: int, requests: int, paths: list[str]):
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_worker(client, paths, queue, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"requests={len(latencies)} concurrency={concurrency} errors={len(errors)} seconds={elapsed:.2f}")
+    if errors:
+        print("error_types=" + ",".join(sorted({str(e) for e in errors})))
+    if not latencies:
+        return
+    print(f"requests_per_second={len(latencies) / elapsed:.1f} "
+          f"p50_ms={statistics.median(latencies) * 1e3:.1f} "
+          f"p95_ms={latencies[int(len(latencies) * 0.95) - 1] * 1e3:.1f} "
+          f"max_ms={latencies[-1] * 1e3:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--path", action="append", dest="paths", help="Path to request (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.requests, args.paths or list(DEFAULT_PATHS)))
+
+
+if __name__ == "__main__":
+    main()
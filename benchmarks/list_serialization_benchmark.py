@@ -0,0 +1,95 @@
+"""Compares the ORM/pydantic serialization of GET /company and GET /country with the fast JSON path.
+
+Seeds a temporary SQLite database, then requests each page size through the app with FAST_JSON_RESPONSES off and on
+and checks that both return the same bytes.
+
+Run from the repository root (DATABASE_URL must be set as for the app, the benchmark data goes to a temporary
+database instead):
+    python -m benchmarks.list_serialization_benchmark [--no-orjson]
+"""
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from src.business.pydantic_schemas.company import CompanyCreate
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.db import config
+from src.db.db_setup import Base, get_session
+from src.db.models.country import Country
+from src.persistence.utilities.company_crud import create_companies
+from src.persistence.utilities.score_crud import create_scores
+from src.presentation import json_response
+
+PAGE_SIZES = (10, 100, 1_000, 5_000)
+COMPANIES = 5_000
+YEARS = range(2016, 2021)
+
+
+def seed(session_local: sessionmaker):
+    rng = random.Random(42)
+    with session_local() as db:
+        db.add_all(Country(alpha_2_iso_code=f"{chr(65 + i // 26)}{chr(65 + i % 26)}", name=f"Country {i}",
+                           company_number_regex="^.*$") for i in range(250))
+        companies = create_companies(db=db, companies=[CompanyCreate(company_number=str(10000000 + i),
+                                                                     country_alpha_2_iso_code="AA")
+                                                       for i in range(COMPANIES)])
+        create_scores(db=db, scores=[ScoreCreate(company_id=c.id, year=y, zscore=round(rng.uniform(-5, 10), 2))
+                                     for c in companies for y in YEARS])
+        db.commit()
+
+
+def best_of(client: TestClient, url: str, repeat: int = 5):
+    best, content = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - start)
+        content = response.content
+    return best, content
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-orjson", action="store_true", help="Render with the standard library encoder.")
+    if parser.parse_args().no_orjson:
+        json_response.orjson = None
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + str(Path(directory) / "benchmark.db"),
+                               connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        seed(session_local)
+
+        def get_benchmark_session():
+            with session_local() as db:
+                yield db
+
+        app.dependency_overrides[get_session] = get_benchmark_session
+        settings = config.get_settings()
+        print(f"encoder={'orjson' if json_response.orjson is not None else 'json'} companies={COMPANIES} "
+              f"scores_per_company={len(YEARS)}")
+        print(f"{'url':>42} {'orm (ms)':>9} {'fast (ms)':>10} {'speedup':>8} {'identical':>9}")
+        with TestClient(app) as client:
+            for url in [f"/company?limit={size}" for size in PAGE_SIZES] + \
+                       ["/company?limit=1000&include_scores=false", "/country?limit=250"]:
+                settings.fast_json_responses = False
+                orm, orm_content = best_of(client, url)
+                settings.fast_json_responses = True
+                fast, fast_content = best_of(client, url)
+                print(f"{url:>42} {orm * 1e3:>9.1f} {fast * 1e3:>10.1f} {orm / fast:>7.1f}x "
+                      f"{'yes' if orm_content == fast_content else 'NO':>9}")
+        app.dependency_overrides.pop(get_session)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Times the service and CRUD functions on an in-memory SQLite database and checks them against a stored baseline.
+
+Each function is run with several payload sizes. For every case the median and best time per call of --repeat runs are
+recorded, plus the peak traced memory and the number of allocated blocks still alive after a separate tracemalloc run
+(tracing slows everything down, so it isn't timed). A case regresses when its best time or peak memory exceeds the
+baseline by more than --threshold (a fraction, default 0.5) and by more than 5 us or 16 KiB, in which case the exit code
+is 1. The best time is compared rather than the median: other load on the machine only ever adds time, so the fastest
+of the runs is the most repeatable figure, while the median moves by tens of percent between identical runs.
+
+Run from the repository root (DATABASE_URL must be set as for the app, but isn't used):
+    python -m benchmarks.micro_benchmark
+    python -m benchmarks.micro_benchmark --only request_scores --threshold 1.0
+    python -m benchmarks.micro_benchmark --update-baseline
+Timings depend on the machine, so update the baseline on the machine that runs the comparison.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.business.company_service import get_or_create_company, validate_company_number_with_regex
+from src.business.pydantic_schemas.financials import Financials
+from src.business.score_service import calculate_score, validate_financials, request_scores
+from src.db.db_setup import Base
+from src.db.models import country, company, score, score_history, job
+from src.persistence.utilities.country_cache import country_cache
+
+BASELINE_PATH = Path(__file__).with_name("micro_benchmark_baseline.json")
+GB_REGEX = "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8})$"
+MIN_RUN_SECONDS = 0.02
+# Differences below these are noise (allocator and timer granularity), whatever the percentage
+MIN_REGRESSION = {"best_us": 5.0, "peak_bytes": 16384}
+
+
+def random_financials(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [Financials(year=2000 + i,
+                       ebit=rng.uniform(-1e4, 1e4),
+                       equity=rng.uniform(-1e4, 1e4),
+                       retained_earnings=rng.uniform(-1e4, 1e4),
+                       sales=rng.uniform(0, 1e5),
+                       total_assets=rng.uniform(1, 1e5),
+                       total_liabilities=rng.uniform(1, 1e5),
+                       working_capital=rng.uniform(-1e4, 1e4)) for i in range(count)]
+
+
+def create_session_local():
+    # StaticPool keeps the single connection, and with it the in-memory database, alive between sessions
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_local() as db:
+        db.add(country.Country(alpha_2_iso_code="GB", name="United Kingdom", company_number_regex=GB_REGEX))
+        db.commit()
+    country_cache.invalidate()
+    return session_local
+
+
+# Each case factory takes the payload size and returns a function that runs the case once
+def calculate_score_case(size: int):
+    financials_list = random_financials(size)
+    return lambda: [calculate_score(f) for f in financials_list]
+
+
+def validate_financials_case(size: int):
+    financials_list = random_financials(size)
+    return lambda: validate_financials(financials_list)
+
+
+def validate_company_number_with_regex_case(size: int):
+    rng = random.Random(42)
+    company_numbers = [str(rng.randrange(10 ** 7, 10 ** 8)) for _ in range(size)]
+    return lambda: [validate_company_number_with_regex(n, GB_REGEX) for n in company_numbers]
+
+
+def get_existing_company_case(size: int):
+    db = create_session_local()()
+    company_numbers = [str(10000000 + i) for i in range(size)]
+    for company_number in company_numbers:
+        get_or_create_company(company_number=company_number, country_iso_code="GB", db=db)
+    return lambda: [get_or_create_company(company_number=n, country_iso_code="GB", db=db) for n in company_numbers]
+
+
+def get_new_company_case(size: int):
+    db = create_session_local()()
+    company_numbers = (str(n) for n in itertools.count(10000000))
+    return lambda: [get_or_create_company(company_number=next(company_numbers), country_iso_code="GB", db=db)
+                    for _ in range(size)]
+
+
+def request_scores_case(size: int):
+    db = create_session_local()()
+    existing_company = get_or_create_company(company_number="12345678", country_iso_code="GB", db=db)
+    financials_list = random_financials(size)
+    return lambda: request_scores(financials_list=financials_list, company=existing_company, db=db)
+
+
+CASES = {
+    "calculate_score": (calculate_score_case, (1, 100, 10_000)),
+    "validate_financials": (validate_financials_case, (1, 100, 10_000)),
+    "validate_company_number_with_regex": (validate_company_number_with_regex_case, (1, 100, 10_000)),
+    "get_or_create_company[existing]": (get_existing_company_case, (1, 10, 100)),
+    "get_or_create_company[new]": (get_new_company_case, (1, 10, 100)),
+    "request_scores": (request_scores_case, (1, 10, 100)),
+}
+
+
+def calibrate(run):
+    run()
+    # Calls per timed run, so that every run lasts long enough for the clock resolution not to matter
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - start >= MIN_RUN_SECONDS or number >= 10_000:
+            return number
+        number *= 10
+
+
+def time_run(run, number: int):
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return (time.perf_counter() - start) / number
+
+
+def measure(runs: dict, repeat: int):
+    numbers = {key: calibrate(run) for key, run in runs.items()}
+    # The runs of all cases take turns, so that each case is timed throughout the benchmark rather than in one stretch
+    # that a burst of load on the machine could cover entirely
+    timings = {key: [] for key in runs}
+    for _ in range(repeat):
+        for key, run in runs.items():
+            timings[key].append(time_run(run, numbers[key]))
+    return {key: {"median_us": round(statistics.median(timings[key]) * 1e6, 3),
+                  "best_us": round(min(timings[key]) * 1e6, 3),
+                  **measure_memory(run)} for key, run in runs.items()}
+
+
+def measure_memory(run):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    run()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "filename"))
+    return {"peak_bytes": peak_bytes, "retained_blocks": retained_blocks}
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, minimum in MIN_REGRESSION.items():
+            if result[metric] > previous[metric] * (1 + threshold) and result[metric] - previous[metric] >= minimum:
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {result[metric]} "
+                                   f"({(result[metric] / previous[metric] - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="Run these functions only.")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown/memory growth over the baseline as a fraction.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store this run's results as the baseline (merged with the existing entries).")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to this JSON file.")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+    runs = {f"{name}/{size}": CASES[name][0](size) for name in args.only or CASES for size in CASES[name][1]}
+    results = measure(runs, args.repeat)
+    print(f"{'case':<44} {'median (us)':>12} {'best (us)':>12} {'peak (KiB)':>11} {'blocks':>7} {'vs baseline':>12}")
+    for key, result in results.items():
+        previous = baseline.get(key)
+        change = f"{(result['best_us'] / previous['best_us'] - 1) * 100:+.0f}%" if previous else "-"
+        print(f"{key:<44} {result['median_us']:>12.1f} {result['best_us']:>12.1f} "
+              f"{result['peak_bytes'] / 1024:>11.1f} {result['retained_blocks']:>7} {change:>12}")
+
+    report = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.update_baseline:
+        report["results"] = dict(sorted({**baseline, **results}.items()))
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print("Baseline updated: " + str(args.baseline))
+        return
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over the {args.threshold:.0%} threshold:")
+        for regression in regressions:
+            print("  " + regression)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compares the scalar calculate_score loop with the vectorised score engine.
+
+Run from the repository root (DATABASE_URL must be set as for the app):
+    python -m benchmarks.score_engine_benchmark
+"""
+import random
+import time
+
+from src.business.pydantic_schemas.financials import Financials
+from src.business.score_engine import calculate_scores, calculate_scores_from_columns, financials_to_columns
+from src.business.score_service import calculate_score
+
+ROW_COUNTS = (10, 1_000, 100_000)
+
+
+def random_financials(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [Financials(year=2000 + i % 20,
+                       ebit=rng.uniform(-1e4, 1e4),
+                       equity=rng.uniform(-1e4, 1e4),
+                       retained_earnings=rng.uniform(-1e4, 1e4),
+                       sales=rng.uniform(0, 1e5),
+                       total_assets=rng.uniform(1, 1e5),
+                       total_liabilities=rng.uniform(1, 1e5),
+                       working_capital=rng.uniform(-1e4, 1e4)) for i in range(count)]
+
+
+def best_of(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(f"{'rows':>8} {'scalar (ms)':>12} {'engine (ms)':>12} {'columns (ms)':>13} {'speedup':>8} {'columns':>8}")
+    for count in ROW_COUNTS:
+        financials_list = random_financials(count)
+        columns = financials_to_columns(financials_list)
+        repeat = 5 if count >= 100_000 else 50
+        scalar = best_of(lambda: [calculate_score(f) for f in financials_list], repeat)
+        engine = best_of(lambda: calculate_scores(financials_list), repeat)
+        column_engine = best_of(lambda: calculate_scores_from_columns(columns), repeat)
+        print(f"{count:>8} {scalar * 1e3:>12.3f} {engine * 1e3:>12.3f} {column_engine * 1e3:>13.3f} "
+              f"{scalar / engine:>7.1f}x {scalar / column_engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measures how parsing, validation and scoring of import rows scale with the number of worker processes.
+
+Only the CPU-bound half of an import (score_lines) is timed; the DB writes always stay in the parent process.
+Run from the repository root (DATABASE_URL must be set as for the app):
+    python -m benchmarks.score_process_pool_benchmark [--rows 200000] [--chunk-size 1000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import time
+from collections import deque
+
+from src.business.score_import import score_lines
+from src.business.score_process_pool import ScoreProcessPool
+
+COLUMNS = ["country_iso_code", "company_number", "year", "ebit", "equity", "retained_earnings", "sales",
+           "total_assets", "total_liabilities", "working_capital"]
+
+
+def random_lines(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [(i + 2, f"GB,{10000000 + i // 5},{2015 + i % 5},{rng.uniform(-1e4, 1e4):.2f},{rng.uniform(-1e4, 1e4):.2f},"
+                    f"{rng.uniform(-1e4, 1e4):.2f},{rng.uniform(0, 1e5):.2f},{rng.uniform(1, 1e5):.2f},"
+                    f"{rng.uniform(1, 1e5):.2f},{rng.uniform(-1e4, 1e4):.2f}\n") for i in range(count)]
+
+
+def run_serial(chunks):
+    return [score_lines("csv", COLUMNS, chunk) for chunk in chunks]
+
+
+def run_pool(process_pool: ScoreProcessPool, chunks):
+    # Same submission pattern as import_scores: at most max_pending chunks in flight, results consumed in order
+    results, pending = [], deque()
+    for chunk in chunks:
+        pending.append(process_pool.submit(score_lines, "csv", COLUMNS, chunk))
+        while len(pending) >= process_pool.max_pending:
+            results.append(pending.popleft().result())
+    results.extend(f.result() for f in pending)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    lines = random_lines(args.rows)
+    chunks = [lines[i:i + args.chunk_size] for i in range(0, len(lines), args.chunk_size)]
+    start = time.perf_counter()
+    expected = run_serial(chunks)
+    serial = time.perf_counter() - start
+    print(f"cpus={os.cpu_count()} rows={args.rows} chunk_size={args.chunk_size}")
+    print(f"{'workers':>8} {'seconds':>8} {'rows/s':>10} {'speedup':>8} {'identical':>9}")
+    print(f"{'serial':>8} {serial:>8.2f} {args.rows / serial:>10.0f} {1:>7.2f}x {'yes':>9}")
+    for workers in args.workers:
+        process_pool = ScoreProcessPool(workers=workers)
+        run_pool(process_pool, chunks[:workers])  # start the worker processes outside the timed run
+        start = time.perf_counter()
+        results = run_pool(process_pool, chunks)
+        elapsed = time.perf_counter() - start
+        process_pool.shutdown()
+        print(f"{workers:>8} {elapsed:>8.2f} {args.rows / elapsed:>10.0f} {serial / elapsed:>7.2f}x "
+              f"{'yes' if results == expected else 'NO':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,26 @@ from fastapi import FastAPI
 from src.presentation.company_controller import company_router
 from src.presentation.score_controller import score_router
 from src.presentation.country_controller import country_router
-from src.db.db_setup import engine
-from src.db.models import country, company, score
+from src.presentation.metrics_controller import metrics_router
+from src.presentation.job_controller import job_router
+from src.presentation.profile_controller import profile_router
+from src.presentation.profiling_middleware import ProfilingMiddleware
+from src.presentation.query_metrics_middleware import QueryMetricsMiddleware
+from src.presentation.request_metrics_middleware import RequestMetricsMiddleware
+from src.business.score_process_pool import shutdown_score_process_pool
+from src.db import config
+from src.db.db_setup import engine, async_engine
+from src.db.log_config import configure_logging
+from src.db.query_metrics import instrument_engine
+from src.db.models import country, company, score, score_history, job
+
+configure_logging(config.get_settings())
 
 country.Base.metadata.create_all(bind=engine)
 company.Base.metadata.create_all(bind=engine)
 score.Base.metadata.create_all(bind=engine)
+score_history.Base.metadata.create_all(bind=engine)
+job.Base.metadata.create_all(bind=engine)
 
 tags_metadata = [
     {
@@ -35,3 +49,30 @@ app = FastAPI(
 app.include_router(company_router)
 app.include_router(country_router)
 app.include_router(score_router)
+app.include_router(metrics_router)
+app.include_router(job_router)
+
+if config.get_settings().query_metrics_enabled:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(QueryMetricsMiddleware)
+
+if config.get_settings().request_metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+
+if config.get_settings().profiling_enabled:
+    app.include_router(profile_router)
+    app.add_middleware(ProfilingMiddleware, token=config.get_settings().profiling_token,
+                       sample_rate=config.get_settings().profiling_sample_rate)
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+def shutdown_process_pool():
+    shutdown_score_process_pool()
@@ -0,0 +1,171 @@
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class Counter:
+    # Metrics are kept as plain dicts keyed by the tuple of label values, so that recording a sample is a dict lookup
+    # and an addition under a lock
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {} if label_names else {(): 0.0}
+
+    def inc(self, amount: float = 1, labels: tuple = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple = ()):
+        return self._values.get(labels, 0.0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(zip(self.label_names, labels)), value)
+                    for labels, value in sorted(self._values.items())]
+
+    def reset(self):
+        with self._lock:
+            self._values = {} if self.label_names else {(): 0.0}
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, labels: tuple = ()):
+        self.inc(-amount, labels)
+
+    def set(self, value: float, labels: tuple = ()):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._lock = threading.Lock()
+        # Per label values: the count of each bucket (not cumulative, that is left to samples()) and the sum
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * len(self.buckets), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, labels: tuple = ()):
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry is not None else 0
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            values = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._values.items())
+        for labels, (counts, total) in values:
+            label_dict = dict(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((self.name + "_bucket", {**label_dict, "le": format_value(bound)}, cumulative))
+            samples.append((self.name + "_count", label_dict, cumulative))
+            samples.append((self.name + "_sum", label_dict, total))
+        return samples
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: list[Counter | Gauge | Histogram] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, extra_metrics: list = ()):
+        return "".join(format_metric(m.name, m.type, m.documentation, m.samples())
+                       for m in list(self.metrics) + list(extra_metrics))
+
+    def reset(self):
+        for metric in self.metrics:
+            metric.reset()
+
+
+def format_metric(name: str, metric_type: str, documentation: str, samples: list[tuple[str, dict, float]]):
+    lines = ["# HELP " + name + " " + documentation.replace("\\", "\\\\").replace("\n", "\\n"),
+             "# TYPE " + name + " " + metric_type]
+    for sample_name, labels, value in samples:
+        if labels:
+            sample_name += "{" + ",".join(k + '="' + __escape_label_value(str(v)) + '"'
+                                          for k, v in labels.items()) + "}"
+        lines.append(sample_name + " " + format_value(value))
+    return "\n".join(lines) + "\n"
+
+
+def format_value(value: float):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def get_db_pool_metrics(pools: dict[str, dict | None]):
+    # Gauges and counters read from get_pool_status() at scrape time, one series per pool
+    metrics = []
+    for metric_class, name, documentation, key in (
+            (Gauge, "db_pool_size", "Configured number of pooled connections.", "pool_size"),
+            (Gauge, "db_pool_checked_out", "Connections currently checked out.", "checked_out"),
+            (Gauge, "db_pool_checked_in", "Idle connections in the pool.", "checked_in"),
+            (Gauge, "db_pool_overflow", "Connections currently open beyond the pool size.", "overflow"),
+            (Counter, "db_pool_checkouts_total", "Connection checkouts.", "checkouts"),
+            (Counter, "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection.", "timeouts"),
+            (Counter, "db_pool_wait_seconds_total", "Time spent waiting for connections.", "wait_seconds_total")):
+        metric = metric_class(name, documentation, ("pool",))
+        for pool, status in pools.items():
+            if status is not None:
+                metric.inc(status[key], (pool,))
+        metrics.append(metric)
+    return metrics
+
+
+def __escape_label_value(value: str):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry()
+http_requests_total = metrics_registry.register(
+    Counter("http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")))
+http_request_duration_seconds = metrics_registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency until the response is sent.",
+              ("method", "route")))
+http_requests_in_progress = metrics_registry.register(
+    Gauge("http_requests_in_progress", "HTTP requests currently being handled."))
+scores_calculated_total = metrics_registry.register(
+    Counter("scores_calculated_total", "Z-scores calculated, by source (single, batch or import).", ("source",)))
+scores_persisted_total = metrics_registry.register(
+    Counter("scores_persisted_total", "Z-scores stored in the database, by source (single, batch or import).",
+            ("source",)))
+companies_created_total = metrics_registry.register(
+    Counter("companies_created_total", "Companies created automatically for score requests."))
+financials_rejected_total = metrics_registry.register(
+    Counter("financials_rejected_total", "Financials rejected because total_assets or total_liabilities is 0."))
@@ -0,0 +1,23 @@
+import re
+
+
+class CompanyNumberRegexRegistry:
+    def __init__(self):
+        self._patterns: dict[str, re.Pattern] = {}
+
+    def register(self, alpha_2_iso_code: str, regex: str):
+        pattern: re.Pattern = re.compile(regex)
+        self._patterns[alpha_2_iso_code] = pattern
+        return pattern
+
+    def validate(self, alpha_2_iso_code: str, company_number: str, regex: str):
+        pattern: re.Pattern | None = self._patterns.get(alpha_2_iso_code)
+        if pattern is None or pattern.pattern != regex:
+            pattern = self.register(alpha_2_iso_code=alpha_2_iso_code, regex=regex)
+        return pattern.search(company_number) is not None
+
+    def __len__(self):
+        return len(self._patterns)
+
+
+company_number_registry = CompanyNumberRegexRegistry()
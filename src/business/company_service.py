@@ -2,26 +2,29 @@ import logging
 import re
 
 from sqlalchemy.orm import Session
+
+from src.business.app_metrics import companies_created_total
+from src.business.company_number_registry import company_number_registry
 from src.business.pydantic_schemas.company import Company, CompanyCreate
 from src.business.pydantic_schemas.country import Country
-from src.persistence.utilities.company_crud import get_company_by_company_number, create_company
-from src.persistence.utilities.country_crud import get_country
+from src.persistence.utilities.company_crud import get_company_by_company_number_and_country, create_company, \
+    get_companies_by_company_numbers_and_iso_codes, create_companies
+from src.persistence.utilities.country_crud import get_country, get_countries_by_iso_codes
 
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
 
 
 def get_company_by_company_number_and_iso_code(db: Session, company_number: str, country_iso_code: str):
-    existing_company: Company = get_company_by_company_number(db=db, company_number=company_number)
-    logger.info("Company: Exists=" + str(existing_company is not None) + ".")
-    if existing_company is None or existing_company.country_alpha_2_iso_code != country_iso_code:
-        return None
-    else:
-        return existing_company
+    existing_company: Company = get_company_by_company_number_and_country(db=db, company_number=company_number,
+                                                                          country_alpha_2_iso_code=country_iso_code)
+    logger.info("Company: Exists=%s.", existing_company is not None)
+    return existing_company
 
 
 def create_company_if_not_exist(company: CompanyCreate, db: Session):
-    existing_company: Company = get_company_by_company_number(db=db, company_number=company.company_number)
-    if existing_company is not None and existing_company.country_alpha_2_iso_code == company.country_alpha_2_iso_code:
+    existing_company: Company = get_company_by_company_number_and_country(
+        db=db, company_number=company.company_number, country_alpha_2_iso_code=company.country_alpha_2_iso_code)
+    if existing_company is not None:
         logger.error("Company exists in database. Duplicates not allowed.")
         return None
     return __create_new_company(company=company, db=db)
@@ -35,26 +38,64 @@ def get_or_create_company(company_number, country_iso_code, db):
         new_company: CompanyCreate = CompanyCreate(company_number=company_number,
                                                    country_alpha_2_iso_code=country_iso_code)
         db_company: Company = __create_new_company(company=new_company, db=db)
+        if db_company is not None:
+            companies_created_total.inc()
         company = db_company
     return company
 
 
+def get_or_create_companies(keys: list[tuple[str, str]], db: Session):
+    unique_keys: list[tuple[str, str]] = list(dict.fromkeys(keys))
+    companies: dict[tuple[str, str], Company | None] = {
+        (c.country_alpha_2_iso_code, c.company_number): c
+        for c in get_companies_by_company_numbers_and_iso_codes(db=db, keys=unique_keys)}
+    missing_keys: list[tuple[str, str]] = [k for k in unique_keys if k not in companies]
+    logger.info("Companies: Requested=%d, Missing=%d.", len(unique_keys), len(missing_keys))
+    if not missing_keys:
+        return companies
+    countries: dict[str, Country] = {c.alpha_2_iso_code: c for c in
+                                     get_countries_by_iso_codes(db=db, alpha_2_iso_codes={k[0] for k in missing_keys})}
+    new_companies: list[CompanyCreate] = []
+    for country_iso_code, company_number in missing_keys:
+        new_company = CompanyCreate(company_number=company_number, country_alpha_2_iso_code=country_iso_code)
+        companies[(country_iso_code, company_number)] = None
+        if __validate_new_company(company=new_company, existing_country=countries.get(country_iso_code)):
+            new_companies.append(new_company)
+    created_companies = create_companies(db=db, companies=new_companies)
+    companies_created_total.inc(len(created_companies))
+    for db_company in created_companies:
+        companies[(db_company.country_alpha_2_iso_code, db_company.company_number)] = db_company
+    return companies
+
+
 def __create_new_company(company: CompanyCreate, db: Session):
     existing_country: Country = get_country(alpha_2_iso_code=company.country_alpha_2_iso_code, db=db)
-    if existing_country is None:
-        logger.error(f"Cannot create company for country that doesn't exist. The country "
-                     f"({company.country_alpha_2_iso_code}) must be created first.")
-        return None
-    valid_company_number: bool = validate_company_number_with_regex(company_number=company.company_number,
-                                                                    regex=existing_country.company_number_regex)
-    if not valid_company_number:
-        logger.error(f"Invalid company number. Number doesn't comply with the formatting rules for "
-                     f"{company.country_alpha_2_iso_code} company numbers.")
+    if not __validate_new_company(company=company, existing_country=existing_country):
         return None
     db_company = create_company(db=db, company=company)
     return db_company
 
 
+def __validate_new_company(company: CompanyCreate, existing_country: Country | None):
+    if existing_country is None:
+        logger.error("Cannot create company for country that doesn't exist. The country (%s) must be created first.",
+                     company.country_alpha_2_iso_code)
+        return False
+    valid_company_number: bool = validate_company_number(company_number=company.company_number,
+                                                         country=existing_country)
+    if not valid_company_number:
+        logger.error("Invalid company number. Number doesn't comply with the formatting rules for %s company numbers.",
+                     company.country_alpha_2_iso_code)
+        return False
+    return True
+
+
+def validate_company_number(company_number: str, country: Country):
+    return company_number_registry.validate(alpha_2_iso_code=country.alpha_2_iso_code,
+                                            company_number=company_number,
+                                            regex=country.company_number_regex)
+
+
 def validate_company_number_with_regex(company_number: str, regex: str):
     if re.search(regex, company_number) is None:
         return False
@@ -0,0 +1,56 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from src.business.pydantic_schemas.batch_score import BatchScoreRequest, BatchScoreReport
+from src.business.score_service import request_batch_scores, get_scored_company_keys
+from src.persistence.utilities.job_crud import create_job, claim_next_job, update_job_progress, \
+    is_job_cancel_requested, finish_job
+from src.persistence.utilities.score_history_cache import score_history_cache
+
+logger = logging.getLogger(__name__)
+
+SCORE_JOB_KIND = "scores"
+
+
+def submit_score_job(batch: BatchScoreRequest, db: Session):
+    db_job = create_job(db=db, kind=SCORE_JOB_KIND, payload=batch.dict(), total_items=len(batch.items))
+    logger.info("Score job queued: id=%d, Items=%d.", db_job.id, db_job.total_items)
+    return db_job
+
+
+def run_next_score_job(db: Session, chunk_size: int, lease_seconds: float):
+    db_job = claim_next_job(db=db, kind=SCORE_JOB_KIND, lease_seconds=lease_seconds)
+    if db_job is None:
+        return False
+    run_score_job(job_id=db_job.id, payload=db_job.payload, db=db, chunk_size=chunk_size)
+    return True
+
+
+def run_score_job(job_id: int, payload: dict, db: Session, chunk_size: int):
+    logger.info("Score job started: id=%d.", job_id)
+    items = BatchScoreRequest.parse_obj(payload).items
+    report = BatchScoreReport(succeeded=0, failed=0, results=[])
+    try:
+        for start in range(0, len(items), chunk_size):
+            if is_job_cancel_requested(db=db, id=job_id):
+                finish_job(db=db, id=job_id, status="cancelled", result=report.dict())
+                logger.info("Score job cancelled: id=%d, Processed=%d.", job_id, start)
+                return
+            chunk_report = request_batch_scores(items=items[start:start + chunk_size], db=db)
+            score_history_cache.invalidate(get_scored_company_keys(chunk_report))
+            report.succeeded += chunk_report.succeeded
+            report.failed += chunk_report.failed
+            report.results.extend(chunk_report.results)
+            if not update_job_progress(db=db, id=job_id, processed_items=start + len(chunk_report.results)):
+                logger.warning("Score job stopped, it is no longer running (lease expired): id=%d.", job_id)
+                return
+    except Exception as e:
+        db.rollback()
+        logger.exception("Score job failed: id=%d.", job_id)
+        finish_job(db=db, id=job_id, status="failed", result=report.dict(), detail=str(e))
+        return
+    if not finish_job(db=db, id=job_id, status="succeeded", result=report.dict()):
+        logger.warning("Score job finished after it was no longer running (lease expired): id=%d.", job_id)
+        return
+    logger.info("Score job succeeded: id=%d, Succeeded=%d, Failed=%d.", job_id, report.succeeded, report.failed)
@@ -0,0 +1,29 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from src.business.pydantic_schemas.financials import Financials
+from src.business.pydantic_schemas.score import ScoreBase
+
+
+class BatchScoreItem(BaseModel):
+    country_iso_code: str
+    company_number: str
+    financials: list[Financials]
+
+
+class BatchScoreRequest(BaseModel):
+    items: list[BatchScoreItem]
+
+
+class BatchScoreResult(BaseModel):
+    country_iso_code: str
+    company_number: str
+    success: bool
+    scores: list[ScoreBase] = []
+    detail: Optional[str] = None
+
+
+class BatchScoreReport(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BatchScoreResult]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class CacheStatistics(BaseModel):
+    size: int | None
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
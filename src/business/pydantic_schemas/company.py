@@ -23,3 +23,12 @@ class Company(CompanyBase):
 
     class Config:
         orm_mode = True
+
+
+class CompanySummary(CompanyBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
@@ -1,3 +1,4 @@
+import re
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, validator
@@ -23,6 +24,14 @@ class CountryCreate(CountryBase):
     def set_company_number_regex(cls, value):
         return value or "^.*$"
 
+    @validator("company_number_regex")
+    def company_number_regex_is_valid(cls, value):
+        try:
+            re.compile(value)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression for company numbers: {e}.")
+        return value
+
 
 class Country(CountryBase):
     created_at: datetime
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from src.business.pydantic_schemas.batch_score import BatchScoreReport
+
+JobStatusName = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: JobStatusName
+    total_items: int
+    processed_items: int
+    cancel_requested: bool
+    detail: Optional[str] = None
+    result: Optional[BatchScoreReport] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: int
+    route: str
+    path: str
+    status: int
+    started_at: datetime
+    seconds: float
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RouteQueryStatistics(BaseModel):
+    route: str
+    requests: int
+    queries_total: int
+    queries_avg: float
+    queries_max: int
+    db_seconds_total: float
+    db_seconds_avg: float
+    db_seconds_max: float
+    pool_wait_seconds_total: float
+    slowest_statement_seconds: float
+    slowest_statement: Optional[str]
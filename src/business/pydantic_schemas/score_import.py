@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+from src.business.pydantic_schemas.financials import Financials
+
+
+class ScoreImportRow(Financials):
+    country_iso_code: str
+    company_number: str
+
+
+class ScoreImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class ScoreImportReport(BaseModel):
+    rows: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: list[ScoreImportError] = []
+    errors_truncated: bool = False
+    seconds: float = 0
+    rows_per_second: float = 0
@@ -0,0 +1,52 @@
+import logging
+
+import numpy as np
+
+from src.business.pydantic_schemas.financials import Financials
+
+logger = logging.getLogger(__name__)
+
+FINANCIALS_COLUMNS: tuple[str, ...] = ("ebit", "equity", "retained_earnings", "sales", "total_assets",
+                                       "total_liabilities", "working_capital")
+
+
+def financials_to_columns(financials_list: list[Financials]):
+    rows = np.array([(f.ebit, f.equity, f.retained_earnings, f.sales, f.total_assets, f.total_liabilities,
+                      f.working_capital) for f in financials_list], dtype=np.float64).reshape(-1, 7)
+    columns: dict[str, np.ndarray] = {name: rows[:, i] for i, name in enumerate(FINANCIALS_COLUMNS)}
+    columns["year"] = np.array([f.year for f in financials_list], dtype=np.int64)
+    return columns
+
+
+def calculate_scores(financials_list: list[Financials]):
+    return calculate_scores_from_columns(financials_to_columns(financials_list))
+
+
+def calculate_scores_from_columns(columns: dict[str, np.ndarray]):
+    total_assets = np.asarray(columns["total_assets"], dtype=np.float64)
+    total_liabilities = np.asarray(columns["total_liabilities"], dtype=np.float64)
+    invalid = (total_assets == 0) | (total_liabilities == 0)
+    # Same operations in the same order as calculate_score in score_service, so each intermediate value is identical
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = 1.2 * (np.asarray(columns["working_capital"], dtype=np.float64) / total_assets)
+        b = 1.4 * (np.asarray(columns["retained_earnings"], dtype=np.float64) / total_assets)
+        c = 3.3 * (np.asarray(columns["ebit"], dtype=np.float64) / total_assets)
+        d = 0.6 * (np.asarray(columns["equity"], dtype=np.float64) / total_liabilities)
+        e = 1.0 * (np.asarray(columns["sales"], dtype=np.float64) / total_assets)
+        totals = a + b + c + d + e
+    totals[invalid] = np.nan
+    zscores = __round_2(totals)
+    logger.info("Calculated %d zscore(s) (invalid=%d).", len(zscores), invalid.sum())
+    return zscores, invalid
+
+
+def __round_2(values: np.ndarray):
+    # np.round scales by 100 before rounding, which can differ from round(value, 2) when the scaled value is within
+    # floating point error of a .5 tie, so only those rows are rounded the same way as the scalar function
+    scaled = values * 100
+    rounded = np.round(values, 2)
+    with np.errstate(invalid="ignore"):
+        ties = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 8 * np.spacing(np.abs(scaled))
+    for i in np.flatnonzero(ties):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
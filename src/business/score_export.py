@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.db_setup import AnySession
+from src.persistence.utilities.score_crud import stream_scores, stream_scores_async
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = ["country_alpha_2_iso_code", "company_number", "year", "zscore"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_scores(db: AnySession, export_format: str, country_iso_code: str | None = None,
+                  year_from: int | None = None, year_to: int | None = None):
+    filters = {"country_alpha_2_iso_code": country_iso_code, "year_from": year_from, "year_to": year_to}
+    if isinstance(db, AsyncSession):
+        return __export_async(db=db, export_format=export_format, filters=filters)
+    return __export(db=db, export_format=export_format, filters=filters)
+
+
+def format_rows(rows, export_format: str):
+    if export_format == "ndjson":
+        return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def __export(db: AnySession, export_format: str, filters: dict):
+    exported: int = 0
+    if export_format == "csv":
+        yield format_rows([EXPORT_COLUMNS], export_format)
+    for partition in stream_scores(db=db, **filters):
+        exported += len(partition)
+        yield format_rows(partition, export_format)
+    logger.info("Scores exported: %d (format=%s).", exported, export_format)
+
+
+async def __export_async(db: AnySession, export_format: str, filters: dict):
+    exported: int = 0
+    if export_format == "csv":
+        yield format_rows([EXPORT_COLUMNS], export_format)
+    async for partition in stream_scores_async(db=db, **filters):
+        exported += len(partition)
+        yield format_rows(partition, export_format)
+    logger.info("Scores exported: %d (format=%s).", exported, export_format)
@@ -0,0 +1,230 @@
+import codecs
+import csv
+import json
+import logging
+import time
+from collections import deque
+from typing import AsyncIterable, Iterable, NamedTuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from src.business.app_metrics import scores_calculated_total, scores_persisted_total, financials_rejected_total
+from src.business.company_service import get_or_create_companies
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.business.pydantic_schemas.score_import import ScoreImportRow, ScoreImportError, ScoreImportReport
+from src.business.score_engine import calculate_scores
+from src.business.score_process_pool import ScoreProcessPool
+from src.business.score_service import COMPANY_NOT_RESOLVED_DETAIL, INVALID_FINANCIALS_DETAIL
+from src.db.db_setup import AnySession, run_in_session, transaction
+from src.persistence.utilities.score_crud import create_scores
+from src.persistence.utilities.score_history_cache import score_history_cache
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+MAX_REPORTED_ERRORS = 1000
+
+
+class ScoredImportRow(NamedTuple):
+    line: int
+    country_iso_code: str | None = None
+    company_number: str | None = None
+    year: int | None = None
+    zscore: float | None = None
+    detail: str | None = None
+
+
+class ScoreImportReader:
+    # Numbers the lines of an NDJSON or CSV (with header) upload and drops blank lines. Lines are fed in chunks, so the
+    # reader keeps the line count and the CSV header between chunks
+    def __init__(self, import_format: str):
+        self.import_format = import_format
+        self.columns: list[str] | None = None
+        self.line_number: int = 0
+
+    def read(self, lines: Iterable[str]):
+        numbered_lines: list[tuple[int, str]] = []
+        for line in lines:
+            self.line_number += 1
+            if not line.strip():
+                continue
+            if self.import_format == "csv" and self.columns is None:
+                self.columns = [c.strip() for c in next(csv.reader([line]))]
+                continue
+            numbered_lines.append((self.line_number, line))
+        return numbered_lines
+
+
+def parse_line(import_format: str, columns: list[str] | None, line: str):
+    try:
+        if import_format == "csv":
+            values = next(csv.reader([line]))
+            if len(values) != len(columns):
+                return "Expected " + str(len(columns)) + " values but got " + str(len(values)) + "."
+            return ScoreImportRow.parse_obj(dict(zip(columns, values)))
+        return ScoreImportRow.parse_obj(json.loads(line))
+    except json.JSONDecodeError as e:
+        return "Invalid JSON: " + e.msg + "."
+    except ValidationError as e:
+        return "; ".join(".".join(str(loc) for loc in error["loc"]) + ": " + error["msg"] for error in e.errors())
+
+
+def score_lines(import_format: str, columns: list[str] | None, numbered_lines: list[tuple[int, str]]):
+    # The CPU-bound half of an import chunk: parsing, validation and the score engine. It has no DB access and returns
+    # plain tuples, so it can run in a worker process of the ScoreProcessPool as well as inline
+    parsed = [(line_number, parse_line(import_format, columns, line)) for line_number, line in numbered_lines]
+    valid_rows: list[ScoreImportRow] = [row for _, row in parsed if not isinstance(row, str)]
+    zscores, invalid = calculate_scores(valid_rows)
+    scored_rows: list[ScoredImportRow] = []
+    index: int = 0
+    for line_number, row in parsed:
+        if isinstance(row, str):
+            scored_rows.append(ScoredImportRow(line=line_number, detail=row))
+            continue
+        zscore = None if invalid[index] else float(zscores[index])
+        scored_rows.append(ScoredImportRow(line=line_number, country_iso_code=row.country_iso_code,
+                                           company_number=row.company_number, year=row.year, zscore=zscore))
+        index += 1
+    return scored_rows
+
+
+def store_scored_rows(scored_rows: list[ScoredImportRow], db: Session):
+    # The DB half of an import chunk, always run in the parent process: resolves (or creates) the companies and writes
+    # the scores in one transaction. Errors are reported with the same precedence as request_batch_scores. Returns the
+    # errors and the keys of the companies, whose score history the caller invalidates
+    if not scored_rows:
+        return [], []
+    parsed_rows = [r for r in scored_rows if r.detail is None]
+    companies = get_or_create_companies(keys=[(r.country_iso_code, r.company_number) for r in parsed_rows], db=db)
+    errors: list[ScoreImportError] = []
+    scores: list[ScoreCreate] = []
+    for row in scored_rows:
+        if row.detail is not None:
+            errors.append(ScoreImportError(line=row.line, detail=row.detail))
+        elif companies.get((row.country_iso_code, row.company_number)) is None:
+            errors.append(ScoreImportError(line=row.line, detail=COMPANY_NOT_RESOLVED_DETAIL))
+        elif row.zscore is None:
+            errors.append(ScoreImportError(line=row.line, detail=INVALID_FINANCIALS_DETAIL))
+            financials_rejected_total.inc()
+        else:
+            company = companies[(row.country_iso_code, row.company_number)]
+            scores.append(ScoreCreate.construct(company_id=company.id, year=row.year, zscore=row.zscore))
+    # Rows may have been scored in a worker process, so they are counted here, in the app process
+    scores_calculated_total.inc(len(parsed_rows), ("import",))
+    with transaction(db):
+        create_scores(db=db, scores=scores)
+    scores_persisted_total.inc(len(scores), ("import",))
+    return errors, [k for k, c in companies.items() if c is not None]
+
+
+def import_lines(import_format: str, columns: list[str] | None, numbered_lines: list[tuple[int, str]], db: Session):
+    return store_scored_rows(scored_rows=score_lines(import_format, columns, numbered_lines), db=db)
+
+
+def import_scores(lines: Iterable[str], import_format: str, chunk_size: int, db: Session,
+                  process_pool: ScoreProcessPool | None = None):
+    # With a process pool, up to max_pending chunks are scored in worker processes while the parent writes the
+    # results of earlier chunks in order
+    reader = ScoreImportReader(import_format=import_format)
+    report = ScoreImportReport()
+    start = time.perf_counter()
+    pending: deque = deque()
+    for chunk in __iter_chunks(lines, chunk_size):
+        numbered_lines = reader.read(chunk)
+        if not numbered_lines:
+            continue
+        if process_pool is None:
+            __store(report=report, scored_rows=score_lines(import_format, reader.columns, numbered_lines), db=db)
+            continue
+        pending.append(process_pool.submit(score_lines, import_format, reader.columns, numbered_lines))
+        while len(pending) >= process_pool.max_pending:
+            __store(report=report, scored_rows=pending.popleft().result(), db=db)
+    while pending:
+        __store(report=report, scored_rows=pending.popleft().result(), db=db)
+    return __finish(report=report, start=start)
+
+
+async def import_scores_stream(byte_stream: AsyncIterable[bytes], import_format: str, chunk_size: int,
+                               db: AnySession, process_pool: ScoreProcessPool | None = None):
+    reader = ScoreImportReader(import_format=import_format)
+    report = ScoreImportReport()
+    start = time.perf_counter()
+    pending: deque = deque()
+    async for chunk in __iter_line_chunks(byte_stream, chunk_size):
+        numbered_lines = reader.read(chunk)
+        if not numbered_lines:
+            continue
+        if process_pool is None:
+            await __store_async(report, len(numbered_lines), db, import_lines, import_format=import_format,
+                                columns=reader.columns, numbered_lines=numbered_lines)
+            continue
+        pending.append(process_pool.submit_async(score_lines, import_format, reader.columns, numbered_lines))
+        while len(pending) >= process_pool.max_pending:
+            scored_rows = await pending.popleft()
+            await __store_async(report, len(scored_rows), db, store_scored_rows, scored_rows=scored_rows)
+    while pending:
+        scored_rows = await pending.popleft()
+        await __store_async(report, len(scored_rows), db, store_scored_rows, scored_rows=scored_rows)
+    return __finish(report=report, start=start)
+
+
+def __iter_chunks(lines: Iterable[str], chunk_size: int):
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def __store(report: ScoreImportReport, scored_rows: list[ScoredImportRow], db: Session):
+    errors, company_keys = store_scored_rows(scored_rows=scored_rows, db=db)
+    score_history_cache.invalidate(company_keys)
+    __record(report=report, rows=len(scored_rows), errors=errors)
+
+
+async def __store_async(report: ScoreImportReport, rows: int, db: AnySession, fn, **kwargs):
+    errors, company_keys = await run_in_session(db, fn, **kwargs)
+    await score_history_cache.invalidate_async(company_keys)
+    __record(report=report, rows=rows, errors=errors)
+
+
+async def __iter_line_chunks(byte_stream: AsyncIterable[bytes], chunk_size: int):
+    # Splits the request body into lines as it arrives (a UTF-8 character or a line can span two network chunks) and
+    # hands them out chunk_size lines at a time, so only one chunk of the upload is held in memory
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    remainder: str = ""
+    lines: list[str] = []
+    async for data in byte_stream:
+        remainder += decoder.decode(data)
+        *complete_lines, remainder = remainder.split("\n")
+        lines.extend(complete_lines)
+        while len(lines) >= chunk_size:
+            yield lines[:chunk_size]
+            lines = lines[chunk_size:]
+    remainder += decoder.decode(b"", final=True)
+    if remainder:
+        lines.append(remainder)
+    if lines:
+        yield lines
+
+
+def __record(report: ScoreImportReport, rows: int, errors: list[ScoreImportError]):
+    report.rows += rows
+    report.failed += len(errors)
+    report.succeeded += rows - len(errors)
+    room: int = MAX_REPORTED_ERRORS - len(report.errors)
+    report.errors.extend(errors[:room])
+    report.errors_truncated = report.errors_truncated or len(errors) > room
+    logger.info("Imported chunk: Rows=%d, Failed=%d, Total=%d.", rows, len(errors), report.rows)
+
+
+def __finish(report: ScoreImportReport, start: float):
+    report.seconds = round(time.perf_counter() - start, 3)
+    report.rows_per_second = round(report.rows / report.seconds, 1) if report.seconds > 0 else 0
+    logger.info("Import finished: Rows=%d, Succeeded=%d, Failed=%d, Rows/s=%s.", report.rows, report.succeeded,
+                report.failed, report.rows_per_second)
+    return report
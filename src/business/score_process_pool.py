@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.db import config
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreProcessPool:
+    # Runs the CPU-bound part of large scoring batches (parsing, validation and the score engine) in worker processes.
+    # Workers are spawned rather than forked so they don't inherit the parent's threads, event loop or DB connections
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.max_pending = 2 * workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def submit_async(self, fn, *args):
+        return asyncio.wrap_future(self.executor.submit(fn, *args))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+score_process_pool: ScoreProcessPool | None = None
+
+
+def get_score_process_pool():
+    global score_process_pool
+    workers: int = config.get_settings().score_process_workers
+    if score_process_pool is None and workers > 0:
+        logger.info("Starting score process pool with %d worker(s).", workers)
+        score_process_pool = ScoreProcessPool(workers=workers)
+    return score_process_pool
+
+
+def shutdown_score_process_pool():
+    global score_process_pool
+    if score_process_pool is not None:
+        score_process_pool.shutdown()
+        score_process_pool = None
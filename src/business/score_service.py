@@ -2,38 +2,96 @@ import logging
 
 from sqlalchemy.orm import Session
 
+from src.business.app_metrics import scores_calculated_total, scores_persisted_total, financials_rejected_total
+from src.business.company_service import get_or_create_companies
+from src.business.pydantic_schemas.batch_score import BatchScoreItem, BatchScoreReport, BatchScoreResult
 from src.business.pydantic_schemas.company import Company
 from src.business.pydantic_schemas.financials import Financials
 from src.business.pydantic_schemas.score import ScoreCreate, ScoreBase
-from src.persistence.utilities.score_crud import create_score
+from src.business.score_engine import calculate_scores
+from src.db.db_setup import transaction
+from src.persistence.utilities.score_crud import create_scores
 
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
+
+COMPANY_NOT_RESOLVED_DETAIL = "Failed to retrieve existing and create new company because the country doesn't exist " \
+                              "or the company number violates the country's formatting rules for company numbers."
+INVALID_FINANCIALS_DETAIL = "Invalid financials provided. Financials contain 0 values for at least one of the " \
+                            "denominators in Altman's Z-Score (total_assets or total_liabilities)."
 
 
 def validate_financials(financials: list[Financials]):
     for f in financials:
         if f.total_assets == 0 or f.total_liabilities == 0:
+            financials_rejected_total.inc()
             return False
     return True
 
 
 def request_scores(financials_list: list[Financials], company: Company, db: Session):
-    logger.info("Score(s) to be calculated for: " + company.name + " (company_number=" + str(company.company_number) +
-                ", country_alpha_2_iso_code=" + company.country_alpha_2_iso_code + ").")
-    scores: list[ScoreCreate] = []
-    for f in financials_list:
-        score: ScoreCreate = ScoreCreate(company_id=company.id, year=f.year, zscore=calculate_score(f))
-        scores.append(score)
-    logger.info("Created objects: " + str(scores))
-    scores_report: list[ScoreBase] = []
-    for s in scores:
-        create_score(db=db, score=s)
-        score_for_report: ScoreBase = ScoreBase(year=s.year, zscore=s.zscore)
-        scores_report.append(score_for_report)
-    logger.info("Report scores created: " + str(scores_report))
+    logger.info("Score(s) to be calculated for: %s (company_number=%s, country_alpha_2_iso_code=%s).", company.name,
+                company.company_number, company.country_alpha_2_iso_code)
+    scores: list[ScoreCreate] = __build_scores(financials_list=financials_list, company=company)
+    logger.debug("Created objects: %s", scores)
+    scores_calculated_total.inc(len(scores), ("single",))
+    with transaction(db):
+        create_scores(db=db, scores=scores)
+    scores_persisted_total.inc(len(scores), ("single",))
+    scores_report: list[ScoreBase] = [ScoreBase(year=s.year, zscore=s.zscore) for s in scores]
+    logger.debug("Report scores created: %s", scores_report)
     return scores_report
 
 
+def request_batch_scores(items: list[BatchScoreItem], db: Session):
+    logger.info("Batch score(s) to be calculated for %d item(s).", len(items))
+    companies = get_or_create_companies(keys=[(i.country_iso_code, i.company_number) for i in items], db=db)
+    # The items and the engine output are validated already, so the per-item models are built with construct(), which
+    # skips a second round of pydantic validation for every row of large batches
+    results: list[BatchScoreResult] = [BatchScoreResult.construct(country_iso_code=i.country_iso_code,
+                                                                  company_number=i.company_number,
+                                                                  success=False) for i in items]
+    financials_list: list[Financials] = []
+    for item, result in zip(items, results):
+        if companies.get((item.country_iso_code, item.company_number)) is None:
+            result.detail = COMPANY_NOT_RESOLVED_DETAIL
+        else:
+            financials_list.extend(item.financials)
+    zscores, invalid = calculate_scores(financials_list)
+    scores_calculated_total.inc(len(financials_list), ("batch",))
+    scores: list[ScoreCreate] = []
+    offset: int = 0
+    for item, result in zip(items, results):
+        if result.detail is not None:
+            continue
+        end: int = offset + len(item.financials)
+        if invalid[offset:end].any():
+            result.detail = INVALID_FINANCIALS_DETAIL
+            financials_rejected_total.inc()
+        else:
+            company: Company = companies[(item.country_iso_code, item.company_number)]
+            item_scores = [ScoreCreate.construct(company_id=company.id, year=f.year, zscore=z)
+                           for f, z in zip(item.financials, zscores[offset:end].tolist())]
+            scores.extend(item_scores)
+            result.success = True
+            result.scores = [ScoreBase.construct(year=s.year, zscore=s.zscore) for s in item_scores]
+        offset = end
+    with transaction(db):
+        create_scores(db=db, scores=scores)
+    scores_persisted_total.inc(len(scores), ("batch",))
+    succeeded: int = sum(1 for r in results if r.success)
+    logger.info("Batch scores created: Succeeded=%d, Failed=%d.", succeeded, len(results) - succeeded)
+    return BatchScoreReport(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def get_scored_company_keys(report: BatchScoreReport):
+    # The companies whose scores request_batch_scores stored, for the caller to invalidate in the score history cache
+    return [(r.country_iso_code, r.company_number) for r in report.results if r.success]
+
+
+def __build_scores(financials_list: list[Financials], company: Company):
+    return [ScoreCreate(company_id=company.id, year=f.year, zscore=calculate_score(f)) for f in financials_list]
+
+
 def calculate_score(financials: Financials):
     a: float = 1.2 * (financials.working_capital / financials.total_assets)
     b: float = 1.4 * (financials.retained_earnings / financials.total_assets)
@@ -41,5 +99,5 @@ def calculate_score(financials: Financials):
     d: float = 0.6 * (financials.equity / financials.total_liabilities)
     e: float = 1.0 * (financials.sales / financials.total_assets)
     score = round(a + b + c + d + e, 2)
-    logger.info("Calculated zscore for " + str(financials.year) + ": " + str(score) + ".")
+    logger.debug("Calculated zscore for %d: %s.", financials.year, score)
     return score
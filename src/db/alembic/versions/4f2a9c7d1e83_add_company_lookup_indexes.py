@@ -0,0 +1,49 @@
+"""Add company lookup indexes
+
+Revision ID: 4f2a9c7d1e83
+Revises: cb15b9f492e6
+Create Date: 2026-10-18 09:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c7d1e83'
+down_revision = 'cb15b9f492e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Merge duplicate companies (same country and company number) into the oldest row before adding the unique index
+    op.execute(sa.text("""
+        UPDATE scores SET company_id = (
+            SELECT MIN(duplicate.id) FROM companies AS company
+            JOIN companies AS duplicate
+              ON duplicate.country_alpha_2_iso_code = company.country_alpha_2_iso_code
+             AND duplicate.company_number = company.company_number
+            WHERE company.id = scores.company_id)
+        WHERE company_id NOT IN (
+            SELECT MIN(id) FROM companies GROUP BY country_alpha_2_iso_code, company_number)
+    """))
+    op.execute(sa.text("""
+        DELETE FROM companies WHERE id NOT IN (
+            SELECT MIN(id) FROM companies GROUP BY country_alpha_2_iso_code, company_number)
+    """))
+    op.drop_index('ix_companies_id', table_name='companies')
+    op.drop_index('ix_scores_id', table_name='scores')
+    # Build the new indexes without blocking writes on large Postgres tables (CONCURRENTLY can't run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_companies_country_alpha_2_iso_code_company_number', 'companies',
+                        ['country_alpha_2_iso_code', 'company_number'], unique=True, postgresql_concurrently=True)
+        op.create_index(op.f('ix_scores_company_id'), 'scores', ['company_id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scores_company_id'), table_name='scores')
+    op.drop_index('ix_companies_country_alpha_2_iso_code_company_number', table_name='companies')
+    op.create_index(op.f('ix_scores_id'), 'scores', ['id'], unique=False)
+    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
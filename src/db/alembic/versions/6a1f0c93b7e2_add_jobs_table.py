@@ -0,0 +1,41 @@
+"""Add jobs table
+
+Revision ID: 6a1f0c93b7e2
+Revises: d7c41a8e02f5
+Create Date: 2026-10-18 17:41:22.307815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a1f0c93b7e2'
+down_revision = 'd7c41a8e02f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('kind', sa.String(length=50), nullable=False),
+                    sa.Column('status', sa.String(length=20), nullable=False),
+                    sa.Column('payload', sa.JSON(), nullable=False),
+                    sa.Column('result', sa.JSON(), nullable=True),
+                    sa.Column('detail', sa.String(), nullable=True),
+                    sa.Column('total_items', sa.Integer(), nullable=False),
+                    sa.Column('processed_items', sa.Integer(), nullable=False),
+                    sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+                    sa.Column('started_at', sa.DateTime(), nullable=True),
+                    sa.Column('finished_at', sa.DateTime(), nullable=True),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.Column('updated_at', sa.DateTime(), nullable=False),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_jobs_status_id', 'jobs', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_id', table_name='jobs')
+    op.drop_table('jobs')
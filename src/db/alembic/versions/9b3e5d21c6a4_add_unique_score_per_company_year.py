@@ -0,0 +1,34 @@
+"""Add unique score per company and year
+
+Revision ID: 9b3e5d21c6a4
+Revises: 4f2a9c7d1e83
+Create Date: 2026-10-18 11:03:47.918236
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e5d21c6a4'
+down_revision = '4f2a9c7d1e83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the most recent score per company and year before adding the unique index
+    op.execute(sa.text("""
+        DELETE FROM scores WHERE id NOT IN (
+            SELECT MAX(id) FROM scores GROUP BY company_id, year)
+    """))
+    # The unique index leads with company_id, so it replaces ix_scores_company_id for lookups by company
+    with op.get_context().autocommit_block():
+        op.create_index('ix_scores_company_id_year', 'scores', ['company_id', 'year'], unique=True,
+                        postgresql_concurrently=True)
+        op.drop_index('ix_scores_company_id', table_name='scores', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_scores_company_id', 'scores', ['company_id'], unique=False)
+    op.drop_index('ix_scores_company_id_year', table_name='scores')
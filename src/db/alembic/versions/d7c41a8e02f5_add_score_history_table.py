@@ -0,0 +1,36 @@
+"""Add score history table
+
+Revision ID: d7c41a8e02f5
+Revises: 9b3e5d21c6a4
+Create Date: 2026-10-18 14:26:09.551372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7c41a8e02f5'
+down_revision = '9b3e5d21c6a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('score_history',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('score_id', sa.Integer(), nullable=False),
+                    sa.Column('company_id', sa.Integer(), nullable=False),
+                    sa.Column('year', sa.Integer(), nullable=False),
+                    sa.Column('zscore', sa.Float(), nullable=False),
+                    sa.Column('scored_at', sa.DateTime(), nullable=False),
+                    sa.Column('replaced_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+                    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_score_history_company_id_year', 'score_history', ['company_id', 'year'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_score_history_company_id_year', table_name='score_history')
+    op.drop_table('score_history')
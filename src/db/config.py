@@ -1,10 +1,45 @@
 from functools import lru_cache
+from typing import Literal, Union
 
-from pydantic import BaseSettings, PostgresDsn
+from pydantic import AnyUrl, BaseSettings, PostgresDsn
+
+
+class SqliteDsn(AnyUrl):
+    allowed_schemes = {"sqlite"}
+    host_required = False
 
 
 class Settings(BaseSettings):
-    database_url: PostgresDsn
+    database_url: Union[PostgresDsn, SqliteDsn]
+    db_mode: Literal["sync", "async"] = "sync"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    country_cache_ttl_seconds: float = 300
+    score_history_enabled: bool = False
+    score_history_cache_size: int = 10000
+    score_history_cache_ttl_seconds: float = 60
+    score_history_cache_url: str | None = None
+    score_import_chunk_size: int = 1000
+    score_process_workers: int = 0
+    fast_json_responses: bool = False
+    query_metrics_enabled: bool = True
+    request_metrics_enabled: bool = True
+    profiling_enabled: bool = False
+    profiling_token: str | None = None
+    profiling_sample_rate: float = 0.0
+    profiling_max_profiles: int = 20
+    log_level: str = "INFO"
+    log_format: Literal["text", "json"] = "text"
+    log_levels: dict[str, str] = {}
+    log_sample_rates: dict[str, float] = {}
+    log_queue_enabled: bool = True
+    job_chunk_size: int = 100
+    job_poll_interval_seconds: float = 1.0
+    job_lease_seconds: float = 300.0
+    job_worker_processes: int = 2
 
     class Config:
         env_file = ".env"
@@ -1,20 +1,67 @@
+from contextlib import contextmanager
 from functools import lru_cache
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
+from starlette.concurrency import run_in_threadpool
 
 from src.db import config
+from src.db.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from src.db.request_profiler import call_profiled
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
 
 SQLALCHEMY_DATABASE_URL = config.get_settings().database_url
+DB_MODE = config.get_settings().db_mode
+
+
+def get_async_database_url(database_url: str):
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+def is_in_memory_sqlite(database_url: str):
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def get_pool_options(database_url: str, poolclass):
+    if is_in_memory_sqlite(database_url):
+        # In-memory SQLite databases live and die with their connection, so every thread of the threadpool shares one
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    settings = config.get_settings()
+    return {"poolclass": poolclass,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping}
+
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={}, future=True
+    SQLALCHEMY_DATABASE_URL, future=True, **get_pool_options(SQLALCHEMY_DATABASE_URL, TimedQueuePool)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
+if DB_MODE == "async":
+    if is_in_memory_sqlite(SQLALCHEMY_DATABASE_URL):
+        # The async engine would open a second, empty database next to the one the sync engine creates the tables in
+        raise ValueError("DB_MODE=async requires a file or server database, not in-memory SQLite")
+    async_engine = create_async_engine(get_async_database_url(SQLALCHEMY_DATABASE_URL),
+                                       **get_pool_options(SQLALCHEMY_DATABASE_URL, TimedAsyncAdaptedQueuePool))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
 Base = declarative_base()
 
+AnySession = Session | AsyncSession
+
 
 # Database utilities
 def get_db():
@@ -25,9 +72,33 @@ def get_db():
         db.close()
 
 
-@lru_cache()
-def get_settings():
-    return config.Settings()
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_session = get_async_db if DB_MODE == "async" else get_db
+
+
+async def run_in_session(db: AnySession, fn, **kwargs):
+    # The CRUD utilities and services are written once against the synchronous Session API. In async mode they run
+    # on the AsyncSession's connection via run_sync (no thread, non-blocking driver), in sync mode on the threadpool,
+    # so neither mode blocks the event loop
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(db=session, **kwargs))
+    return await run_in_threadpool(call_profiled, fn, db=db, **kwargs)
 
 
+@contextmanager
+def transaction(db: Session):
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
 
+@lru_cache()
+def get_settings():
+    return config.Settings()
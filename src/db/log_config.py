@@ -0,0 +1,126 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from uvicorn.logging import DefaultFormatter
+
+from src.db import config
+
+# Modules log to loggers named after them, so everything is below "src", except command line entry points run as
+# __main__
+APP_LOGGERS = ("src", "__main__")
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.access")
+# Attributes every LogRecord has (and the copy with colour codes uvicorn adds), anything else was passed with
+# extra={...} and is added to JSON output as a field
+RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "color_message"}
+
+__listener: QueueListener | None = None
+__handlers: list[tuple[logging.Logger, logging.Handler]] = []
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord):
+        entry = {"time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+                 "level": record.levelname,
+                 "logger": record.name,
+                 "message": record.getMessage()}
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    # Keeps the given share of the records below WARNING per logger name prefix (the longest matching prefix wins),
+    # so that high-volume messages can be thinned out without losing warnings and errors
+    def __init__(self, sample_rates: dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self._rates_by_logger: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rates_by_logger.get(record.name)
+        if rate is None:
+            rate = self._rates_by_logger[record.name] = self.__get_rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+    def __get_rate(self, name: str):
+        matches = [p for p in self.sample_rates if name == p or name.startswith(p + ".")]
+        return self.sample_rates[max(matches, key=len)] if matches else 1.0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    # Hands records to the listener thread through an unbounded queue, so logging never waits for the stream. Only the
+    # message is merged here (and an exception formatted), formatting happens on the listener thread
+    def prepare(self, record: logging.LogRecord):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(settings: config.Settings):
+    # Sets up the app's loggers (all named after their module, below "src"). Safe to call again, e.g. in a forked
+    # worker process, which doesn't inherit the listener thread of its parent
+    global __listener
+    stop_logging()
+    if settings.log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = DefaultFormatter("%(levelprefix)s %(message)s")
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handler = stream_handler
+    if settings.log_queue_enabled:
+        handler = NonBlockingQueueHandler(queue.SimpleQueue())
+        __listener = QueueListener(handler.queue, stream_handler, respect_handler_level=False)
+        __listener.start()
+    if settings.log_sample_rates:
+        handler.addFilter(SamplingFilter(settings.log_sample_rates))
+
+    loggers = [logging.getLogger(name) for name in APP_LOGGERS]
+    for logger in loggers:
+        logger.setLevel(settings.log_level.upper())
+        logger.propagate = False
+    if settings.log_format == "json":
+        # uvicorn's own loggers (server and access log) are switched over as well, so that every line is JSON
+        for name in UVICORN_LOGGERS:
+            uvicorn_logger = logging.getLogger(name)
+            for existing_handler in list(uvicorn_logger.handlers):
+                uvicorn_logger.removeHandler(existing_handler)
+            loggers.append(uvicorn_logger)
+    for logger in loggers:
+        logger.addHandler(handler)
+        __handlers.append((logger, handler))
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def stop_logging():
+    # Writes out the records still queued and removes the handlers added by configure_logging
+    global __listener
+    if __listener is not None:
+        __listener.stop()
+        __listener = None
+    while __handlers:
+        logger, handler = __handlers.pop()
+        logger.removeHandler(handler)
+
+
+atexit.register(stop_logging)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from src.db.db_setup import Base
@@ -9,11 +9,15 @@ from src.db.models.mixins import Timestamp
 
 class Company(Timestamp, Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_country_alpha_2_iso_code_company_number", "country_alpha_2_iso_code", "company_number",
+              unique=True),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     company_number: Mapped[str] = mapped_column(String(100), nullable=False)
     country_alpha_2_iso_code: Mapped[str] = \
         mapped_column(String(2), ForeignKey("countries.alpha_2_iso_code"), nullable=False)
     name: Mapped[str] = mapped_column(String, default="Unknown")
 
-    scores: Mapped[Optional[List["Score"]]] = relationship(back_populates="company")
+    scores: Mapped[Optional[List["Score"]]] = relationship(back_populates="company", order_by="Score.year")
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.db_setup import Base
+from src.db.models.mixins import Timestamp
+
+
+class Job(Timestamp, Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    result: Mapped[Optional[dict]] = mapped_column(JSON)
+    detail: Mapped[Optional[str]] = mapped_column(String)
+    total_items: Mapped[int] = mapped_column(nullable=False, default=0)
+    processed_items: Mapped[int] = mapped_column(nullable=False, default=0)
+    cancel_requested: Mapped[bool] = mapped_column(nullable=False, default=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column()
+    finished_at: Mapped[Optional[datetime]] = mapped_column()
+
+    def __repr__(self):
+        return f"Job(id={self.id}, kind={self.kind}, status={self.status}, " \
+               f"processed_items={self.processed_items}/{self.total_items})"
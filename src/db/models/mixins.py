@@ -6,5 +6,5 @@ from sqlalchemy.orm import declarative_mixin, Mapped, mapped_column
 
 @declarative_mixin
 class Timestamp:
-    created_at: Mapped[datetime] = mapped_column(default=datetime.now(), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.now(), nullable=False)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.now, onupdate=datetime.now, nullable=False)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from src.db.db_setup import Base
@@ -7,8 +7,11 @@ from src.db.models.mixins import Timestamp
 
 class Score(Timestamp, Base):
     __tablename__ = "scores"
+    __table_args__ = (
+        Index("ix_scores_company_id_year", "company_id", "year", unique=True),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), nullable=False)
     year: Mapped[int] = mapped_column(nullable=False)
     zscore: Mapped[float] = mapped_column(nullable=False)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.db_setup import Base
+
+
+class ScoreHistory(Base):
+    __tablename__ = "score_history"
+    __table_args__ = (
+        Index("ix_score_history_company_id_year", "company_id", "year"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    score_id: Mapped[int] = mapped_column(nullable=False)
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), nullable=False)
+    year: Mapped[int] = mapped_column(nullable=False)
+    zscore: Mapped[float] = mapped_column(nullable=False)
+    scored_at: Mapped[datetime] = mapped_column(nullable=False)
+    replaced_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"ScoreHistory(id={self.id}, score_id={self.score_id}, company_id={self.company_id}, " \
+               f"year={self.year}, zscore={self.zscore})"
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from src.db.query_metrics import record_pool_wait
+
+
+class PoolStatistics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_seconds_total: float = 0.0
+        self.wait_seconds_max: float = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            if wait_seconds > self.wait_seconds_max:
+                self.wait_seconds_max = wait_seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+
+class TimedQueuePool(QueuePool):
+    # Times how long each checkout waits for a connection (including opening a new one when the pool may overflow)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statistics = PoolStatistics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.statistics.record_timeout()
+            raise
+        wait_seconds = time.perf_counter() - start
+        self.statistics.record_checkout(wait_seconds)
+        record_pool_wait(wait_seconds)
+        return connection
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_status(pool):
+    if not isinstance(pool, TimedQueuePool):
+        return None
+    statistics: PoolStatistics = pool.statistics
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": statistics.checkouts,
+        "timeouts": statistics.timeouts,
+        "wait_seconds_total": round(statistics.wait_seconds_total, 6),
+        "wait_seconds_avg": round(statistics.wait_seconds_total / statistics.checkouts, 6)
+        if statistics.checkouts else 0.0,
+        "wait_seconds_max": round(statistics.wait_seconds_max, 6),
+    }
@@ -0,0 +1,118 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_STATEMENT_MAX_LENGTH = 500
+
+
+class RequestQueryMetrics:
+    # Collected for one request. The instance is shared by reference with the threadpool and run_sync calls that run
+    # the request's database work, which all see the request's context
+    def __init__(self):
+        self.queries: int = 0
+        self.db_seconds: float = 0.0
+        self.slowest_seconds: float = 0.0
+        self.slowest_statement: str | None = None
+        self.pool_wait_seconds: float = 0.0
+
+    def record_query(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds or self.slowest_statement is None:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement[:SLOWEST_STATEMENT_MAX_LENGTH]
+
+
+class RouteQueryStatistics:
+    def __init__(self):
+        self.requests: int = 0
+        self.queries_total: int = 0
+        self.queries_max: int = 0
+        self.db_seconds_total: float = 0.0
+        self.db_seconds_max: float = 0.0
+        self.pool_wait_seconds_total: float = 0.0
+        self.slowest_statement_seconds: float = 0.0
+        self.slowest_statement: str | None = None
+
+    def record(self, metrics: RequestQueryMetrics):
+        self.requests += 1
+        self.queries_total += metrics.queries
+        self.queries_max = max(self.queries_max, metrics.queries)
+        self.db_seconds_total += metrics.db_seconds
+        self.db_seconds_max = max(self.db_seconds_max, metrics.db_seconds)
+        self.pool_wait_seconds_total += metrics.pool_wait_seconds
+        if metrics.slowest_statement is not None and metrics.slowest_seconds >= self.slowest_statement_seconds:
+            self.slowest_statement_seconds = metrics.slowest_seconds
+            self.slowest_statement = metrics.slowest_statement
+
+    def as_dict(self, route: str):
+        return {"route": route,
+                "requests": self.requests,
+                "queries_total": self.queries_total,
+                "queries_avg": round(self.queries_total / self.requests, 2) if self.requests else 0.0,
+                "queries_max": self.queries_max,
+                "db_seconds_total": round(self.db_seconds_total, 6),
+                "db_seconds_avg": round(self.db_seconds_total / self.requests, 6) if self.requests else 0.0,
+                "db_seconds_max": round(self.db_seconds_max, 6),
+                "pool_wait_seconds_total": round(self.pool_wait_seconds_total, 6),
+                "slowest_statement_seconds": round(self.slowest_statement_seconds, 6),
+                "slowest_statement": self.slowest_statement}
+
+
+class QueryMetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, RouteQueryStatistics] = {}
+
+    def record(self, route: str, metrics: RequestQueryMetrics):
+        with self._lock:
+            self._routes.setdefault(route, RouteQueryStatistics()).record(metrics)
+
+    def statistics(self):
+        with self._lock:
+            return [self._routes[route].as_dict(route) for route in sorted(self._routes)]
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+current_request_metrics: ContextVar[RequestQueryMetrics | None] = ContextVar("current_request_metrics", default=None)
+query_metrics_registry = QueryMetricsRegistry()
+
+
+def record_pool_wait(wait_seconds: float):
+    metrics = current_request_metrics.get()
+    if metrics is not None:
+        metrics.pool_wait_seconds += wait_seconds
+
+
+def instrument_engine(engine: Engine):
+    # Times every statement executed through the engine (for an AsyncEngine, pass its sync_engine). Statements outside
+    # a request (job workers, CLI, startup) are not recorded
+    if event.contains(engine, "before_cursor_execute", __before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", __before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", __after_cursor_execute)
+    event.listen(engine, "handle_error", __handle_error)
+
+
+def __before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def __after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start_times"].pop()
+    metrics = current_request_metrics.get()
+    if metrics is not None:
+        metrics.record_query(statement, seconds)
+
+
+def __handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, so its start time is dropped here
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_times"):
+        connection.info["query_start_times"].pop()
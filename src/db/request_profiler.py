@@ -0,0 +1,60 @@
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+from contextvars import ContextVar
+
+# Up to Python 3.11 cProfile only sees the thread it was enabled on. From 3.12 it uses sys.monitoring, which sees every
+# thread but allows only one active profiler, so a second one for a threadpool call would fail
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+class RequestProfile:
+    # Before Python 3.12, besides the profiler on the event loop thread every threadpool call of the request (see
+    # run_in_session) gets its own profiler, which are all merged in stats(). From 3.12 the event loop profiler
+    # records the threadpool calls itself
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._thread_profilers: list[cProfile.Profile] = []
+
+    def call(self, fn, *args, **kwargs):
+        if not PER_THREAD_PROFILERS:
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._thread_profilers.append(profiler)
+        return profiler.runcall(fn, *args, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            profilers = [self.profiler] + self._thread_profilers
+        for profiler in profilers:
+            profiler.create_stats()
+        # The event loop profiler always has entries (at least its own disable() call), threadpool calls may not
+        return pstats.Stats(*[p for p in profilers if p.stats], stream=io.StringIO())
+
+
+current_request_profile: ContextVar[RequestProfile | None] = ContextVar("current_request_profile", default=None)
+
+
+def call_profiled(fn, *args, **kwargs):
+    # Runs fn under the current request's profile, if the request is being profiled
+    profile = current_request_profile.get()
+    if profile is None:
+        return fn(*args, **kwargs)
+    return profile.call(fn, *args, **kwargs)
+
+
+def dump_stats(stats: pstats.Stats):
+    # The same bytes as pstats.Stats.dump_stats() writes to a file, readable with pstats, snakeviz, etc.
+    return marshal.dumps(stats.stats)
+
+
+def format_stats(stats: pstats.Stats, sort: str = "cumulative", limit: int = 50):
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
@@ -1,7 +1,20 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
 
-from src.business.pydantic_schemas.company import CompanyCreate
+from sqlalchemy import tuple_, select, inspect
+from sqlalchemy.orm import Session, selectinload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.business.pydantic_schemas.company import CompanyCreate, Company as CompanySchema, CompanySummary
+from src.business.pydantic_schemas.score import Score as ScoreSchema
 from src.db.models.company import Company
+from src.db.models.score import Score
+from src.persistence.utilities.dialect_insert import dialect_insert
+from src.persistence.utilities.pagination import paginate, paginate_query
+from src.persistence.utilities.row_version import get_query_version
+from src.persistence.utilities.schema_columns import get_schema_columns
+
+COMPANY_KEY = ["country_alpha_2_iso_code", "company_number"]
+COMPANY_COLUMNS = [attribute.key for attribute in inspect(Company).column_attrs]
 
 
 def get_company(db: Session, id: int):
@@ -12,15 +25,97 @@ def get_company_by_company_number(db: Session, company_number: str):
     return db.query(Company).filter(Company.company_number == company_number).first()
 
 
-def get_companies(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Company).offset(skip).limit(limit).all()
+def get_company_by_company_number_and_country(db: Session, company_number: str, country_alpha_2_iso_code: str):
+    return db.query(Company) \
+        .filter(Company.country_alpha_2_iso_code == country_alpha_2_iso_code,
+                Company.company_number == company_number) \
+        .first()
+
+
+def get_companies_by_company_numbers_and_iso_codes(db: Session, keys: list[tuple[str, str]]):
+    if not keys:
+        return []
+    return db.query(Company) \
+        .filter(tuple_(Company.country_alpha_2_iso_code, Company.company_number).in_(keys)) \
+        .all()
+
+
+def get_companies(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                  include_scores: bool = True):
+    # The scores of the whole page are loaded with one SELECT ... WHERE company_id IN (...) rather than lazily, one
+    # query per company, during serialization. Without scores the relationship is never loaded
+    loader = selectinload(Company.scores) if include_scores else noload(Company.scores)
+    return paginate(db.query(Company).options(loader), Company.id, skip=skip, limit=limit, after=after_id)
+
+
+def get_company_rows(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                     include_scores: bool = True):
+    # Same page as get_companies as plain dicts: two column queries (companies, then their scores) instead of loading
+    # and identity mapping ORM instances
+    if not include_scores:
+        return [row._asdict() for row in paginate(db.query(*get_schema_columns(Company, CompanySummary)), Company.id,
+                                                  skip=skip, limit=limit, after=after_id)]
+    companies = paginate(db.query(*get_schema_columns(Company, CompanySchema, exclude={"scores"})), Company.id,
+                         skip=skip, limit=limit, after=after_id)
+    scores: dict[int, list[dict]] = {c.id: [] for c in companies}
+    if scores:
+        score_rows = db.query(Score.company_id, *get_schema_columns(Score, ScoreSchema)) \
+            .filter(Score.company_id.in_(scores)) \
+            .order_by(Score.company_id, Score.year)
+        for company_id, *score in score_rows:
+            scores[company_id].append(dict(zip(ScoreSchema.__fields__, score)))
+    return [{name: scores[company.id] if name == "scores" else getattr(company, name)
+             for name in CompanySchema.__fields__} for company in companies]
+
+
+def get_companies_version(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                          include_scores: bool = True):
+    # Companies are returned with their scores, so the version of a page covers both
+    page = paginate_query(db.query(Company.id, Company.updated_at), Company.id, skip=skip, limit=limit, after=after_id)
+    if not include_scores:
+        return (get_query_version(page),)
+    scores = db.query(Score.id, Score.updated_at).filter(Score.company_id.in_(select(page.subquery().c.id)))
+    return get_query_version(page), get_query_version(scores)
 
 
 def create_company(db: Session, company: CompanyCreate):
-    db_company = Company(company_number=company.company_number,
-                         country_alpha_2_iso_code=company.country_alpha_2_iso_code,
-                         name=company.name)
-    db.add(db_company)
+    created_at = datetime.now()
+    db_company = db.scalars(__insert_on_conflict_return_existing(db).returning(Company),
+                            [{**__to_row(company), "created_at": created_at}]).one()
+    # RETURNING has loaded every column, so the values are kept over the commit (which expires them) instead of being
+    # reloaded with another SELECT. The row carries this call's created_at only if it was inserted, in which case the
+    # company has no scores yet and the collection is set to empty rather than loaded. A row that existed already
+    # (the upsert returns it on conflict) gets its scores loaded
+    values = {key: getattr(db_company, key) for key in COMPANY_COLUMNS}
     db.commit()
-    db.refresh(db_company)
+    for key, value in values.items():
+        set_committed_value(db_company, key, value)
+    if values["created_at"] == created_at:
+        set_committed_value(db_company, "scores", [])
+    else:
+        db.refresh(db_company, attribute_names=["scores"])
     return db_company
+
+
+def create_companies(db: Session, companies: list[CompanyCreate]):
+    if not companies:
+        return []
+    # Rows are upserted (and so locked) in key order: two requests creating overlapping sets of companies then lock
+    # them in the same order and one waits for the other, where input order could have them deadlock on Postgres
+    rows = sorted((__to_row(c) for c in companies), key=lambda row: tuple(row[column] for column in COMPANY_KEY))
+    return db.scalars(__insert_on_conflict_return_existing(db).returning(Company), rows).all()
+
+
+def __insert_on_conflict_return_existing(db: Session):
+    # INSERT ... ON CONFLICT DO UPDATE with a no-op update (rather than DO NOTHING) so that RETURNING yields the row
+    # in either case: concurrent requests for the same new company can't create duplicates and the request that loses
+    # the race gets the winner's row back in the same round trip
+    stmt = dialect_insert(db, Company)
+    return stmt.on_conflict_do_update(index_elements=COMPANY_KEY,
+                                      set_={"company_number": stmt.excluded.company_number})
+
+
+def __to_row(company: CompanyCreate):
+    return {"company_number": company.company_number,
+            "country_alpha_2_iso_code": company.country_alpha_2_iso_code,
+            "name": company.name}
@@ -0,0 +1,54 @@
+import threading
+import time
+
+from src.business.pydantic_schemas.country import Country
+from src.db import config
+
+
+class CountryCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, Country]] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+
+    def get(self, alpha_2_iso_code: str):
+        entry = self._entries.get(alpha_2_iso_code)
+        if entry is not None and entry[0] > time.monotonic():
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+        with self._lock:
+            self.misses += 1
+            if entry is not None and self._entries.pop(alpha_2_iso_code, None) is not None:
+                self.evictions += 1
+        return None
+
+    def put(self, country: Country):
+        if self.ttl_seconds > 0:
+            self._entries[country.alpha_2_iso_code] = (time.monotonic() + self.ttl_seconds, country)
+        return country
+
+    def invalidate(self, alpha_2_iso_code: str | None = None):
+        if alpha_2_iso_code is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            removed = int(self._entries.pop(alpha_2_iso_code, None) is not None)
+        with self._lock:
+            self.invalidations += removed
+
+    def statistics(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+country_cache = CountryCache(ttl_seconds=config.get_settings().country_cache_ttl_seconds)
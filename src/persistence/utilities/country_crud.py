@@ -1,11 +1,21 @@
 from sqlalchemy.orm import Session
 
-from src.business.pydantic_schemas.country import CountryCreate
+from src.business.company_number_registry import company_number_registry
+from src.business.pydantic_schemas.country import CountryCreate, Country as CountrySchema
 from src.db.models.country import Country
+from src.persistence.utilities.country_cache import country_cache
+from src.persistence.utilities.pagination import paginate
+from src.persistence.utilities.schema_columns import get_schema_columns
 
 
 def get_country(db: Session, alpha_2_iso_code: str):
-    return db.query(Country).filter(Country.alpha_2_iso_code == alpha_2_iso_code).first()
+    cached_country = country_cache.get(alpha_2_iso_code)
+    if cached_country is not None:
+        return cached_country
+    db_country = db.query(Country).filter(Country.alpha_2_iso_code == alpha_2_iso_code).first()
+    if db_country is None:
+        return None
+    return __load_country(db_country)
 
 
 def get_country_by_id(db: Session, id: int):
@@ -16,8 +26,31 @@ def get_country_by_name(db: Session, name: str):
     return db.query(Country).filter(Country.name == name).first()
 
 
-def get_countries(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Country).offset(skip).limit(limit).all()
+def get_countries_by_iso_codes(db: Session, alpha_2_iso_codes: set[str]):
+    countries: list[CountrySchema] = []
+    missing_codes: set[str] = set()
+    for code in alpha_2_iso_codes:
+        cached_country = country_cache.get(code)
+        if cached_country is None:
+            missing_codes.add(code)
+        else:
+            countries.append(cached_country)
+    if missing_codes:
+        db_countries = db.query(Country).filter(Country.alpha_2_iso_code.in_(missing_codes)).all()
+        countries.extend(__load_country(c) for c in db_countries)
+    return countries
+
+
+def get_countries(db: Session, skip: int = 0, limit: int = 100, after_alpha_2_iso_code: str | None = None):
+    return paginate(db.query(Country), Country.alpha_2_iso_code, skip=skip, limit=limit,
+                    after=after_alpha_2_iso_code)
+
+
+def get_country_rows(db: Session, skip: int = 0, limit: int = 100, after_alpha_2_iso_code: str | None = None):
+    # Same page as get_countries as plain dicts, selected as column tuples without going through the identity map
+    rows = paginate(db.query(*get_schema_columns(Country, CountrySchema)), Country.alpha_2_iso_code, skip=skip,
+                    limit=limit, after=after_alpha_2_iso_code)
+    return [row._asdict() for row in rows]
 
 
 def create_country(db: Session, country: CountryCreate):
@@ -27,4 +60,11 @@ def create_country(db: Session, country: CountryCreate):
     db.add(db_country)
     db.commit()
     db.refresh(db_country)
+    __load_country(db_country)
     return db_country
+
+
+def __load_country(db_country: Country):
+    company_number_registry.register(alpha_2_iso_code=db_country.alpha_2_iso_code,
+                                     regex=db_country.company_number_regex)
+    return country_cache.put(CountrySchema.from_orm(db_country))
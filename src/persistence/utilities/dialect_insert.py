@@ -0,0 +1,13 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(db: Session, model):
+    # INSERT ... ON CONFLICT is dialect specific, so the statement is built with the insert construct of the database
+    # the session is bound to
+    dialect_name: str = db.get_bind().dialect.name
+    if dialect_name not in DIALECT_INSERTS:
+        raise NotImplementedError("INSERT ... ON CONFLICT is not supported for dialect " + dialect_name + ".")
+    return DIALECT_INSERTS[dialect_name](model)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.db.models.job import Job
+
+
+def get_job(db: Session, id: int):
+    return db.query(Job).filter(Job.id == id).first()
+
+
+def create_job(db: Session, kind: str, payload: dict, total_items: int):
+    db_job = Job(kind=kind, status="queued", payload=payload, total_items=total_items, processed_items=0,
+                 cancel_requested=False, created_at=datetime.now(), updated_at=datetime.now())
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+
+def claim_next_job(db: Session, kind: str, lease_seconds: float):
+    # A running job holds a lease, renewed by every update of updated_at (see update_job_progress). A job whose lease
+    # has expired belonged to a worker that crashed or was killed, so it is marked failed rather than left running
+    lease_expired_at = datetime.now() - timedelta(seconds=lease_seconds)
+    db.execute(update(Job)
+               .where(Job.status == "running", Job.kind == kind, Job.updated_at < lease_expired_at)
+               .values(status="failed", detail="The worker stopped without finishing the job (lease expired).",
+                       finished_at=datetime.now(), updated_at=datetime.now()))
+    # Claims the oldest queued job in one statement. On Postgres the subquery locks the row FOR UPDATE SKIP LOCKED, so
+    # concurrent workers each get a different job without waiting on each other; SQLite serialises writers and ignores
+    # the locking clause
+    next_job_id = select(Job.id) \
+        .where(Job.status == "queued", Job.kind == kind) \
+        .order_by(Job.id) \
+        .limit(1) \
+        .with_for_update(skip_locked=True) \
+        .scalar_subquery()
+    job_id = db.scalars(update(Job)
+                        .where(Job.id == next_job_id, Job.status == "queued")
+                        .values(status="running", started_at=datetime.now(), updated_at=datetime.now())
+                        .returning(Job.id)).first()
+    db.commit()
+    return None if job_id is None else get_job(db=db, id=job_id)
+
+
+def update_job_progress(db: Session, id: int, processed_items: int):
+    # Only a job that is still running is updated (which renews its lease), so a worker whose lease has expired finds
+    # out here that the job is no longer its own: False is returned
+    result = db.execute(update(Job).where(Job.id == id, Job.status == "running")
+                        .values(processed_items=processed_items, updated_at=datetime.now()))
+    db.commit()
+    return result.rowcount > 0
+
+
+def is_job_cancel_requested(db: Session, id: int):
+    return db.scalars(select(Job.cancel_requested).where(Job.id == id)).first() is True
+
+
+def finish_job(db: Session, id: int, status: str, result: dict | None = None, detail: str | None = None):
+    # Like update_job_progress, a job that has been failed for an expired lease in the meantime is left as it is
+    update_result = db.execute(update(Job).where(Job.id == id, Job.status == "running")
+                               .values(status=status, result=result, detail=detail, finished_at=datetime.now(),
+                                       updated_at=datetime.now()))
+    db.commit()
+    return update_result.rowcount > 0
+
+
+def cancel_job(db: Session, id: int):
+    # A queued job is cancelled straight away; a running job is flagged and stops at its next chunk boundary
+    db.execute(update(Job).where(Job.id == id, Job.status == "queued")
+               .values(status="cancelled", cancel_requested=True, finished_at=datetime.now(),
+                       updated_at=datetime.now()))
+    # updated_at is the running job's lease, which a cancel request must not renew (it would otherwise be set by the
+    # column's onupdate)
+    db.execute(update(Job).where(Job.id == id, Job.status == "running")
+               .values(cancel_requested=True, updated_at=Job.updated_at))
+    db.commit()
+    db_job = get_job(db=db, id=id)
+    if db_job is not None:
+        db.refresh(db_job)
+    return db_job
@@ -0,0 +1,31 @@
+import base64
+import json
+
+from sqlalchemy.orm import Query
+
+
+def paginate(query: Query, sort_column, skip: int = 0, limit: int = 100, after=None):
+    return paginate_query(query, sort_column, skip=skip, limit=limit, after=after).all()
+
+
+def paginate_query(query: Query, sort_column, skip: int = 0, limit: int = 100, after=None):
+    # Keyset pagination: with a sort key from the previous page the query seeks past it using the index on the sort
+    # column, so each page costs the same regardless of depth and concurrent inserts don't shift the pages. skip/limit
+    # offset paging remains available (and ordered by the same key) for backwards compatibility
+    if after is not None:
+        query = query.filter(sort_column > after)
+    return query.order_by(sort_column).offset(skip).limit(limit)
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps([key]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: type):
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("Invalid cursor: " + cursor)
+    if not isinstance(decoded, list) or len(decoded) != 1 or type(decoded[0]) is not key_type:
+        raise ValueError("Invalid cursor: " + cursor)
+    return decoded[0]
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import NamedTuple, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+
+class RowVersion(NamedTuple):
+    count: int
+    max_id: int | None
+    max_updated_at: datetime | None
+
+
+def get_row_version(rows: Iterable):
+    # Version of rows that are already loaded (objects or dicts), equal to get_query_version for the same rows
+    count, max_id, max_updated_at = 0, None, None
+    for row in rows:
+        row_id, updated_at = (row["id"], row["updated_at"]) if isinstance(row, dict) else (row.id, row.updated_at)
+        count += 1
+        max_id = row_id if max_id is None else max(max_id, row_id)
+        max_updated_at = updated_at if max_updated_at is None else max(max_updated_at, updated_at)
+    return RowVersion(count, max_id, max_updated_at)
+
+
+def get_query_version(query: Query):
+    # Aggregates the id and updated_at columns selected by the query (e.g. a page of rows) in the database, so that
+    # the version of a response can be checked without loading its rows. Row ids are never reused and writes update
+    # updated_at, so any insert or update changes the version
+    page = query.subquery()
+    return RowVersion(*query.session.query(func.count(page.c.id), func.max(page.c.id),
+                                           func.max(page.c.updated_at)).one())
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+def get_schema_columns(model, schema: type[BaseModel], exclude: set[str] = frozenset()):
+    # The model's columns in the order of the schema's fields, so that a row selected with them maps onto the same
+    # JSON object as the schema would produce from the ORM instance
+    return [getattr(model, name).label(name) for name in schema.__fields__ if name not in exclude]
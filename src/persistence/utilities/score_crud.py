@@ -1,29 +1,100 @@
 import logging
+from datetime import datetime
 
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.business.pydantic_schemas.score import ScoreCreate
+from src.db import config
+from src.db.models.company import Company
 from src.db.models.score import Score
+from src.db.models.score_history import ScoreHistory
+from src.persistence.utilities.dialect_insert import dialect_insert
+from src.persistence.utilities.pagination import paginate, paginate_query
+from src.persistence.utilities.row_version import get_query_version
 
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
+
+SCORE_HISTORY_ENABLED = config.get_settings().score_history_enabled
+EXPORT_BATCH_SIZE = 1000
 
 
 def get_score(db: Session, id: int):
     return db.query(Score).filter(Score.id == id).first()
 
 
-def get_scores_by_company_id(db: Session, id: int, skip: int = 0, limit: int = 100):
-    return db.query(Score).filter(Score.company_id == id).offset(skip).limit(limit).all()
+def get_scores_by_company_id(db: Session, id: int, skip: int = 0, limit: int = 100, after_year: int | None = None):
+    return paginate(db.query(Score).filter(Score.company_id == id), Score.year, skip=skip, limit=limit,
+                    after=after_year)
+
+
+def get_scores_version_by_company(db: Session, company_number: str, country_alpha_2_iso_code: str, skip: int = 0,
+                                  limit: int = 100, after_year: int | None = None):
+    company_id = db.scalar(select(Company.id).where(Company.country_alpha_2_iso_code == country_alpha_2_iso_code,
+                                                    Company.company_number == company_number))
+    if company_id is None:
+        return None
+    return get_query_version(paginate_query(db.query(Score.id, Score.updated_at).filter(Score.company_id == company_id),
+                                            Score.year, skip=skip, limit=limit, after=after_year))
+
+
+def get_scores(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None):
+    return paginate(db.query(Score), Score.id, skip=skip, limit=limit, after=after_id)
+
+
+def stream_scores(db: Session, country_alpha_2_iso_code: str | None = None, year_from: int | None = None,
+                  year_to: int | None = None):
+    result = db.execute(__export_statement(country_alpha_2_iso_code=country_alpha_2_iso_code, year_from=year_from,
+                                           year_to=year_to))
+    yield from result.partitions()
+
+
+async def stream_scores_async(db: AsyncSession, country_alpha_2_iso_code: str | None = None,
+                              year_from: int | None = None, year_to: int | None = None):
+    result = await db.stream(__export_statement(country_alpha_2_iso_code=country_alpha_2_iso_code,
+                                                year_from=year_from, year_to=year_to))
+    async for partition in result.partitions():
+        yield partition
+
+
+def __export_statement(country_alpha_2_iso_code: str | None, year_from: int | None, year_to: int | None):
+    # yield_per makes the driver use a server-side cursor (stream_results) and fetch EXPORT_BATCH_SIZE rows at a time,
+    # so memory stays flat however many scores are exported
+    stmt = select(Company.country_alpha_2_iso_code, Company.company_number, Score.year, Score.zscore) \
+        .join(Score.company)
+    if country_alpha_2_iso_code is not None:
+        stmt = stmt.where(Company.country_alpha_2_iso_code == country_alpha_2_iso_code)
+    if year_from is not None:
+        stmt = stmt.where(Score.year >= year_from)
+    if year_to is not None:
+        stmt = stmt.where(Score.year <= year_to)
+    return stmt.order_by(Score.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
 
 
-def get_scores(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Score).offset(skip).limit(limit).all()
+def create_scores(db: Session, scores: list[ScoreCreate]):
+    if not scores:
+        return []
+    # One score per company and year: a recalculation replaces the existing zscore in the same round trip. Postgres
+    # rejects an upsert that touches the same row twice, so duplicates within the request are collapsed (last wins)
+    rows = {(s.company_id, s.year): {"company_id": s.company_id, "year": s.year, "zscore": s.zscore} for s in scores}
+    if SCORE_HISTORY_ENABLED:
+        __retain_replaced_scores(db=db, keys=list(rows))
+    stmt = dialect_insert(db, Score)
+    stmt = stmt.on_conflict_do_update(index_elements=["company_id", "year"],
+                                      set_={"zscore": stmt.excluded.zscore, "updated_at": datetime.now()})
+    # Sorted by (company_id, year), so that concurrent upserts of overlapping scores lock the rows in the same order
+    # rather than deadlock on Postgres
+    db_scores = db.scalars(stmt.returning(Score), [row for _, row in sorted(rows.items())]).all()
+    logger.info("Scores upserted into database: %d.", len(db_scores))
+    return db_scores
 
 
-def create_score(db: Session, score: ScoreCreate):
-    db_score = Score(company_id=score.company_id, year=score.year, zscore=score.zscore)
-    db.add(db_score)
-    db.commit()
-    db.refresh(db_score)
-    logger.info("Score inserted into database: " + str(db_score))
-    return db_score
+def __retain_replaced_scores(db: Session, keys: list[tuple[int, int]]):
+    # Copies the scores about to be replaced into score_history with a single INSERT ... SELECT in the same
+    # transaction as the upsert, so the scores table only holds the current score per company and year
+    replaced_scores = select(Score.id, Score.company_id, Score.year, Score.zscore, Score.updated_at) \
+        .where(tuple_(Score.company_id, Score.year).in_(keys))
+    result = db.execute(insert(ScoreHistory).from_select(["score_id", "company_id", "year", "zscore", "scored_at"],
+                                                         replaced_scores))
+    logger.info("Scores retained in score history: %d.", result.rowcount)
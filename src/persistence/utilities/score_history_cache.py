@@ -0,0 +1,197 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from pydantic import parse_raw_as
+from pydantic.json import pydantic_encoder
+from starlette.concurrency import run_in_threadpool
+
+from src.business.pydantic_schemas.score import Score
+from src.db import config
+
+logger = logging.getLogger(__name__)
+
+CompanyKey = tuple[str, str]
+ScoreHistoryKey = tuple[str, str, int, int, int | None]
+
+
+class LruScoreHistoryBackend:
+    local = True
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[ScoreHistoryKey, tuple[float, list[Score]]] = OrderedDict()
+        self._keys_by_company: dict[CompanyKey, set[ScoreHistoryKey]] = {}
+        self._lock = threading.Lock()
+        self.evictions: int = 0
+
+    def get(self, key: ScoreHistoryKey):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self.__remove(key)
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: ScoreHistoryKey, scores: list[Score]):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, scores)
+            self._entries.move_to_end(key)
+            self._keys_by_company.setdefault(key[:2], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self.__remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, company_key: CompanyKey):
+        with self._lock:
+            keys = self._keys_by_company.pop(company_key, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_company.clear()
+
+    def size(self):
+        return len(self._entries)
+
+    def __remove(self, key: ScoreHistoryKey):
+        self._entries.pop(key, None)
+        keys = self._keys_by_company.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_company[key[:2]]
+
+
+class SharedScoreHistoryBackend:
+    # Stores entries in a Redis compatible server (any client with get/set/sadd/smembers/expire/delete), so that all app
+    # instances share one cache and see each other's invalidations. Expiry is left to the server, which is why
+    # evictions and the size are not counted here
+    local = False
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "score_history"):
+        self.client = client
+        self.ttl_seconds = max(int(ttl_seconds), 1)
+        self.prefix = prefix
+        self.evictions: int = 0
+
+    def get(self, key: ScoreHistoryKey):
+        raw = self.client.get(self.__entry_key(key))
+        return None if raw is None else parse_raw_as(list[Score], raw)
+
+    def put(self, key: ScoreHistoryKey, scores: list[Score]):
+        entry_key = self.__entry_key(key)
+        company_key = self.__company_key(key[:2])
+        self.client.set(entry_key, json.dumps(scores, default=pydantic_encoder), ex=self.ttl_seconds)
+        self.client.sadd(company_key, entry_key)
+        self.client.expire(company_key, self.ttl_seconds)
+
+    def invalidate(self, company_key: CompanyKey):
+        company_key = self.__company_key(company_key)
+        entry_keys = self.client.smembers(company_key)
+        self.client.delete(company_key, *entry_keys)
+        return len(entry_keys)
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return None
+
+    def __company_key(self, company_key: CompanyKey):
+        return self.prefix + ":" + company_key[0] + ":" + company_key[1]
+
+    def __entry_key(self, key: ScoreHistoryKey):
+        return self.__company_key(key[:2]) + ":" + ":".join(str(k) for k in key[2:])
+
+
+class ScoreHistoryCache:
+    def __init__(self, backend: LruScoreHistoryBackend | SharedScoreHistoryBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def get(self, country_iso_code: str, company_number: str, skip: int, limit: int, after_year: int | None = None):
+        scores = self.backend.get((country_iso_code, company_number, skip, limit, after_year))
+        with self._lock:
+            if scores is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return scores
+
+    def put(self, country_iso_code: str, company_number: str, skip: int, limit: int, after_year: int | None,
+            scores: list[Score]):
+        self.backend.put((country_iso_code, company_number, skip, limit, after_year), scores)
+        return scores
+
+    async def get_async(self, country_iso_code: str, company_number: str, skip: int, limit: int,
+                        after_year: int | None = None):
+        # Local lookups are cheap enough for the event loop, network round trips to a shared backend are not
+        if self.backend.local:
+            return self.get(country_iso_code, company_number, skip, limit, after_year)
+        return await run_in_threadpool(self.get, country_iso_code, company_number, skip, limit, after_year)
+
+    async def put_async(self, country_iso_code: str, company_number: str, skip: int, limit: int,
+                        after_year: int | None, scores: list[Score]):
+        if self.backend.local:
+            return self.put(country_iso_code, company_number, skip, limit, after_year, scores)
+        return await run_in_threadpool(self.put, country_iso_code, company_number, skip, limit, after_year, scores)
+
+    def invalidate(self, company_keys: Iterable[CompanyKey]):
+        # Called after the scores have been committed. A read that started before the commit can still store the old
+        # page afterwards, which the TTL bounds
+        removed = 0
+        for company_key in set(company_keys):
+            removed += self.backend.invalidate(company_key)
+        with self._lock:
+            self.invalidations += removed
+
+    async def invalidate_async(self, company_keys: Iterable[CompanyKey]):
+        # For request handlers, once run_in_session has returned: the services write the scores and return the keys
+        # of the companies, which are invalidated here rather than inside the session, where async mode runs on the
+        # event loop thread
+        if self.backend.local:
+            return self.invalidate(company_keys)
+        return await run_in_threadpool(self.invalidate, list(company_keys))
+
+    def clear(self):
+        self.backend.clear()
+
+    def statistics(self):
+        lookups = self.hits + self.misses
+        return {"size": self.backend.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.backend.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+def create_score_history_cache(settings: config.Settings):
+    if settings.score_history_cache_url is None:
+        return ScoreHistoryCache(LruScoreHistoryBackend(max_entries=settings.score_history_cache_size,
+                                                        ttl_seconds=settings.score_history_cache_ttl_seconds))
+    # Optional dependency, only needed when a shared cache is configured
+    import redis
+    logger.info("Score history cache: Using shared backend.")
+    return ScoreHistoryCache(SharedScoreHistoryBackend(client=redis.Redis.from_url(settings.score_history_cache_url),
+                                                       ttl_seconds=settings.score_history_cache_ttl_seconds))
+
+
+score_history_cache = create_score_history_cache(config.get_settings())
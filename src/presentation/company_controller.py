@@ -1,29 +1,70 @@
 import logging
-from typing import List
+from typing import List, Union
 
 import fastapi
-from fastapi import Depends, HTTPException, Body
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Body, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 from src.business.company_service import create_company_if_not_exist
-from src.business.pydantic_schemas.company import Company, CompanyCreate
-from src.db.db_setup import get_db
-from src.persistence.utilities.company_crud import get_company, get_companies
+from src.business.pydantic_schemas.company import Company, CompanyCreate, CompanySummary
+from src.db import config
+from src.db.db_setup import get_session, run_in_session, AnySession
+from src.persistence.utilities.company_crud import get_company, get_companies, get_companies_version, \
+    get_company_rows
+from src.persistence.utilities.pagination import encode_cursor, decode_cursor
+from src.persistence.utilities.row_version import get_row_version
+from src.presentation.conditional_get import get_etag, get_last_modified, is_conditional, is_not_modified, \
+    not_modified, set_validators
+from src.presentation.json_response import FastJSONResponse
 
 company_router = fastapi.APIRouter(tags=["company"])
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
 
 
-@company_router.get("/company", response_model=List[Company])
-async def get_all_companies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    companies = get_companies(db=db, skip=skip, limit=limit)
-    return companies
+# Companies come with their scores unless include_scores=false, in which case they are CompanySummary items
+@company_router.get("/company", response_model=Union[List[Company], List[CompanySummary]],
+                    responses={304: {"description": "Not Modified"}})
+async def get_all_companies(request: Request, skip: int = 0, limit: int = Query(100, ge=1),
+                            cursor: str | None = Query(None, description="Continuation token from the X-Next-Cursor "
+                                                                         "header of the previous page."),
+                            include_scores: bool = Query(True, description="Set to false to list the companies "
+                                                                           "without their scores."),
+                            db: AnySession = Depends(get_session)):
+    try:
+        after_id = None if cursor is None else decode_cursor(cursor, int)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if is_conditional(request):
+        versions = await run_in_session(db, get_companies_version, skip=skip, limit=limit, after_id=after_id,
+                                        include_scores=include_scores)
+        etag, last_modified = get_etag(*versions), get_last_modified(*versions)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+    if config.get_settings().fast_json_responses:
+        companies = await run_in_session(db, get_company_rows, skip=skip, limit=limit, after_id=after_id,
+                                         include_scores=include_scores)
+        scores = [s for c in companies for s in c["scores"]] if include_scores else []
+        response = FastJSONResponse(companies)
+    else:
+        db_companies = await run_in_session(db, get_companies, skip=skip, limit=limit, after_id=after_id,
+                                            include_scores=include_scores)
+        companies = [(Company if include_scores else CompanySummary).from_orm(c) for c in db_companies]
+        scores = [s for c in companies for s in c.scores] if include_scores else []
+        response = JSONResponse(jsonable_encoder(companies))
+    versions = (get_row_version(companies),)
+    if include_scores:
+        versions += (get_row_version(scores),)
+    if len(companies) == limit and versions[0].max_id is not None:
+        # Pages are sorted by id, so the highest id on the page is the last company's
+        response.headers["X-Next-Cursor"] = encode_cursor(versions[0].max_id)
+    return set_validators(response, get_etag(*versions), get_last_modified(*versions))
 
 
 @company_router.post("/company", response_model=Company, status_code=201)
-async def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
-    logger.info("Request to create company received: " + str(company) + ".")
-    db_company = create_company_if_not_exist(company=company, db=db)
+async def create_company(company: CompanyCreate, db: AnySession = Depends(get_session)):
+    logger.info("Request to create company received: %s.", company)
+    db_company = await run_in_session(db, create_company_if_not_exist, company=company)
     if db_company is None:
         raise HTTPException(status_code=400, detail="Failed to created company because one of the following is true: "
                                                     "1) company exists, 2) country doesn't exist, 3) or company number "
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from src.persistence.utilities.row_version import RowVersion
+
+
+def get_etag(*versions: RowVersion):
+    return '"' + hashlib.sha1(repr(versions).encode()).hexdigest() + '"'
+
+
+def get_last_modified(*versions: RowVersion):
+    timestamps = [v.max_updated_at for v in versions if v.max_updated_at is not None]
+    if not timestamps:
+        return None
+    # Timestamps are stored as naive local time; HTTP dates are in GMT with a precision of one second
+    return max(timestamps).astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_conditional(request: Request):
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110, section 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return response
+
+
+def not_modified(etag: str, last_modified: datetime | None):
+    return set_validators(Response(status_code=304), etag, last_modified)
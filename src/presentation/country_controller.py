@@ -1,12 +1,14 @@
 from typing import List
 
 import fastapi
-from fastapi import Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Path, Query, Response
 
 from src.business.pydantic_schemas.country import Country, CountryCreate
-from src.db.db_setup import get_db
-from src.persistence.utilities.country_crud import get_country, get_countries, create_country
+from src.db import config
+from src.db.db_setup import get_session, run_in_session, AnySession
+from src.persistence.utilities.country_crud import get_country, get_countries, create_country, get_country_rows
+from src.persistence.utilities.pagination import encode_cursor, decode_cursor
+from src.presentation.json_response import FastJSONResponse
 
 country_router = fastapi.APIRouter(tags=["country"])
 
@@ -16,23 +18,40 @@ async def get_country_by_alpha_2_iso_code(country_iso_code: str = Path(...,
                                                                        description="Must be a valid (alpha 2) country "
                                                                                    "ISO code, capitals only.",
                                                                        regex="^[A-Z]{2}$"),
-                                          db: Session = Depends(get_db)):
-    db_country = get_country(db=db, alpha_2_iso_code=country_iso_code)
+                                          db: AnySession = Depends(get_session)):
+    db_country = await run_in_session(db, get_country, alpha_2_iso_code=country_iso_code)
     if db_country is None:
         raise HTTPException(status_code=404, detail="Country not found.")
     return db_country
 
 
 @country_router.get("/country", response_model=List[Country])
-async def get_all_countries(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    db_countries = get_countries(db=db, skip=skip, limit=limit)
+async def get_all_countries(response: Response, skip: int = 0, limit: int = Query(100, ge=1),
+                            cursor: str | None = Query(None, description="Continuation token from the X-Next-Cursor "
+                                                                         "header of the previous page."),
+                            db: AnySession = Depends(get_session)):
+    try:
+        after_alpha_2_iso_code = None if cursor is None else decode_cursor(cursor, str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if config.get_settings().fast_json_responses:
+        rows = await run_in_session(db, get_country_rows, skip=skip, limit=limit,
+                                    after_alpha_2_iso_code=after_alpha_2_iso_code)
+        response = FastJSONResponse(rows)
+        if len(rows) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["alpha_2_iso_code"])
+        return response
+    db_countries = await run_in_session(db, get_countries, skip=skip, limit=limit,
+                                        after_alpha_2_iso_code=after_alpha_2_iso_code)
+    if len(db_countries) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(db_countries[-1].alpha_2_iso_code)
     return db_countries
 
 
 @country_router.post("/country", response_model=Country, status_code=201)
-async def create_new_country(country: CountryCreate, db: Session = Depends(get_db)):
-    existing_country: Country = get_country(db=db, alpha_2_iso_code=country.alpha_2_iso_code)
+async def create_new_country(country: CountryCreate, db: AnySession = Depends(get_session)):
+    existing_country: Country = await run_in_session(db, get_country, alpha_2_iso_code=country.alpha_2_iso_code)
     if existing_country is not None and existing_country.alpha_2_iso_code == country.alpha_2_iso_code:
         raise HTTPException(status_code=400, detail="Country exists in database. Duplicates not permitted.")
     else:
-        return create_country(db=db, country=country)
+        return await run_in_session(db, create_country, country=country)
@@ -0,0 +1,39 @@
+import logging
+
+import fastapi
+from fastapi import Depends, HTTPException, Response
+
+from src.business.job_service import submit_score_job
+from src.business.pydantic_schemas.batch_score import BatchScoreRequest
+from src.business.pydantic_schemas.job import Job
+from src.db.db_setup import get_session, run_in_session, AnySession
+from src.persistence.utilities.job_crud import get_job, cancel_job
+
+job_router = fastapi.APIRouter(tags=["job"])
+logger = logging.getLogger(__name__)
+
+
+@job_router.post("/jobs/scores", response_model=Job, status_code=202)
+async def submit_scores_job(batch: BatchScoreRequest, response: Response, db: AnySession = Depends(get_session)):
+    logger.info("Received job request to calculate Z-score(s) for %d company/companies.", len(batch.items))
+    db_job = await run_in_session(db, submit_score_job, batch=batch)
+    response.headers["Location"] = "/jobs/" + str(db_job.id)
+    return db_job
+
+
+@job_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job_status(job_id: int, db: AnySession = Depends(get_session)):
+    db_job = await run_in_session(db, get_job, id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return db_job
+
+
+@job_router.post("/jobs/{job_id}/cancel", response_model=Job)
+async def cancel_scores_job(job_id: int, db: AnySession = Depends(get_session)):
+    db_job = await run_in_session(db, cancel_job, id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if db_job.status in ("succeeded", "failed"):
+        raise HTTPException(status_code=409, detail="Job has already finished.")
+    return db_job
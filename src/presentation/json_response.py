@@ -0,0 +1,29 @@
+import json
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, the standard library encoder is used without it
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    # Renders content made of plain dicts, lists and scalars (e.g. rows built straight from SQL columns) without
+    # jsonable_encoder. The output is byte for byte the same as JSONResponse's for such content, except that with
+    # orjson floats of 1e16 or more in magnitude are written without the exponent's sign (1e20 rather than 1e+20) and
+    # those below 1e-4 without an exponent (0.000015 rather than 1.5e-05). Both parse to the same value. Z-scores are
+    # rounded to 2 decimals, so only the former can occur, for financials with a near-zero total_assets or
+    # total_liabilities
+    def render(self, content):
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+                          default=encode_json_value).encode("utf-8")
+
+
+def encode_json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError("Object of type " + type(value).__name__ + " is not JSON serializable")
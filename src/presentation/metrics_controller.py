@@ -0,0 +1,112 @@
+from typing import Dict, Optional, List
+
+import fastapi
+from fastapi import Response
+
+from src.business.app_metrics import metrics_registry, get_db_pool_metrics, CONTENT_TYPE
+from src.business.pydantic_schemas.cache_statistics import CacheStatistics
+from src.business.pydantic_schemas.pool_status import PoolStatus
+from src.business.pydantic_schemas.route_query_statistics import RouteQueryStatistics
+from src.db.db_setup import engine, async_engine
+from src.db.pool_metrics import get_pool_status
+from src.db.query_metrics import query_metrics_registry
+from src.persistence.utilities.country_cache import country_cache
+from src.persistence.utilities.score_history_cache import score_history_cache
+
+metrics_router = fastapi.APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics/pool",
+                    response_model=Dict[str, Optional[PoolStatus]],
+                    responses={
+                        200: {
+                            "description": "Live statistics of the sync and (if enabled) async connection pools",
+                            "content": {
+                                "application/json": {
+                                    "example": {"sync": {"pool_size": 5, "max_overflow": 10, "checked_out": 1,
+                                                         "checked_in": 4, "overflow": 0, "checkouts": 1200,
+                                                         "timeouts": 0, "wait_seconds_total": 0.42,
+                                                         "wait_seconds_avg": 0.00035, "wait_seconds_max": 0.012},
+                                                "async": None}
+                                }
+                            },
+                        },
+                    }
+                    )
+async def get_pool_metrics():
+    return {"sync": get_pool_status(engine.pool),
+            "async": get_pool_status(async_engine.pool) if async_engine is not None else None}
+
+
+@metrics_router.get("/metrics/cache",
+                    response_model=Dict[str, CacheStatistics],
+                    responses={
+                        200: {
+                            "description": "Size, hit/miss, eviction and invalidation counters of the caches",
+                            "content": {
+                                "application/json": {
+                                    "example": {"country": {"size": 2, "hits": 1520, "misses": 2, "evictions": 0,
+                                                            "invalidations": 0, "hit_ratio": 0.9987},
+                                                "score_history": {"size": 850, "hits": 9120, "misses": 880,
+                                                                  "evictions": 30, "invalidations": 12,
+                                                                  "hit_ratio": 0.912}}
+                                }
+                            },
+                        },
+                    }
+                    )
+async def get_cache_metrics():
+    return {"country": country_cache.statistics(), "score_history": score_history_cache.statistics()}
+
+
+@metrics_router.get("/metrics/queries",
+                    response_model=List[RouteQueryStatistics],
+                    responses={
+                        200: {
+                            "description": "SQL statement counts and database time per route since the app started "
+                                           "(or since the last reset)",
+                            "content": {
+                                "application/json": {
+                                    "example": [{"route": "GET /company", "requests": 120, "queries_total": 240,
+                                                 "queries_avg": 2.0, "queries_max": 2, "db_seconds_total": 0.84,
+                                                 "db_seconds_avg": 0.007, "db_seconds_max": 0.031,
+                                                 "pool_wait_seconds_total": 0.002,
+                                                 "slowest_statement_seconds": 0.027,
+                                                 "slowest_statement": "SELECT companies.id, ... LIMIT ? OFFSET ?"}]
+                                }
+                            },
+                        },
+                    }
+                    )
+async def get_query_metrics():
+    return query_metrics_registry.statistics()
+
+
+@metrics_router.delete("/metrics/queries", status_code=204)
+async def reset_query_metrics():
+    query_metrics_registry.reset()
+
+
+@metrics_router.get("/metrics",
+                    response_class=Response,
+                    responses={
+                        200: {
+                            "description": "Request, scoring and connection pool metrics in the Prometheus text "
+                                           "exposition format",
+                            "content": {
+                                CONTENT_TYPE: {
+                                    "example": "# HELP scores_persisted_total Z-scores stored in the database, by "
+                                               "source (single, batch or import).\n"
+                                               "# TYPE scores_persisted_total counter\n"
+                                               "scores_persisted_total{source=\"single\"} 42\n"
+                                }
+                            },
+                        },
+                    }
+                    )
+async def get_prometheus_metrics():
+    pools = {"sync": get_pool_status(engine.pool),
+             "async": get_pool_status(async_engine.pool) if async_engine is not None else None}
+    # The content type is set as a header, Response would append a second charset to a text media type
+    return Response(content=metrics_registry.render(get_db_pool_metrics(pools)),
+                    headers={"Content-Type": CONTENT_TYPE})
@@ -0,0 +1,50 @@
+import hmac
+from typing import List, Literal
+
+import fastapi
+from fastapi import Depends, Header, HTTPException, Query, Response
+
+from src.business.pydantic_schemas.profile_summary import ProfileSummary
+from src.db import config
+from src.presentation.profiling_middleware import PROFILES_PATH, profile_store
+
+
+async def verify_profiling_token(x_profile: str | None = Header(None, description="Must match PROFILING_TOKEN.")):
+    # Profiles show the app's code paths and the requests' timings, so reading them takes the same token as capturing
+    # them. Without a configured token (sampling only) they can't be read over HTTP at all
+    token = config.get_settings().profiling_token
+    if not token or x_profile is None or not hmac.compare_digest(x_profile.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Missing or invalid X-Profile token.")
+
+
+profile_router = fastapi.APIRouter(tags=["profiling"], dependencies=[Depends(verify_profiling_token)],
+                                   responses={403: {"description": "Missing or invalid X-Profile token"}})
+
+
+@profile_router.get(PROFILES_PATH, response_model=List[ProfileSummary])
+async def get_profiles():
+    return profile_store.list()
+
+
+@profile_router.get(PROFILES_PATH + "/{profile_id}",
+                    response_class=Response,
+                    responses={
+                        200: {
+                            "description": "The profile as a pstats file (format=pstats, e.g. for python -m pstats or "
+                                           "snakeviz) or as a text report (format=text)",
+                            "content": {"application/octet-stream": {}, "text/plain": {}},
+                        },
+                        404: {"description": "Profile Not Found"},
+                    }
+                    )
+async def download_profile(profile_id: int,
+                           profile_format: Literal["pstats", "text"] = Query("pstats", alias="format"),
+                           sort: Literal["cumulative", "tottime", "calls"] = "cumulative",
+                           limit: int = Query(50, ge=1, le=1000)):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    if profile_format == "text":
+        return Response(content=profile.text(sort=sort, limit=limit), media_type="text/plain")
+    return Response(content=profile.pstats(), media_type="application/octet-stream",
+                    headers={"Content-Disposition": 'attachment; filename="profile-' + str(profile_id) + '.pstats"'})
@@ -0,0 +1,135 @@
+import hmac
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.db import config
+from src.db.request_profiler import RequestProfile, current_request_profile, dump_stats, format_stats
+from src.presentation.route_names import RouteNames
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+# Reading profiles takes the token as well, but isn't profiled itself, which would evict the profiles being read
+PROFILES_PATH = "/profiles"
+
+
+class StoredProfile:
+    def __init__(self, id: int, route: str, path: str, status: int, started_at: datetime, seconds: float,
+                 profile: RequestProfile):
+        self.id = id
+        self.route = route
+        self.path = path
+        self.status = status
+        self.started_at = started_at
+        self.seconds = seconds
+        self.profile = profile
+
+    def pstats(self):
+        return dump_stats(self.profile.stats())
+
+    def text(self, sort: str = "cumulative", limit: int = 50):
+        return format_stats(self.profile.stats(), sort=sort, limit=limit)
+
+
+class ProfileStore:
+    # Keeps the most recent profiles in memory (per app process)
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[int, StoredProfile] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        with self._lock:
+            return next(self._ids)
+
+    def add(self, profile: StoredProfile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, id: int):
+        with self._lock:
+            return self._profiles.get(id)
+
+    def list(self):
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+class ProfilingMiddleware:
+    # Profiles a request with cProfile when it carries the X-Profile header with the configured token, or when it is
+    # picked by the sample rate. Only one request is profiled at a time: cProfile allows one active profiler per thread
+    # (per process from Python 3.12) and the event loop thread is shared by all requests, whose work interleaved with
+    # the profiled request's is recorded as well. All other requests pass through after a header lookup and a random
+    # number
+    def __init__(self, app: ASGIApp, token: str | None = None, sample_rate: float = 0.0,
+                 store: "ProfileStore | None" = None):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.store = store if store is not None else profile_store
+        self._active = threading.Lock()
+        self._route_names = RouteNames()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.__is_selected(scope) or not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile()
+        try:
+            profile.profiler.enable()
+        except ValueError:
+            # From Python 3.12 only one profiler can be active per process, e.g. a debugger or coverage may hold it
+            self._active.release()
+            logger.warning("Request not profiled, another profiling tool is active.")
+            await self.app(scope, receive, send)
+            return
+        profile_id = self.store.next_id()
+        status = [500]
+        started_at = datetime.now()
+        token = current_request_profile.set(profile)
+        start = time.perf_counter()
+
+        async def send_with_profile_id(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile_id).encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.profiler.disable()
+            current_request_profile.reset(token)
+            self._active.release()
+            route = scope["method"] + " " + self._route_names.get(scope)
+            self.store.add(StoredProfile(id=profile_id, route=route, path=scope["path"], status=status[0],
+                                         started_at=started_at, seconds=time.perf_counter() - start,
+                                         profile=profile))
+            logger.info("Profile %d stored for %s.", profile_id, route)
+
+    def __is_selected(self, scope: Scope):
+        if scope["path"] == PROFILES_PATH or scope["path"].startswith(PROFILES_PATH + "/"):
+            return False
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+profile_store = ProfileStore(max_profiles=config.get_settings().profiling_max_profiles)
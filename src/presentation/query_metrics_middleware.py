@@ -0,0 +1,45 @@
+import time
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.db.query_metrics import RequestQueryMetrics, current_request_metrics, query_metrics_registry
+from src.presentation.route_names import RouteNames
+
+
+class QueryMetricsMiddleware:
+    # Pure ASGI middleware (not BaseHTTPMiddleware), so that the endpoint runs in this context and sees the metrics.
+    # The Server-Timing header is written when the response starts; streamed responses keep querying afterwards, which
+    # only the per-route statistics (recorded once the last body chunk is sent) include
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_names = RouteNames()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = RequestQueryMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+
+        async def send_with_metrics(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", get_server_timing(metrics, time.perf_counter() - start).encode("latin-1"))]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                query_metrics_registry.record(scope["method"] + " " + self._route_names.get(scope), metrics)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_request_metrics.reset(token)
+
+
+def get_server_timing(metrics: RequestQueryMetrics, app_seconds: float):
+    timings = ['db;dur=%.3f;desc="%d queries"' % (metrics.db_seconds * 1000, metrics.queries),
+               "db-slowest;dur=%.3f" % (metrics.slowest_seconds * 1000),
+               "db-pool;dur=%.3f" % (metrics.pool_wait_seconds * 1000),
+               "app;dur=%.3f" % (app_seconds * 1000)]
+    return ", ".join(timings)
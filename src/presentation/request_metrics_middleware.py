@@ -0,0 +1,35 @@
+import time
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.business.app_metrics import http_requests_total, http_request_duration_seconds, http_requests_in_progress
+from src.presentation.route_names import RouteNames
+
+
+class RequestMetricsMiddleware:
+    # Pure ASGI middleware that counts requests per route and status code and records their latency (until the last
+    # body chunk has been sent). Requests that fail before a response is started are counted as 500
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_names = RouteNames()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = [500]
+        start = time.perf_counter()
+        http_requests_in_progress.inc()
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec()
+            route = self._route_names.get(scope)
+            http_request_duration_seconds.observe(time.perf_counter() - start, (scope["method"], route))
+            http_requests_total.inc(1, (scope["method"], route, str(status[0])))
@@ -0,0 +1,17 @@
+from starlette.types import Scope
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteNames:
+    # Routes are reported by their path template (e.g. /company/{country_iso_code}/{company_number}), which the router
+    # leaves in the scope as the matched endpoint. Unmatched paths share one name, so that they can't grow the number
+    # of reported routes without bounds
+    def __init__(self):
+        self._route_paths: dict | None = None
+
+    def get(self, scope: Scope):
+        if self._route_paths is None:
+            self._route_paths = {getattr(r, "endpoint", None): r.path for r in scope["app"].routes}
+        path = self._route_paths.get(scope.get("endpoint"))
+        return path if path is not None else UNMATCHED_ROUTE
@@ -1,21 +1,32 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Literal
 
 import fastapi
-from fastapi import Path, Depends, HTTPException, Body
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import Path, Depends, HTTPException, Body, Query, Response, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.business.company_service import get_or_create_company, get_company_by_company_number_and_iso_code
+from src.business.pydantic_schemas.batch_score import BatchScoreRequest, BatchScoreReport
 from src.business.pydantic_schemas.company import Company
 from src.business.pydantic_schemas.financials import Financials
 from src.business.pydantic_schemas.score import ScoreBase, Score
-from src.business.score_service import validate_financials, request_scores
-from src.db.db_setup import get_db
-from src.persistence.utilities.score_crud import get_scores_by_company_id
+from src.business.pydantic_schemas.score_import import ScoreImportReport
+from src.business.score_export import export_scores, EXPORT_MEDIA_TYPES
+from src.business.score_import import import_scores_stream
+from src.business.score_process_pool import get_score_process_pool
+from src.business.score_service import validate_financials, request_scores, request_batch_scores, \
+    get_scored_company_keys
+from src.db import config
+from src.db.db_setup import get_session, run_in_session, AnySession
+from src.persistence.utilities.pagination import encode_cursor, decode_cursor
+from src.persistence.utilities.row_version import get_row_version
+from src.persistence.utilities.score_crud import get_scores_by_company_id, get_scores_version_by_company
+from src.persistence.utilities.score_history_cache import score_history_cache
+from src.presentation.conditional_get import get_etag, get_last_modified, is_conditional, is_not_modified, \
+    not_modified, set_validators
 
 score_router = fastapi.APIRouter()
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
 
 
 @score_router.post("/company/{country_iso_code}/{company_number}",
@@ -59,10 +70,11 @@ async def calculate_score(financials_payload: dict[str, list[Financials]] = Body
                                                       "capitals only.",
                                      regex="^[A-Z]{2}$"),
         company_number: str = Path(..., description="Must be a valid company number for the country."),
-        db: Session = Depends(get_db)):
-    logger.info("Received valid request with financials to calculate Z-score(s) for company_number=" + company_number +
-                " (" + country_iso_code + ").")
-    company: Company = get_or_create_company(company_number, country_iso_code, db)
+        db: AnySession = Depends(get_session)):
+    logger.info("Received valid request with financials to calculate Z-score(s) for company_number=%s (%s).",
+                company_number, country_iso_code)
+    company: Company = await run_in_session(db, get_or_create_company, company_number=company_number,
+                                            country_iso_code=country_iso_code)
     if company is None:
         raise HTTPException(status_code=400,
                             detail="Failed to retrieve existing and create new company because the country doesn't "
@@ -74,7 +86,126 @@ async def calculate_score(financials_payload: dict[str, list[Financials]] = Body
         raise HTTPException(status_code=400,
                             detail="Invalid financials provided. Financials contain 0 values for at least one of the "
                                    "denominators in Altman's Z-Score (total_assets or total_liabilities).")
-    return {"scores": request_scores(financials_list=financials_list, company=company, db=db)}
+    company_key = (company.country_alpha_2_iso_code, company.company_number)
+    scores = await run_in_session(db, request_scores, financials_list=financials_list, company=company)
+    await score_history_cache.invalidate_async([company_key])
+    return {"scores": scores}
+
+
+@score_router.post("/scores/batch",
+                   response_model=BatchScoreReport,
+                   tags=["score"],
+                   responses={
+                       200: {
+                           "description": "Successful Response (check the success flag of each result)",
+                           "content": {
+                               "application/json": {
+                                   "example": {"succeeded": 1, "failed": 1, "results": [
+                                       {"country_iso_code": "GB", "company_number": "12345678", "success": True,
+                                        "scores": [{"year": 2020, "zscore": 6.47}], "detail": None},
+                                       {"country_iso_code": "XX", "company_number": "123", "success": False,
+                                        "scores": [], "detail": "Failed to retrieve existing and create new company "
+                                                                "because the country doesn't exist or the company "
+                                                                "number violates the country's formatting rules for "
+                                                                "company numbers."}]}
+                               }
+                           },
+                       },
+                   }
+                   )
+async def calculate_batch_scores(batch: BatchScoreRequest = Body(example={
+    "items": [
+        {
+            "country_iso_code": "GB",
+            "company_number": "12345678",
+            "financials": [
+                {
+                    "year": 2020,
+                    "ebit": 123.45,
+                    "equity": 234.56,
+                    "retained_earnings": 345.67,
+                    "sales": 1234.56,
+                    "total_assets": 345.67,
+                    "total_liabilities": 456.78,
+                    "working_capital": 23.45
+                }]
+        }],
+}),
+        db: AnySession = Depends(get_session)):
+    logger.info("Received batch request to calculate Z-score(s) for %d company/companies.", len(batch.items))
+    report = await run_in_session(db, request_batch_scores, items=batch.items)
+    await score_history_cache.invalidate_async(get_scored_company_keys(report))
+    return report
+
+
+@score_router.post("/scores/import",
+                   response_model=ScoreImportReport,
+                   tags=["score"],
+                   openapi_extra={
+                       "requestBody": {
+                           "required": True,
+                           "content": {
+                               "application/x-ndjson": {
+                                   "schema": {"type": "string"},
+                                   "example": '{"country_iso_code": "GB", "company_number": "12345678", "year": 2020, '
+                                              '"ebit": 123.45, "equity": 234.56, "retained_earnings": 345.67, '
+                                              '"sales": 1234.56, "total_assets": 345.67, "total_liabilities": '
+                                              '456.78, "working_capital": 23.45}'
+                               },
+                               "text/csv": {
+                                   "schema": {"type": "string"},
+                                   "example": "country_iso_code,company_number,year,ebit,equity,retained_earnings,"
+                                              "sales,total_assets,total_liabilities,working_capital\n"
+                                              "GB,12345678,2020,123.45,234.56,345.67,1234.56,345.67,456.78,23.45"
+                               }
+                           }
+                       }
+                   })
+async def import_all_scores(request: Request,
+                            import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+                            chunk_size: int | None = Query(None, ge=1, le=10000,
+                                                           description="Rows per transaction (default: "
+                                                                       "SCORE_IMPORT_CHUNK_SIZE)."),
+                            db: AnySession = Depends(get_session)):
+    logger.info("Received request to import scores (format=%s).", import_format)
+    return await import_scores_stream(byte_stream=request.stream(), import_format=import_format,
+                                      chunk_size=chunk_size or config.get_settings().score_import_chunk_size, db=db,
+                                      process_pool=get_score_process_pool())
+
+
+@score_router.get("/scores/export",
+                  tags=["score"],
+                  response_class=StreamingResponse,
+                  responses={
+                      200: {
+                          "description": "Successful Response (streamed, one score per line)",
+                          "content": {
+                              "application/x-ndjson": {
+                                  "example": '{"country_alpha_2_iso_code": "GB", "company_number": "12345678", '
+                                             '"year": 2020, "zscore": 6.47}'
+                              },
+                              "text/csv": {
+                                  "example": "country_alpha_2_iso_code,company_number,year,zscore\n"
+                                             "GB,12345678,2020,6.47"
+                              }
+                          },
+                      },
+                  }
+                  )
+async def export_all_scores(export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+                            country_iso_code: str | None = Query(None, alias="country",
+                                                                 description="Must be a valid (alpha 2) country ISO "
+                                                                             "code, capitals only.",
+                                                                 regex="^[A-Z]{2}$"),
+                            year_from: int | None = None,
+                            year_to: int | None = None,
+                            db: AnySession = Depends(get_session)):
+    logger.info("Received request to export scores (format=%s, country=%s, year_from=%s, year_to=%s).", export_format,
+                country_iso_code, year_from, year_to)
+    return StreamingResponse(export_scores(db=db, export_format=export_format, country_iso_code=country_iso_code,
+                                           year_from=year_from, year_to=year_to),
+                             media_type=EXPORT_MEDIA_TYPES[export_format],
+                             headers={"Content-Disposition": 'attachment; filename="scores.' + export_format + '"'})
 
 
 @score_router.get("/company/{country_iso_code}/{company_number}",
@@ -89,6 +220,7 @@ async def calculate_score(financials_payload: dict[str, list[Financials]] = Body
                               }
                           },
                       },
+                      304: {"description": "Not Modified"},
                       404: {
                           "description": "Company Not Found",
                           "content": {
@@ -100,19 +232,45 @@ async def calculate_score(financials_payload: dict[str, list[Financials]] = Body
                       },
                   }
                   )
-async def get_scores_by_company(company_number: str,
+async def get_scores_by_company(request: Request,
+                                response: Response,
+                                company_number: str,
                                 country_iso_code: str = Path(...,
                                                              description="Must be a valid (alpha 2) country ISO code, "
                                                                          "capitals only. ",
                                                              regex="^[A-Z]{2}$"),
-                                skip: int = 0, limit: int = 100,
-                                db: Session = Depends(get_db)):
-    existing_company = get_company_by_company_number_and_iso_code(db=db, company_number=company_number,
-                                                                  country_iso_code=country_iso_code)
-    if existing_company is None:
-        return JSONResponse(status_code=404, content={"message": "Company does not exist. Please verify that you have "
-                                                                 "entered the correct country_iso_code and "
-                                                                 "company_number."})
-    else:
-        logger.info("Company retrieved: " + existing_company.name + " (company_id=" + str(existing_company.id) + ").")
-        return {"scores": get_scores_by_company_id(db=db, id=existing_company.id, skip=skip, limit=limit)}
+                                skip: int = 0, limit: int = Query(100, ge=1),
+                                cursor: str | None = Query(None, description="Continuation token from the "
+                                                                             "X-Next-Cursor header of the previous "
+                                                                             "page."),
+                                db: AnySession = Depends(get_session)):
+    try:
+        after_year = None if cursor is None else decode_cursor(cursor, int)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if is_conditional(request):
+        version = await run_in_session(db, get_scores_version_by_company, company_number=company_number,
+                                       country_alpha_2_iso_code=country_iso_code, skip=skip, limit=limit,
+                                       after_year=after_year)
+        if version is not None:
+            etag, last_modified = get_etag(version), get_last_modified(version)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+    scores = await score_history_cache.get_async(country_iso_code, company_number, skip, limit, after_year)
+    if scores is None:
+        existing_company = await run_in_session(db, get_company_by_company_number_and_iso_code,
+                                                company_number=company_number, country_iso_code=country_iso_code)
+        if existing_company is None:
+            return JSONResponse(status_code=404, content={"message": "Company does not exist. Please verify that you "
+                                                                     "have entered the correct country_iso_code and "
+                                                                     "company_number."})
+        logger.info("Company retrieved: %s (company_id=%d).", existing_company.name, existing_company.id)
+        db_scores = await run_in_session(db, get_scores_by_company_id, id=existing_company.id, skip=skip, limit=limit,
+                                         after_year=after_year)
+        scores = await score_history_cache.put_async(country_iso_code, company_number, skip, limit, after_year,
+                                                     [Score.from_orm(s) for s in db_scores])
+    if len(scores) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(scores[-1].year)
+    version = get_row_version(scores)
+    set_validators(response, get_etag(version), get_last_modified(version))
+    return {"scores": scores}
@@ -0,0 +1,35 @@
+import argparse
+
+from src.business.score_import import import_scores, IMPORT_FORMATS
+from src.business.score_process_pool import ScoreProcessPool
+from src.db import config
+from src.db.db_setup import SessionLocal
+from src.db.log_config import configure_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculate and store scores for every row of an NDJSON or CSV file of "
+                                                 "(country_iso_code, company_number, financials) rows.")
+    parser.add_argument("path", help="file to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="file format (default: derived from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=config.get_settings().score_import_chunk_size,
+                        help="rows per transaction (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=config.get_settings().score_process_workers,
+                        help="worker processes for parsing and scoring, 0 to run them in this process "
+                             "(default: %(default)s)")
+    args = parser.parse_args()
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    configure_logging(config.get_settings())
+    process_pool = ScoreProcessPool(workers=args.processes) if args.processes > 0 else None
+    try:
+        with open(args.path, encoding="utf-8") as lines, SessionLocal() as db:
+            report = import_scores(lines=lines, import_format=import_format, chunk_size=args.chunk_size, db=db,
+                                   process_pool=process_pool)
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+    print(report.json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
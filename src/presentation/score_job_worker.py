@@ -0,0 +1,63 @@
+import argparse
+import logging
+import multiprocessing
+import signal
+
+from src.business.job_service import run_next_score_job
+from src.db import config
+from src.db.db_setup import SessionLocal, engine
+from src.db.log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(chunk_size: int, poll_interval: float, lease_seconds: float, stop_event):
+    # Connections inherited from the parent process must not be shared, so each worker starts with a fresh pool. The
+    # log queue listener is a thread, which a forked process does not inherit, so logging is set up again as well
+    engine.dispose(close=False)
+    configure_logging(config.get_settings())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logger.info("Score job worker started (pid=%d).", multiprocessing.current_process().pid)
+    while not stop_event.is_set():
+        try:
+            with SessionLocal() as db:
+                processed = run_next_score_job(db=db, chunk_size=chunk_size, lease_seconds=lease_seconds)
+        except Exception:
+            logger.exception("Score job worker failed to claim or run a job.")
+            processed = False
+        if not processed:
+            stop_event.wait(poll_interval)
+
+
+def main():
+    settings = config.get_settings()
+    parser = argparse.ArgumentParser(description="Run score jobs queued through POST /jobs/scores.")
+    parser.add_argument("--processes", type=int, default=settings.job_worker_processes,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=settings.job_chunk_size,
+                        help="items per transaction and cancellation check (default: %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=settings.job_poll_interval_seconds,
+                        help="seconds to wait when the queue is empty (default: %(default)s)")
+    parser.add_argument("--lease-seconds", type=float, default=settings.job_lease_seconds,
+                        help="seconds without progress after which a running job is marked failed; must exceed the "
+                             "time a chunk takes (default: %(default)s)")
+    args = parser.parse_args()
+    configure_logging(settings)
+    stop_event = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=run_worker,
+                                       args=(args.chunk_size, args.poll_interval, args.lease_seconds, stop_event))
+               for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == "__main__":
+    main()
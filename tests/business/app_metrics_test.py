@@ -0,0 +1,58 @@
+import pytest
+
+from src.business.app_metrics import Counter, Gauge, Histogram, MetricsRegistry, get_db_pool_metrics
+
+
+@pytest.mark.unit
+def test_counter__renders_labelled_samples():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("requests_total", "Requests.", ("route", "status")))
+    counter.inc(1, ("/company", "200"))
+    counter.inc(2, ("/company", "200"))
+    counter.inc(1, ('/a"b\\c', "404"))
+    assert registry.render() == ('# HELP requests_total Requests.\n'
+                                 '# TYPE requests_total counter\n'
+                                 'requests_total{route="/a\\"b\\\\c",status="404"} 1\n'
+                                 'requests_total{route="/company",status="200"} 3\n')
+
+
+@pytest.mark.unit
+def test_counter__unlabelled_counter_starts_at_zero():
+    registry = MetricsRegistry()
+    registry.register(Counter("created_total", "Created."))
+    assert registry.render().endswith("created_total 0\n")
+
+
+@pytest.mark.unit
+def test_gauge__inc_dec_and_set():
+    gauge = Gauge("in_progress", "In progress.")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.value() == 1
+    gauge.set(0.5)
+    assert gauge.samples() == [("in_progress", {}, 0.5)]
+
+
+@pytest.mark.unit
+def test_histogram__cumulative_buckets_count_and_sum():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("/company",))
+    assert histogram.count(("/company",)) == 4
+    assert histogram.samples() == [("latency_seconds_bucket", {"route": "/company", "le": "0.1"}, 2),
+                                   ("latency_seconds_bucket", {"route": "/company", "le": "1"}, 3),
+                                   ("latency_seconds_bucket", {"route": "/company", "le": "+Inf"}, 4),
+                                   ("latency_seconds_count", {"route": "/company"}, 4),
+                                   ("latency_seconds_sum", {"route": "/company"}, 3.65)]
+
+
+@pytest.mark.unit
+def test_get_db_pool_metrics__skips_missing_pools():
+    status = {"pool_size": 5, "checked_out": 1, "checked_in": 4, "overflow": 0, "checkouts": 10, "timeouts": 0,
+              "wait_seconds_total": 0.25}
+    text = MetricsRegistry().render(get_db_pool_metrics({"sync": status, "async": None}))
+    assert "# TYPE db_pool_checked_out gauge\ndb_pool_checked_out{pool=\"sync\"} 1\n" in text
+    assert "# TYPE db_pool_checkouts_total counter\ndb_pool_checkouts_total{pool=\"sync\"} 10\n" in text
+    assert 'db_pool_wait_seconds_total{pool="sync"} 0.25\n' in text
+    assert "async" not in text
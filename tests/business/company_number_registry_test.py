@@ -0,0 +1,33 @@
+import re
+
+import pytest
+
+from src.business.company_number_registry import CompanyNumberRegexRegistry
+
+
+@pytest.mark.unit
+def test_validate__compiles_pattern_once(mocker):
+    registry = CompanyNumberRegexRegistry()
+    compile_spy = mocker.spy(re, "compile")
+    assert registry.validate("GB", "12345678", "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8})$") is True
+    assert registry.validate("GB", "SC123456", "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8})$") is True
+    assert registry.validate("GB", "123", "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8})$") is False
+    assert compile_spy.call_count == 1
+    assert len(registry) == 1
+
+
+@pytest.mark.unit
+def test_validate__recompiles_changed_pattern():
+    registry = CompanyNumberRegexRegistry()
+    registry.register("GB", "^[0-9]{8}$")
+    assert registry.validate("GB", "SC123456", "^[0-9]{8}$") is False
+    assert registry.validate("GB", "SC123456", "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8})$") is True
+    assert len(registry) == 1
+
+
+@pytest.mark.unit
+def test_register__invalid_pattern():
+    registry = CompanyNumberRegexRegistry()
+    with pytest.raises(re.error):
+        registry.register("GB", "^[0-9")
+    assert len(registry) == 0
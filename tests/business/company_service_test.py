@@ -1,7 +1,8 @@
 import pytest
 
-from src.business.company_service import validate_company_number_with_regex, get_company_by_company_number_and_iso_code, \
-    create_company_if_not_exist, get_or_create_company
+from src.business.company_service import validate_company_number_with_regex, validate_company_number, \
+    get_company_by_company_number_and_iso_code, create_company_if_not_exist, get_or_create_company, \
+    get_or_create_companies
 
 
 @pytest.mark.unit
@@ -18,20 +19,29 @@ def test_validate_company_number_with_regex__with_invalid_regex():
     assert validate_company_number_with_regex(company_number="", regex="^[0-9]+$") is False
 
 
+@pytest.mark.unit
+def test_validate_company_number(test_country_1, test_country_2):
+    assert validate_company_number(company_number="SC123456", country=test_country_1) is True
+    assert validate_company_number(company_number="12-3456789", country=test_country_1) is False
+    assert validate_company_number(company_number="12-3456789", country=test_country_2) is False
+    assert validate_company_number(company_number="12-3456789]", country=test_country_2) is True
+
+
 @pytest.mark.unit
 def test_get_company_by_company_number_and_iso_code__with_existing_company(mocker, test_company_1, mock_db):
-    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number",
+    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_country",
                                return_value=test_company_1)
     assert test_company_1 == get_company_by_company_number_and_iso_code(mock_db,
                                                                         test_company_1.company_number,
                                                                         test_company_1.country_alpha_2_iso_code)
-    mock_method.assert_called_once()
+    mock_method.assert_called_once_with(db=mock_db, company_number=test_company_1.company_number,
+                                        country_alpha_2_iso_code=test_company_1.country_alpha_2_iso_code)
 
 
 @pytest.mark.unit
-def test_get_company_by_company_number_and_iso_code__with_new_company(mocker, mock_db, test_company_1, test_company_2):
-    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number",
-                               return_value=test_company_2)
+def test_get_company_by_company_number_and_iso_code__with_new_company(mocker, mock_db, test_company_1):
+    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_country",
+                               return_value=None)
     assert get_company_by_company_number_and_iso_code(mock_db,
                                                       test_company_1.company_number,
                                                       test_company_1.country_alpha_2_iso_code) is None
@@ -40,7 +50,7 @@ def test_get_company_by_company_number_and_iso_code__with_new_company(mocker, mo
 
 @pytest.mark.unit
 def test_create_company_if_not_exist__company_exists(mocker, test_company_create_1, test_company_1, mock_db):
-    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number",
+    mock_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_country",
                                return_value=test_company_1)
     assert create_company_if_not_exist(test_company_create_1, mock_db) is None
     mock_method.assert_called_once()
@@ -48,7 +58,8 @@ def test_create_company_if_not_exist__company_exists(mocker, test_company_create
 
 @pytest.mark.unit
 def test_create_company_if_not_exist__new_company(mocker, test_company_1, test_company_create_1, mock_db):
-    mock_get_method = mocker.patch("src.business.company_service.get_company_by_company_number", return_value=None)
+    mock_get_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_country",
+                                   return_value=None)
     mock_create_method = mocker.patch("src.business.company_service.__create_new_company", return_value=test_company_1)
     assert create_company_if_not_exist(test_company_create_1, mock_db) == test_company_1
     mock_get_method.assert_called_once()
@@ -70,10 +81,12 @@ def test_get_or_create_company__new_company_valid_request(mocker, test_company_1
     mock_get_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_iso_code",
                                    return_value=None)
     mock_create_method = mocker.patch("src.business.company_service.__create_new_company", return_value=test_company_1)
+    mock_created = mocker.patch("src.business.company_service.companies_created_total")
     assert get_or_create_company(test_company_1.company_number, test_company_1.country_alpha_2_iso_code,
                                  mock_db) == test_company_1
     mock_get_method.assert_called_once()
     mock_create_method.assert_called_once()
+    mock_created.inc.assert_called_once()
 
 
 @pytest.mark.unit
@@ -81,10 +94,12 @@ def test_get_or_create_company__new_company_invalid_country(mocker, test_company
     mock_get_method = mocker.patch("src.business.company_service.get_company_by_company_number_and_iso_code",
                                    return_value=None)
     mock_create_method = mocker.patch("src.business.company_service.__create_new_company", return_value=None)
+    mock_created = mocker.patch("src.business.company_service.companies_created_total")
     assert get_or_create_company(test_company_2.company_number, test_company_2.country_alpha_2_iso_code,
                                  mock_db) is None
     mock_get_method.assert_called_once()
     mock_create_method.assert_called_with(company=test_company_create_2, db=mock_db)
+    mock_created.inc.assert_not_called()
 
 
 @pytest.mark.unit
@@ -98,3 +113,36 @@ def test_get_or_create_company__new_company_invalid_company_no(mocker, mock_db,
     mock_get_method.assert_called_with(db=mock_db, company_number=test_company_create_2.company_number,
                                        country_iso_code=test_company_create_2.country_alpha_2_iso_code)
     mock_country_method.assert_called_with(alpha_2_iso_code=test_company_create_2.country_alpha_2_iso_code, db=mock_db)
+
+
+@pytest.mark.unit
+def test_get_or_create_companies__existing_new_and_invalid_companies(mocker, mock_db, test_company_1, test_company_2,
+                                                                     test_country_1):
+    new_company = test_company_1.copy(update={"id": 3, "company_number": "87654321"})
+    mock_get_method = mocker.patch("src.business.company_service.get_companies_by_company_numbers_and_iso_codes",
+                                   return_value=[test_company_1])
+    mock_country_method = mocker.patch("src.business.company_service.get_countries_by_iso_codes",
+                                       return_value=[test_country_1])
+    mock_create_method = mocker.patch("src.business.company_service.create_companies", return_value=[new_company])
+    keys = [("GB", test_company_1.company_number), ("GB", "87654321"), ("GB", "123"),
+            (test_company_2.country_alpha_2_iso_code, test_company_2.company_number), ("GB", "87654321")]
+    companies = get_or_create_companies(keys, mock_db)
+    assert companies == {("GB", test_company_1.company_number): test_company_1,
+                         ("GB", "87654321"): new_company,
+                         ("GB", "123"): None,
+                         (test_company_2.country_alpha_2_iso_code, test_company_2.company_number): None}
+    mock_get_method.assert_called_once()
+    mock_country_method.assert_called_once_with(db=mock_db, alpha_2_iso_codes={"GB", "XX"})
+    assert [c.company_number for c in mock_create_method.call_args.kwargs["companies"]] == ["87654321"]
+
+
+@pytest.mark.unit
+def test_get_or_create_companies__all_companies_exist(mocker, mock_db, test_company_1):
+    mocker.patch("src.business.company_service.get_companies_by_company_numbers_and_iso_codes",
+                 return_value=[test_company_1])
+    mock_country_method = mocker.patch("src.business.company_service.get_countries_by_iso_codes")
+    mock_create_method = mocker.patch("src.business.company_service.create_companies")
+    keys = [(test_company_1.country_alpha_2_iso_code, test_company_1.company_number)]
+    assert get_or_create_companies(keys, mock_db) == {keys[0]: test_company_1}
+    mock_country_method.assert_not_called()
+    mock_create_method.assert_not_called()
@@ -0,0 +1,69 @@
+import pytest
+
+from src.business.job_service import submit_score_job, run_next_score_job
+from src.business.pydantic_schemas.batch_score import BatchScoreRequest, BatchScoreItem, BatchScoreReport
+from src.business.pydantic_schemas.job import Job
+from src.db.models.score import Score
+from src.persistence.utilities.job_crud import get_job, update_job_progress, finish_job
+
+
+@pytest.fixture
+def test_batch_request(test_financials_1):
+    return BatchScoreRequest(items=[BatchScoreItem(country_iso_code="GB", company_number=str(10000000 + i),
+                                                   financials=[test_financials_1]) for i in range(4)] +
+                                   [BatchScoreItem(country_iso_code="XX", company_number="123",
+                                                   financials=[test_financials_1])])
+
+
+@pytest.mark.unit
+def test_run_next_score_job__processes_job_in_chunks(mocker, sqlite_session_local, test_batch_request):
+    spy = mocker.patch("src.business.job_service.update_job_progress", wraps=update_job_progress)
+    with sqlite_session_local() as db:
+        db_job = submit_score_job(batch=test_batch_request, db=db)
+        assert run_next_score_job(db=db, chunk_size=2, lease_seconds=300) is True
+        assert run_next_score_job(db=db, chunk_size=2, lease_seconds=300) is False
+        job = Job.from_orm(get_job(db=db, id=db_job.id))
+        assert db.query(Score).count() == 4
+    assert (job.status, job.total_items, job.processed_items) == ("succeeded", 5, 5)
+    assert (job.result.succeeded, job.result.failed) == (4, 1)
+    assert [r.success for r in job.result.results] == [True, True, True, True, False]
+    assert [c.kwargs["processed_items"] for c in spy.call_args_list] == [2, 4, 5]
+
+
+@pytest.mark.unit
+def test_run_next_score_job__cancelled_while_running(mocker, sqlite_session_local, test_batch_request):
+    mocker.patch("src.business.job_service.is_job_cancel_requested", side_effect=[False, True])
+    with sqlite_session_local() as db:
+        db_job = submit_score_job(batch=test_batch_request, db=db)
+        run_next_score_job(db=db, chunk_size=2, lease_seconds=300)
+        job = Job.from_orm(get_job(db=db, id=db_job.id))
+    assert (job.status, job.processed_items, job.result.succeeded) == ("cancelled", 2, 2)
+    assert job.finished_at is not None
+
+
+@pytest.mark.unit
+def test_run_next_score_job__failure_is_recorded(mocker, sqlite_session_local, test_batch_request):
+    mocker.patch("src.business.job_service.request_batch_scores", side_effect=RuntimeError("Database gone"))
+    with sqlite_session_local() as db:
+        db_job = submit_score_job(batch=test_batch_request, db=db)
+        run_next_score_job(db=db, chunk_size=2, lease_seconds=300)
+        job = Job.from_orm(get_job(db=db, id=db_job.id))
+    assert (job.status, job.detail, job.processed_items) == ("failed", "Database gone", 0)
+
+
+@pytest.mark.unit
+def test_run_next_score_job__stops_when_lease_expired(mocker, sqlite_session_local, test_batch_request):
+    with sqlite_session_local() as db:
+        db_job = submit_score_job(batch=test_batch_request, db=db)
+
+        def fail_job_during_chunk(items, db):
+            # Another worker found the lease expired and failed the job while this chunk was being scored
+            finish_job(db=db, id=db_job.id, status="failed", detail="Lease expired.")
+            return BatchScoreReport(succeeded=len(items), failed=0, results=[])
+
+        request_batch_scores = mocker.patch("src.business.job_service.request_batch_scores",
+                                            side_effect=fail_job_during_chunk)
+        assert run_next_score_job(db=db, chunk_size=2, lease_seconds=300) is True
+        job = Job.from_orm(get_job(db=db, id=db_job.id))
+    assert request_batch_scores.call_count == 1
+    assert (job.status, job.detail, job.processed_items) == ("failed", "Lease expired.", 0)
@@ -0,0 +1,66 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.business.pydantic_schemas.financials import Financials
+from src.business.score_engine import calculate_scores, calculate_scores_from_columns, financials_to_columns
+from src.business.score_service import calculate_score
+
+
+@pytest.fixture
+def test_random_financials_list():
+    rng = random.Random(42)
+    financials_list = [Financials(year=2000 + i % 20,
+                                  ebit=rng.uniform(-1e4, 1e4),
+                                  equity=rng.uniform(-1e4, 1e4),
+                                  retained_earnings=rng.uniform(-1e4, 1e4),
+                                  sales=rng.uniform(0, 1e5),
+                                  total_assets=rng.uniform(1, 1e5),
+                                  total_liabilities=rng.uniform(1, 1e5),
+                                  working_capital=rng.uniform(-1e4, 1e4)) for i in range(5000)]
+    # Values whose scaled z-score sits on or next to a .5 rounding tie
+    financials_list.extend(Financials(year=2020, ebit=0, equity=0, retained_earnings=0, sales=s, total_assets=1,
+                                      total_liabilities=1, working_capital=0)
+                           for s in (0.125, 0.375, 1.005, 2.675, 0.285, 1.115, -0.125, -2.675))
+    return financials_list
+
+
+@pytest.mark.unit
+def test_calculate_scores__matches_calculate_score(test_random_financials_list):
+    zscores, invalid = calculate_scores(test_random_financials_list)
+    expected = [calculate_score(f) for f in test_random_financials_list]
+    assert not invalid.any()
+    assert [z.hex() for z in zscores.tolist()] == [z.hex() for z in expected]
+
+
+@pytest.mark.unit
+def test_calculate_scores__success_when_valid(test_financials_list):
+    zscores, invalid = calculate_scores(test_financials_list)
+    assert zscores.tolist() == [6.54, 6.79]
+    assert invalid.tolist() == [False, False]
+
+
+@pytest.mark.unit
+def test_calculate_scores__invalid_mask(test_invalid_financials_list):
+    zscores, invalid = calculate_scores(test_invalid_financials_list)
+    assert invalid.tolist() == [False, True]
+    assert zscores[0] == 6.54
+    assert math.isnan(zscores[1])
+
+
+@pytest.mark.unit
+def test_calculate_scores__empty_list():
+    zscores, invalid = calculate_scores([])
+    assert len(zscores) == 0
+    assert len(invalid) == 0
+
+
+@pytest.mark.unit
+def test_calculate_scores_from_columns__column_input(test_financials_list):
+    columns = {name: np.asarray(values) for name, values in financials_to_columns(test_financials_list).items()}
+    columns["total_liabilities"] = [456.78, 0.0]
+    zscores, invalid = calculate_scores_from_columns(columns)
+    assert zscores[0] == 6.54
+    assert invalid.tolist() == [False, True]
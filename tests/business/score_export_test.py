@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from src.business.pydantic_schemas.company import CompanyCreate
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.business.score_export import format_rows, export_scores
+from src.db.models.country import Country
+from src.persistence.utilities.company_crud import create_companies
+from src.persistence.utilities.score_crud import create_scores
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def sqlite_session_local_with_scores(mocker, sqlite_session_local):
+    mocker.patch("src.persistence.utilities.score_crud.EXPORT_BATCH_SIZE", 2)
+    with sqlite_session_local() as db:
+        db.add(Country(alpha_2_iso_code="US", name="United States", company_number_regex="^.*$"))
+        gb, us = create_companies(db=db, companies=[CompanyCreate(company_number="12345678",
+                                                                  country_alpha_2_iso_code="GB"),
+                                                    CompanyCreate(company_number="12-3456789",
+                                                                  country_alpha_2_iso_code="US")])
+        create_scores(db=db, scores=[ScoreCreate(company_id=gb.id, year=2019, zscore=1.5),
+                                     ScoreCreate(company_id=gb.id, year=2020, zscore=2.25),
+                                     ScoreCreate(company_id=us.id, year=2020, zscore=-0.5)])
+        db.commit()
+    return sqlite_session_local
+
+
+@pytest.mark.unit
+def test_format_rows__ndjson():
+    assert format_rows([("GB", "12345678", 2020, 6.47)], "ndjson") == \
+           '{"country_alpha_2_iso_code": "GB", "company_number": "12345678", "year": 2020, "zscore": 6.47}\n'
+
+
+@pytest.mark.unit
+def test_format_rows__csv():
+    assert format_rows([("GB", "12,345", 2020, 6.47), ("US", "12-3456789", 2021, -1.0)], "csv") == \
+           'GB,"12,345",2020,6.47\nUS,12-3456789,2021,-1.0\n'
+
+
+@pytest.mark.unit
+def test_export_scores__csv_streams_all_scores_in_batches(sqlite_session_local_with_scores):
+    with sqlite_session_local_with_scores() as db:
+        chunks = list(export_scores(db=db, export_format="csv"))
+    assert chunks == ["country_alpha_2_iso_code,company_number,year,zscore\n",
+                      "GB,12345678,2019,1.5\nGB,12345678,2020,2.25\n",
+                      "US,12-3456789,2020,-0.5\n"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("filters, expected", [
+    ({"country_iso_code": "GB"}, [("GB", 2019), ("GB", 2020)]),
+    ({"year_from": 2020}, [("GB", 2020), ("US", 2020)]),
+    ({"country_iso_code": "GB", "year_to": 2019}, [("GB", 2019)]),
+    ({"country_iso_code": "FR"}, [])])
+def test_export_scores__filters(sqlite_session_local_with_scores, filters, expected):
+    with sqlite_session_local_with_scores() as db:
+        lines = "".join(export_scores(db=db, export_format="ndjson", **filters)).splitlines()
+    assert [(json.loads(line)["country_alpha_2_iso_code"], json.loads(line)["year"]) for line in lines] == expected
+
+
+@pytest.mark.unit
+@pytest.mark.anyio
+async def test_export_scores__async_session(sqlite_session_local_with_scores):
+    database_url = str(sqlite_session_local_with_scores.kw["bind"].url).replace("sqlite://", "sqlite+aiosqlite://")
+    async_engine = create_async_engine(database_url)
+    async with AsyncSession(async_engine) as db:
+        chunks = [chunk async for chunk in export_scores(db=db, export_format="ndjson", year_from=2020)]
+    await async_engine.dispose()
+    assert len(chunks) == 1
+    assert chunks[0].count("\n") == 2
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from src.business import score_import
+from src.business.score_import import ScoreImportReader, ScoredImportRow, import_scores, import_scores_stream, \
+    score_lines
+from src.business.score_process_pool import ScoreProcessPool
+from src.db.models.score import Score
+
+CSV_HEADER = "country_iso_code,company_number,year,ebit,equity,retained_earnings,sales,total_assets," \
+             "total_liabilities,working_capital\n"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    process_pool = ScoreProcessPool(workers=2)
+    yield process_pool
+    process_pool.shutdown()
+
+
+def ndjson_line(company_number="12345678", year=2020, total_assets=345.67, ebit=123.45):
+    return json.dumps(dict(country_iso_code="GB", company_number=company_number, year=year, ebit=ebit, equity=234.56,
+                           retained_earnings=345.67, sales=1234.56, total_assets=total_assets,
+                           total_liabilities=456.78, working_capital=23.45)) + "\n"
+
+
+IMPORT_LINES = [ndjson_line(year=2019), ndjson_line(year=2020), ndjson_line(year=2021, total_assets=0),
+                ndjson_line(company_number="123"), "{\n", ndjson_line(company_number="87654321")]
+
+
+@pytest.mark.unit
+def test_score_lines__ndjson():
+    reader = ScoreImportReader(import_format="ndjson")
+    numbered_lines = reader.read([ndjson_line(), "\n", "{not json\n"]) + reader.read(['{"country_iso_code": "GB"}\n',
+                                                                                      ndjson_line(total_assets=0)])
+    scored_rows = score_lines("ndjson", reader.columns, numbered_lines)
+    assert [r.line for r in scored_rows] == [1, 3, 4, 5]
+    assert scored_rows[0] == ScoredImportRow(line=1, country_iso_code="GB", company_number="12345678", year=2020,
+                                             zscore=6.54)
+    assert scored_rows[1].detail.startswith("Invalid JSON")
+    assert scored_rows[2].detail.endswith("company_number: field required")
+    assert (scored_rows[3].zscore, scored_rows[3].detail) == (None, None)
+
+
+@pytest.mark.unit
+def test_score_lines__csv_header_kept_between_chunks():
+    reader = ScoreImportReader(import_format="csv")
+    numbered_lines = reader.read([CSV_HEADER,
+                                  "GB,12345678,2020,123.45,234.56,345.67,1234.56,345.67,456.78,23.45\n"]) + \
+        reader.read(["GB,12345678,2021,abc,234.56,345.67,1234.56,345.67,456.78,23.45\r\n", "GB,12345678\n"])
+    scored_rows = score_lines("csv", reader.columns, numbered_lines)
+    assert [r.line for r in scored_rows] == [2, 3, 4]
+    assert scored_rows[0].zscore == 6.54
+    assert scored_rows[1].detail == "ebit: value is not a valid float"
+    assert scored_rows[2].detail == "Expected 10 values but got 2."
+
+
+@pytest.mark.unit
+def test_import_scores__per_row_errors_and_chunked_transactions(mocker, sqlite_session_local):
+    spy = mocker.spy(score_import, "create_scores")
+    with sqlite_session_local() as db:
+        report = import_scores(lines=IMPORT_LINES, import_format="ndjson", chunk_size=2, db=db)
+        assert db.query(Score).count() == 3
+    assert (report.rows, report.succeeded, report.failed) == (6, 3, 3)
+    assert [e.line for e in report.errors] == [3, 4, 5]
+    assert report.errors[0].detail.startswith("Invalid financials provided")
+    assert report.errors[1].detail.startswith("Failed to retrieve existing and create new company")
+    assert spy.call_count == 3
+    assert report.rows_per_second > 0
+
+
+@pytest.mark.unit
+def test_import_scores__process_pool_matches_serial_path(sqlite_session_local, process_pool):
+    lines = [ndjson_line(company_number=str(10000000 + i % 7), year=2000 + i % 11, total_assets=i % 5 * 100.0,
+                         ebit=i * 1.37) for i in range(200)] + IMPORT_LINES
+    reports, stored_scores = [], []
+    for pool in [None, process_pool]:
+        with sqlite_session_local() as db:
+            reports.append(import_scores(lines=lines, import_format="ndjson", chunk_size=16, db=db,
+                                         process_pool=pool))
+            stored_scores.append(sorted((s.company_id, s.year, s.zscore) for s in db.query(Score).all()))
+            db.query(Score).delete()
+            db.commit()
+    assert reports[0].dict(exclude={"seconds", "rows_per_second"}) == \
+           reports[1].dict(exclude={"seconds", "rows_per_second"})
+    assert stored_scores[0] == stored_scores[1]
+    assert reports[0].failed > 0 and len(stored_scores[0]) > 0
+
+
+@pytest.mark.unit
+def test_import_scores__error_report_is_truncated(mocker, sqlite_session_local):
+    mocker.patch("src.business.score_import.MAX_REPORTED_ERRORS", 2)
+    with sqlite_session_local() as db:
+        report = import_scores(lines=["{\n"] * 5, import_format="ndjson", chunk_size=2, db=db)
+    assert (report.rows, report.failed, len(report.errors), report.errors_truncated) == (5, 5, 2, True)
+
+
+@pytest.mark.unit
+@pytest.mark.anyio
+@pytest.mark.parametrize("with_process_pool", [False, True])
+async def test_import_scores_stream__csv(sqlite_session_local, process_pool, with_process_pool):
+    async def byte_stream():
+        body = (CSV_HEADER + "GB,12345678,2020,123.45,234.56,345.67,1234.56,345.67,456.78,23.45\n"
+                             "GB,87654321,2020,123.45,234.56,345.67,1234.56,345.67,456.78,23.45").encode()
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    with sqlite_session_local() as db:
+        report = await import_scores_stream(byte_stream=byte_stream(), import_format="csv", chunk_size=1, db=db,
+                                            process_pool=process_pool if with_process_pool else None)
+        assert db.query(Score).count() == 2
+    assert (report.rows, report.succeeded, report.failed) == (2, 2, 0)
@@ -1,7 +1,8 @@
 import pytest
 from fastapi.encoders import jsonable_encoder
 
-from src.business.score_service import validate_financials, calculate_score, request_scores
+from src.business.score_service import validate_financials, calculate_score, request_scores, request_batch_scores, \
+    get_scored_company_keys
 
 
 @pytest.mark.unit
@@ -28,7 +29,71 @@ def test_calculate_score__success_when_valid(test_financials_1, test_financials_
 
 @pytest.mark.unit
 def test_request_score(mocker, test_financials_list, test_company_1, mock_db, test_score_list):
-    mock_method = mocker.patch("src.business.score_service.create_score", return_value=None)
+    mock_method = mocker.patch("src.business.score_service.create_scores", return_value=None)
     json_score_report = jsonable_encoder(test_score_list)
     assert request_scores(test_financials_list, test_company_1, mock_db) == json_score_report
-    mock_method.assert_called()
+    mock_method.assert_called_once()
+    assert len(mock_method.call_args.kwargs["scores"]) == len(test_financials_list)
+    mock_db.commit.assert_called_once()
+
+
+@pytest.mark.unit
+def test_request_score__rolls_back_on_failure(mocker, test_financials_list, test_company_1, mock_db):
+    mocker.patch("src.business.score_service.create_scores", side_effect=RuntimeError("Insert failed"))
+    with pytest.raises(RuntimeError):
+        request_scores(test_financials_list, test_company_1, mock_db)
+    mock_db.rollback.assert_called_once()
+    mock_db.commit.assert_not_called()
+
+
+@pytest.mark.unit
+def test_request_batch_scores__partial_success(mocker, test_batch_item_1, test_batch_item_2, test_company_1, mock_db,
+                                               test_score_list):
+    mock_get_method = mocker.patch("src.business.score_service.get_or_create_companies",
+                                   return_value={(test_batch_item_1.country_iso_code,
+                                                  test_batch_item_1.company_number): test_company_1,
+                                                 (test_batch_item_2.country_iso_code,
+                                                  test_batch_item_2.company_number): None})
+    mock_create_method = mocker.patch("src.business.score_service.create_scores", return_value=None)
+    report = request_batch_scores([test_batch_item_1, test_batch_item_2], mock_db)
+    assert report.succeeded == 1
+    assert report.failed == 1
+    assert report.results[0].success is True
+    assert report.results[0].scores == test_score_list
+    assert report.results[1].success is False
+    assert report.results[1].detail is not None
+    mock_get_method.assert_called_once()
+    assert len(mock_create_method.call_args.kwargs["scores"]) == len(test_score_list)
+    mock_db.commit.assert_called_once()
+    assert get_scored_company_keys(report) == [(test_batch_item_1.country_iso_code, test_batch_item_1.company_number)]
+
+
+@pytest.mark.unit
+def test_request_batch_scores__invalid_financials(mocker, test_batch_item_3, test_company_1, mock_db):
+    mocker.patch("src.business.score_service.get_or_create_companies",
+                 return_value={(test_batch_item_3.country_iso_code, test_batch_item_3.company_number): test_company_1})
+    mock_create_method = mocker.patch("src.business.score_service.create_scores", return_value=None)
+    report = request_batch_scores([test_batch_item_3], mock_db)
+    assert report.succeeded == 0
+    assert report.failed == 1
+    assert report.results[0].scores == []
+    mock_create_method.assert_called_once_with(db=mock_db, scores=[])
+
+
+@pytest.mark.unit
+def test_request_score__counts_calculated_and_persisted_scores(mocker, test_financials_list, test_company_1, mock_db):
+    mocker.patch("src.business.score_service.create_scores", return_value=None)
+    mock_calculated = mocker.patch("src.business.score_service.scores_calculated_total")
+    mock_persisted = mocker.patch("src.business.score_service.scores_persisted_total")
+    request_scores(test_financials_list, test_company_1, mock_db)
+    mock_calculated.inc.assert_called_once_with(len(test_financials_list), ("single",))
+    mock_persisted.inc.assert_called_once_with(len(test_financials_list), ("single",))
+
+
+@pytest.mark.unit
+def test_validate_financials__counts_rejections(mocker, test_invalid_financials_list, test_financials_list):
+    mock_rejected = mocker.patch("src.business.score_service.financials_rejected_total")
+    validate_financials(test_financials_list)
+    mock_rejected.inc.assert_not_called()
+    validate_financials(test_invalid_financials_list)
+    mock_rejected.inc.assert_called_once()
@@ -2,11 +2,16 @@ from datetime import datetime
 from unittest.mock import MagicMock
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
+from src.business.pydantic_schemas.batch_score import BatchScoreItem
 from src.business.pydantic_schemas.company import Company, CompanyCreate
 from src.business.pydantic_schemas.country import Country, CountryCreate
 from src.business.pydantic_schemas.financials import Financials
 from src.business.pydantic_schemas.score import Score, ScoreBase
+from src.db.db_setup import Base
+from src.db.models import country, company, score, score_history, job
 
 
 # Countries ---------------------------------------------------------------------------------------------------------
@@ -151,7 +156,43 @@ def test_invalid_financials_list(test_financials_1, test_zero_financials):
     return [test_financials_1, test_zero_financials]
 
 
+# Batches -----------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def test_batch_item_1(test_company_1, test_financials_list):
+    return BatchScoreItem(country_iso_code=test_company_1.country_alpha_2_iso_code,
+                          company_number=test_company_1.company_number,
+                          financials=test_financials_list)
+
+
+@pytest.fixture
+def test_batch_item_2(test_company_2, test_financials_list):
+    return BatchScoreItem(country_iso_code=test_company_2.country_alpha_2_iso_code,
+                          company_number=test_company_2.company_number,
+                          financials=test_financials_list)
+
+
+@pytest.fixture
+def test_batch_item_3(test_company_1, test_invalid_financials_list):
+    return BatchScoreItem(country_iso_code=test_company_1.country_alpha_2_iso_code,
+                          company_number=test_company_1.company_number,
+                          financials=test_invalid_financials_list)
+
+
 # Other -------------------------------------------------------------------------------------------------------------
 @pytest.fixture
 def mock_db():
-    return MagicMock()
\ No newline at end of file
+    return MagicMock()
+
+
+@pytest.fixture
+def sqlite_session_local(tmp_path, test_country_create_1):
+    # A file database (rather than :memory:) so that sessions on different threads share the same data
+    engine = create_engine("sqlite:///" + str(tmp_path / "test.db"), connect_args={"check_same_thread": False,
+                                                                                   "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_local() as db:
+        db.add(country.Country(**test_country_create_1.dict()))
+        db.commit()
+    yield session_local
+    engine.dispose()
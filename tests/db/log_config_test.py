@@ -0,0 +1,67 @@
+import json
+import logging
+
+import pytest
+
+from src.db import config
+from src.db.log_config import JsonFormatter, SamplingFilter, configure_logging, stop_logging
+
+
+@pytest.fixture
+def restore_logging():
+    yield
+    logging.getLogger("src.persistence").setLevel(logging.NOTSET)
+    configure_logging(config.get_settings())
+
+
+def create_record(name: str, level: int, msg: str, *args, **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+def test_json_formatter__message_extra_fields_and_exception():
+    try:
+        raise ValueError("Invalid")
+    except ValueError as e:
+        record = create_record("src.business.score_service", logging.ERROR, "Scores: %d.", 3, company_id=7)
+        record.exc_info = (type(e), e, e.__traceback__)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "src.business.score_service"
+    assert entry["message"] == "Scores: 3."
+    assert entry["company_id"] == 7
+    assert "ValueError: Invalid" in entry["exception"]
+
+
+@pytest.mark.unit
+def test_sampling_filter__longest_prefix_wins_and_warnings_are_kept():
+    sampling_filter = SamplingFilter({"src": 1.0, "src.business": 0.0})
+    assert sampling_filter.filter(create_record("src.presentation.score_controller", logging.INFO, "Kept"))
+    assert not sampling_filter.filter(create_record("src.business.score_service", logging.INFO, "Dropped"))
+    assert sampling_filter.filter(create_record("src.business.score_service", logging.WARNING, "Kept"))
+    assert sampling_filter.filter(create_record("src.businesses", logging.DEBUG, "Kept"))
+
+
+@pytest.mark.unit
+def test_configure_logging__json_through_queue_with_module_levels(capsys, restore_logging):
+    settings = config.Settings(database_url=config.get_settings().database_url, log_format="json",
+                               log_levels={"src.persistence": "WARNING"})
+    configure_logging(settings)
+    logging.getLogger("src.business.score_service").info("Scores: %d.", 2)
+    logging.getLogger("src.business.score_service").debug("Not logged")
+    logging.getLogger("src.persistence.utilities.score_crud").info("Not logged")
+    stop_logging()
+    lines = capsys.readouterr().err.splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["Scores: 2."]
+
+
+@pytest.mark.unit
+def test_lazy_formatting__arguments_not_formatted_when_level_disabled(restore_logging):
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("Formatted although the level is disabled")
+
+    configure_logging(config.Settings(database_url=config.get_settings().database_url, log_level="INFO"))
+    logging.getLogger("src.business.score_service").debug("Created objects: %s", Expensive())
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool
+
+from src.db.pool_metrics import TimedQueuePool, get_pool_status
+
+
+@pytest.fixture
+def test_pool():
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1, timeout=0.05)
+    yield pool
+    pool.dispose()
+
+
+@pytest.mark.unit
+def test_get_pool_status__checked_out_connections(test_pool):
+    connection_1 = test_pool.connect()
+    connection_2 = test_pool.connect()
+    status = get_pool_status(test_pool)
+    assert status["pool_size"] == 1
+    assert status["max_overflow"] == 1
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["checkouts"] == 2
+    assert status["timeouts"] == 0
+    connection_1.close()
+    connection_2.close()
+    assert get_pool_status(test_pool)["checked_out"] == 0
+
+
+@pytest.mark.unit
+def test_get_pool_status__timeout_recorded(test_pool):
+    connections = [test_pool.connect(), test_pool.connect()]
+    with pytest.raises(exc.TimeoutError):
+        test_pool.connect()
+    status = get_pool_status(test_pool)
+    assert status["timeouts"] == 1
+    assert status["checkouts"] == 2
+    assert status["wait_seconds_max"] >= 0
+    for c in connections:
+        c.close()
+
+
+@pytest.mark.unit
+def test_get_pool_status__untimed_pool():
+    assert get_pool_status(NullPool(lambda: sqlite3.connect(":memory:"))) is None
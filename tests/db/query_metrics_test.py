@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine, text, exc
+
+from src.db.query_metrics import RequestQueryMetrics, QueryMetricsRegistry, current_request_metrics, \
+    instrument_engine, record_pool_wait
+
+
+@pytest.fixture
+def request_metrics():
+    metrics = RequestQueryMetrics()
+    token = current_request_metrics.set(metrics)
+    yield metrics
+    current_request_metrics.reset(token)
+
+
+@pytest.mark.unit
+def test_instrument_engine__records_statements_of_current_request(request_metrics):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+        with pytest.raises(exc.OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info["query_start_times"] == []
+    assert request_metrics.queries == 2
+    assert request_metrics.db_seconds >= request_metrics.slowest_seconds > 0
+    assert request_metrics.slowest_statement in ("SELECT 1", "SELECT 2")
+
+
+@pytest.mark.unit
+def test_instrument_engine__ignores_statements_outside_requests():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    record_pool_wait(0.5)
+    assert current_request_metrics.get() is None
+
+
+@pytest.mark.unit
+def test_record_pool_wait(request_metrics):
+    record_pool_wait(0.25)
+    record_pool_wait(0.5)
+    assert request_metrics.pool_wait_seconds == 0.75
+
+
+@pytest.mark.unit
+def test_query_metrics_registry__aggregates_per_route():
+    registry = QueryMetricsRegistry()
+    for queries, seconds in [(2, 0.01), (4, 0.03)]:
+        metrics = RequestQueryMetrics()
+        for i in range(queries):
+            metrics.record_query("SELECT " + str(i), seconds / queries)
+        registry.record("GET /company", metrics)
+    registry.record("GET /country", RequestQueryMetrics())
+    statistics = registry.statistics()
+    assert [s["route"] for s in statistics] == ["GET /company", "GET /country"]
+    assert statistics[0]["requests"] == 2
+    assert statistics[0]["queries_total"] == 6
+    assert statistics[0]["queries_avg"] == 3.0
+    assert statistics[0]["queries_max"] == 4
+    assert statistics[0]["db_seconds_max"] == 0.03
+    assert statistics[0]["slowest_statement"] == "SELECT 0"
+    assert statistics[1]["slowest_statement"] is None
+    registry.reset()
+    assert registry.statistics() == []
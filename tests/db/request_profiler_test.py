@@ -0,0 +1,48 @@
+import contextvars
+import threading
+
+import pytest
+
+from src.db.request_profiler import RequestProfile, current_request_profile, call_profiled, format_stats
+
+
+def profiled_work(n: int):
+    return sum(range(n))
+
+
+@pytest.mark.unit
+def test_call_profiled__without_profile():
+    assert call_profiled(profiled_work, 10) == 45
+
+
+@pytest.mark.unit
+def test_call_profiled__merges_thread_profiles():
+    profile = RequestProfile()
+    token = current_request_profile.set(profile)
+    try:
+        profile.profiler.enable()
+        # Like run_in_threadpool, the thread runs in a copy of the request's context
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=lambda: context.run(call_profiled, profiled_work, 10))
+        thread.start()
+        thread.join()
+        profile.profiler.disable()
+    finally:
+        current_request_profile.reset(token)
+    functions = {f[2] for f in profile.stats().stats}
+    assert "profiled_work" in functions
+    assert "start" in functions
+    assert "profiled_work" in format_stats(profile.stats())
+
+
+@pytest.mark.unit
+def test_call_profiled__no_thread_profiler_from_python_3_12(mocker):
+    # From 3.12 a second active profiler raises ValueError, the event loop profiler records the thread instead
+    mocker.patch("src.db.request_profiler.PER_THREAD_PROFILERS", False)
+    profile = RequestProfile()
+    token = current_request_profile.set(profile)
+    try:
+        assert call_profiled(profiled_work, 10) == 45
+    finally:
+        current_request_profile.reset(token)
+    assert profile._thread_profilers == []
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import event
+
+from src.business.pydantic_schemas.company import CompanyCreate, Company, CompanySummary
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.persistence.utilities.company_crud import create_company, create_companies, get_companies, \
+    get_companies_version
+from src.persistence.utilities.row_version import get_row_version
+from src.persistence.utilities.score_crud import create_scores
+
+
+@pytest.mark.unit
+def test_create_company__existing_company_returns_existing_row(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        first = create_company(db=db, company=test_company_create_1)
+        second = create_company(db=db, company=test_company_create_1)
+        assert first.id == second.id
+
+
+@pytest.mark.unit
+def test_create_companies__mix_of_existing_and_new_companies(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        existing = create_company(db=db, company=test_company_create_1)
+        new_company = CompanyCreate(company_number="87654321", country_alpha_2_iso_code="GB")
+        db_companies = create_companies(db=db, companies=[test_company_create_1, new_company])
+        db.commit()
+        assert [c.company_number for c in db_companies] == [test_company_create_1.company_number, "87654321"]
+        assert db_companies[0].id == existing.id
+
+
+@pytest.mark.unit
+def test_get_companies_version__covers_companies_and_their_scores(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        create_companies(db=db, companies=[CompanyCreate(company_number="87654321", country_alpha_2_iso_code="GB")])
+        db.commit()
+        version = get_companies_version(db=db, limit=1)
+        companies = get_companies(db=db, limit=1)
+        assert version == (get_row_version(companies), get_row_version(s for c in companies for s in c.scores))
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=1.0)])
+        db.commit()
+        assert get_companies_version(db=db, limit=1) != version
+        assert get_companies_version(db=db, limit=1, after_id=company.id)[1].count == 0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("company_count", [1, 10, 50])
+@pytest.mark.parametrize("include_scores,schema,expected_queries", [(True, Company, 2), (False, CompanySummary, 1)])
+def test_get_companies__constant_number_of_queries(sqlite_session_local, company_count, include_scores, schema,
+                                                   expected_queries):
+    with sqlite_session_local() as db:
+        companies = create_companies(db=db, companies=[CompanyCreate(company_number=str(10000000 + i),
+                                                                     country_alpha_2_iso_code="GB")
+                                                       for i in range(company_count)])
+        create_scores(db=db, scores=[ScoreCreate(company_id=c.id, year=year, zscore=1.0)
+                                     for c in companies for year in (2019, 2020)])
+        db.commit()
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with sqlite_session_local() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", record_statement)
+        page = [schema.from_orm(c) for c in get_companies(db=db, limit=100, include_scores=include_scores)]
+        event.remove(db.get_bind(), "before_cursor_execute", record_statement)
+    assert len(page) == company_count
+    assert sum(len(getattr(c, "scores", [])) for c in page) == (2 * company_count if include_scores else 0)
+    assert len(statements) == expected_queries
+
+
+@pytest.mark.unit
+def test_create_companies__upserts_rows_in_key_order(mocker, sqlite_session_local):
+    with sqlite_session_local() as db:
+        scalars = mocker.spy(db, "scalars")
+        create_companies(db=db, companies=[CompanyCreate(company_number=n, country_alpha_2_iso_code="GB")
+                                           for n in ("30000000", "10000000", "20000000")])
+        assert [row["company_number"] for row in scalars.call_args.args[1]] == ["10000000", "20000000", "30000000"]
+
+
+@pytest.mark.unit
+def test_create_company__single_statement_without_reloading(sqlite_session_local, test_company_create_1):
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with sqlite_session_local() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", record_statement)
+        company = Company.from_orm(create_company(db=db, company=test_company_create_1))
+        event.remove(db.get_bind(), "before_cursor_execute", record_statement)
+    assert (company.company_number, company.country_alpha_2_iso_code, company.scores) == ("12345678", "GB", [])
+    assert company.id is not None and company.created_at is not None
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+
+
+@pytest.mark.unit
+def test_create_company__existing_company_keeps_its_scores(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        company_id = company.id
+        create_scores(db=db, scores=[ScoreCreate(company_id=company_id, year=2020, zscore=1.0)])
+        db.commit()
+    with sqlite_session_local() as db:
+        existing = Company.from_orm(create_company(db=db, company=test_company_create_1))
+    assert existing.id == company_id
+    assert [(s.year, s.zscore) for s in existing.scores] == [(2020, 1.0)]
@@ -0,0 +1,87 @@
+import pytest
+
+from src.persistence.utilities.country_cache import CountryCache, country_cache
+from src.persistence.utilities.country_crud import get_country, get_countries_by_iso_codes, create_country
+
+
+@pytest.fixture(autouse=True)
+def clear_country_cache():
+    country_cache.invalidate()
+    yield
+    country_cache.invalidate()
+
+
+@pytest.mark.unit
+def test_country_cache__hit_and_miss(test_country_1):
+    cache = CountryCache(ttl_seconds=60)
+    assert cache.get(test_country_1.alpha_2_iso_code) is None
+    cache.put(test_country_1)
+    assert cache.get(test_country_1.alpha_2_iso_code) == test_country_1
+    assert cache.statistics() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0, "invalidations": 0,
+                                  "hit_ratio": 0.5}
+
+
+@pytest.mark.unit
+def test_country_cache__expired_entry(mocker, test_country_1):
+    mock_time = mocker.patch("src.persistence.utilities.country_cache.time.monotonic", return_value=100.0)
+    cache = CountryCache(ttl_seconds=10)
+    cache.put(test_country_1)
+    mock_time.return_value = 111.0
+    assert cache.get(test_country_1.alpha_2_iso_code) is None
+    assert cache.statistics()["evictions"] == 1
+    assert cache.statistics()["size"] == 0
+
+
+@pytest.mark.unit
+def test_country_cache__disabled_with_zero_ttl(test_country_1):
+    cache = CountryCache(ttl_seconds=0)
+    cache.put(test_country_1)
+    assert cache.get(test_country_1.alpha_2_iso_code) is None
+
+
+@pytest.mark.unit
+def test_country_cache__invalidate(test_country_1, test_country_2):
+    cache = CountryCache(ttl_seconds=60)
+    cache.put(test_country_1)
+    cache.put(test_country_2)
+    cache.invalidate(test_country_1.alpha_2_iso_code)
+    assert cache.get(test_country_1.alpha_2_iso_code) is None
+    assert cache.get(test_country_2.alpha_2_iso_code) == test_country_2
+    cache.invalidate()
+    assert cache.get(test_country_2.alpha_2_iso_code) is None
+
+
+@pytest.mark.unit
+def test_get_country__reads_through_cache(mock_db, test_country_1):
+    mock_db.query.return_value.filter.return_value.first.return_value = test_country_1
+    assert get_country(mock_db, test_country_1.alpha_2_iso_code) == test_country_1
+    assert get_country(mock_db, test_country_1.alpha_2_iso_code) == test_country_1
+    mock_db.query.assert_called_once()
+
+
+@pytest.mark.unit
+def test_get_country__missing_country_not_cached(mock_db):
+    mock_db.query.return_value.filter.return_value.first.return_value = None
+    assert get_country(mock_db, "XX") is None
+    assert get_country(mock_db, "XX") is None
+    assert mock_db.query.call_count == 2
+
+
+@pytest.mark.unit
+def test_get_countries_by_iso_codes__queries_missing_codes_only(mock_db, test_country_1, test_country_2):
+    country_cache.put(test_country_1)
+    mock_db.query.return_value.filter.return_value.all.return_value = [test_country_2]
+    countries = get_countries_by_iso_codes(mock_db, {test_country_1.alpha_2_iso_code, test_country_2.alpha_2_iso_code})
+    assert sorted(c.alpha_2_iso_code for c in countries) == ["GB", "US"]
+    mock_db.query.assert_called_once()
+    assert get_countries_by_iso_codes(mock_db, {test_country_2.alpha_2_iso_code}) == [test_country_2]
+    mock_db.query.assert_called_once()
+
+
+@pytest.mark.unit
+def test_create_country__updates_cache(mocker, mock_db, test_country_create_1, test_country_1):
+    mocker.patch("src.persistence.utilities.country_crud.Country", return_value=test_country_1)
+    create_country(mock_db, test_country_create_1)
+    mock_db.commit.assert_called_once()
+    assert get_country(mock_db, test_country_1.alpha_2_iso_code) == test_country_1
+    mock_db.query.assert_not_called()
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.db.models.job import Job
+from src.persistence.utilities.job_crud import create_job, claim_next_job, cancel_job, finish_job, \
+    is_job_cancel_requested, get_job, update_job_progress
+
+
+@pytest.mark.unit
+def test_claim_next_job__claims_oldest_queued_job_once(sqlite_session_local):
+    with sqlite_session_local() as db:
+        first = create_job(db=db, kind="scores", payload={"items": []}, total_items=0)
+        second = create_job(db=db, kind="scores", payload={"items": []}, total_items=0)
+        create_job(db=db, kind="other", payload={}, total_items=0)
+        claimed = [claim_next_job(db=db, kind="scores", lease_seconds=300) for _ in range(3)]
+        assert [j.id for j in claimed[:2]] == [first.id, second.id]
+        assert [j.status for j in claimed[:2]] == ["running", "running"]
+        assert claimed[0].started_at is not None
+        assert claimed[2] is None
+
+
+@pytest.mark.unit
+def test_cancel_job__queued_job_is_cancelled_immediately(sqlite_session_local):
+    with sqlite_session_local() as db:
+        db_job = create_job(db=db, kind="scores", payload={}, total_items=0)
+        cancelled = cancel_job(db=db, id=db_job.id)
+        assert (cancelled.status, cancelled.cancel_requested) == ("cancelled", True)
+        assert claim_next_job(db=db, kind="scores", lease_seconds=300) is None
+
+
+@pytest.mark.unit
+def test_cancel_job__running_job_is_flagged(sqlite_session_local):
+    with sqlite_session_local() as db:
+        db_job = create_job(db=db, kind="scores", payload={}, total_items=0)
+        claim_next_job(db=db, kind="scores", lease_seconds=300)
+        cancelled = cancel_job(db=db, id=db_job.id)
+        assert (cancelled.status, cancelled.cancel_requested) == ("running", True)
+        assert is_job_cancel_requested(db=db, id=db_job.id) is True
+
+
+@pytest.mark.unit
+def test_cancel_job__finished_and_missing_jobs(sqlite_session_local):
+    with sqlite_session_local() as db:
+        db_job = create_job(db=db, kind="scores", payload={}, total_items=0)
+        claim_next_job(db=db, kind="scores", lease_seconds=300)
+        finish_job(db=db, id=db_job.id, status="succeeded", result={"succeeded": 0})
+        assert cancel_job(db=db, id=db_job.id).status == "succeeded"
+        assert cancel_job(db=db, id=db_job.id + 1) is None
+
+
+@pytest.mark.unit
+def test_claim_next_job__fails_running_jobs_with_expired_lease(sqlite_session_local):
+    with sqlite_session_local() as db:
+        crashed = create_job(db=db, kind="scores", payload={}, total_items=10)
+        alive = create_job(db=db, kind="scores", payload={}, total_items=10)
+        for _ in range(2):
+            claim_next_job(db=db, kind="scores", lease_seconds=300)
+        # The crashed worker's last heartbeat is older than the lease, the other worker has just stored a chunk
+        db.execute(update(Job).where(Job.id == crashed.id).values(updated_at=datetime.now() - timedelta(seconds=301)))
+        db.commit()
+        update_job_progress(db=db, id=alive.id, processed_items=5)
+        queued = create_job(db=db, kind="scores", payload={}, total_items=0)
+        assert claim_next_job(db=db, kind="scores", lease_seconds=300).id == queued.id
+        db.expire_all()
+        assert get_job(db=db, id=crashed.id).status == "failed"
+        assert get_job(db=db, id=crashed.id).finished_at is not None
+        assert get_job(db=db, id=alive.id).status == "running"
+
+
+@pytest.mark.unit
+def test_update_job_progress_and_finish_job__leave_expired_job_failed(sqlite_session_local):
+    with sqlite_session_local() as db:
+        db_job = create_job(db=db, kind="scores", payload={}, total_items=10)
+        claim_next_job(db=db, kind="scores", lease_seconds=300)
+        db.execute(update(Job).where(Job.id == db_job.id).values(updated_at=datetime.now() - timedelta(seconds=301)))
+        db.commit()
+        claim_next_job(db=db, kind="scores", lease_seconds=300)
+        # The worker was slow rather than dead and carries on
+        assert update_job_progress(db=db, id=db_job.id, processed_items=5) is False
+        assert finish_job(db=db, id=db_job.id, status="succeeded", result={"succeeded": 10}) is False
+        db.expire_all()
+        job = get_job(db=db, id=db_job.id)
+        assert (job.status, job.processed_items, job.result) == ("failed", 0, None)
+
+
+@pytest.mark.unit
+def test_cancel_job__does_not_renew_lease(sqlite_session_local):
+    with sqlite_session_local() as db:
+        db_job = create_job(db=db, kind="scores", payload={}, total_items=10)
+        claim_next_job(db=db, kind="scores", lease_seconds=300)
+        heartbeat = datetime.now() - timedelta(seconds=200)
+        db.execute(update(Job).where(Job.id == db_job.id).values(updated_at=heartbeat))
+        db.commit()
+        assert cancel_job(db=db, id=db_job.id).updated_at == heartbeat
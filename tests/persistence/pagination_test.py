@@ -0,0 +1,35 @@
+import pytest
+
+from src.business.pydantic_schemas.company import CompanyCreate
+from src.persistence.utilities.company_crud import create_companies, get_companies
+from src.persistence.utilities.pagination import encode_cursor, decode_cursor
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("key, key_type", [(42, int), ("GB", str)])
+def test_decode_cursor__round_trip(key, key_type):
+    assert decode_cursor(encode_cursor(key), key_type) == key
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor("42"), encode_cursor(True), "W10"])
+def test_decode_cursor__invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, int)
+
+
+@pytest.mark.unit
+def test_get_companies__cursor_pages_through_all_companies(sqlite_session_local):
+    with sqlite_session_local() as db:
+        create_companies(db=db, companies=[CompanyCreate(company_number=str(10000000 + i),
+                                                         country_alpha_2_iso_code="GB") for i in range(7)])
+        db.commit()
+        pages, after_id = [], None
+        while True:
+            page = get_companies(db=db, limit=3, after_id=after_id)
+            pages.append([c.company_number for c in page])
+            if len(page) < 3:
+                break
+            after_id = page[-1].id
+        assert pages == [["10000000", "10000001", "10000002"], ["10000003", "10000004", "10000005"], ["10000006"]]
+        assert [c.company_number for c in get_companies(db=db, skip=3, limit=3)] == pages[1]
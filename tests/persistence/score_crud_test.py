@@ -0,0 +1,78 @@
+import pytest
+
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.db.models.score import Score
+from src.db.models.score_history import ScoreHistory
+from src.persistence.utilities.company_crud import create_company
+from src.persistence.utilities.row_version import get_row_version
+from src.persistence.utilities.score_crud import create_scores, get_scores_version_by_company, \
+    get_scores_by_company_id
+
+
+@pytest.mark.unit
+def test_create_scores__replaces_score_for_same_company_and_year(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=1.0),
+                                     ScoreCreate(company_id=company.id, year=2021, zscore=2.0)])
+        db.commit()
+        db_scores = create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=3.0),
+                                                 ScoreCreate(company_id=company.id, year=2020, zscore=4.0)])
+        db.commit()
+        assert [(s.year, s.zscore) for s in db_scores] == [(2020, 4.0)]
+        assert sorted((s.year, s.zscore) for s in db.query(Score).all()) == [(2020, 4.0), (2021, 2.0)]
+
+
+@pytest.mark.unit
+def test_create_scores__history_enabled_retains_replaced_scores(mocker, sqlite_session_local, test_company_create_1):
+    mocker.patch("src.persistence.utilities.score_crud.SCORE_HISTORY_ENABLED", True)
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        first = create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=1.0)])[0]
+        db.commit()
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=2.0),
+                                     ScoreCreate(company_id=company.id, year=2021, zscore=3.0)])
+        db.commit()
+        history = db.query(ScoreHistory).all()
+        assert [(h.score_id, h.year, h.zscore) for h in history] == [(first.id, 2020, 1.0)]
+        assert history[0].replaced_at is not None
+        assert sorted((s.year, s.zscore) for s in db.query(Score).all()) == [(2020, 2.0), (2021, 3.0)]
+
+
+@pytest.mark.unit
+def test_create_scores__history_disabled_by_default(sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        for zscore in [1.0, 2.0]:
+            create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=zscore)])
+            db.commit()
+        assert db.query(ScoreHistory).count() == 0
+
+
+@pytest.mark.unit
+def test_get_scores_version_by_company__matches_loaded_rows_and_changes_on_write(sqlite_session_local,
+                                                                                 test_company_create_1):
+    with sqlite_session_local() as db:
+        assert get_scores_version_by_company(db=db, company_number="87654321", country_alpha_2_iso_code="GB") is None
+        company = create_company(db=db, company=test_company_create_1)
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=1.0),
+                                     ScoreCreate(company_id=company.id, year=2021, zscore=2.0)])
+        db.commit()
+        version = get_scores_version_by_company(db=db, company_number=company.company_number,
+                                                country_alpha_2_iso_code="GB", limit=1)
+        assert version == get_row_version(get_scores_by_company_id(db=db, id=company.id, limit=1))
+        assert version.count == 1
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=2020, zscore=3.0)])
+        db.commit()
+        assert get_scores_version_by_company(db=db, company_number=company.company_number,
+                                             country_alpha_2_iso_code="GB", limit=1) != version
+
+
+@pytest.mark.unit
+def test_create_scores__upserts_rows_in_key_order(mocker, sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        company = create_company(db=db, company=test_company_create_1)
+        scalars = mocker.spy(db, "scalars")
+        create_scores(db=db, scores=[ScoreCreate(company_id=company.id, year=year, zscore=1.0)
+                                     for year in (2022, 2020, 2021)])
+        assert [row["year"] for row in scalars.call_args.args[1]] == [2020, 2021, 2022]
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from src.persistence.utilities.score_history_cache import LruScoreHistoryBackend, SharedScoreHistoryBackend, \
+    ScoreHistoryCache
+
+
+class LocalRedis:
+    # Stand-in for a Redis client, implementing only the commands used by the shared backend
+    def __init__(self):
+        self.values: dict = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+
+    def sadd(self, key, *members):
+        self.values.setdefault(key, set()).update(m.encode() for m in members)
+
+    def smembers(self, key):
+        return set(self.values.get(key, set()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, *keys):
+        self.delete_thread = threading.current_thread()
+        for key in keys:
+            self.values.pop(key.decode() if isinstance(key, bytes) else key, None)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(params=["lru", "shared"])
+def cache(request):
+    if request.param == "lru":
+        return ScoreHistoryCache(LruScoreHistoryBackend(max_entries=10, ttl_seconds=60))
+    return ScoreHistoryCache(SharedScoreHistoryBackend(client=LocalRedis(), ttl_seconds=60))
+
+
+@pytest.mark.unit
+def test_score_history_cache__hit_and_miss(cache, test_score_1, test_score_2):
+    assert cache.get("GB", "12345678", 0, 100) is None
+    cache.put("GB", "12345678", 0, 100, None, [test_score_1, test_score_2])
+    assert cache.get("GB", "12345678", 0, 100) == [test_score_1, test_score_2]
+    assert cache.get("GB", "12345678", 0, 10) is None
+    assert cache.get("GB", "12345678", 0, 100, after_year=2020) is None
+    statistics = cache.statistics()
+    assert (statistics["hits"], statistics["misses"], statistics["hit_ratio"]) == (1, 3, 0.25)
+
+
+@pytest.mark.unit
+def test_score_history_cache__invalidate_company(cache, test_score_1):
+    cache.put("GB", "12345678", 0, 100, None, [test_score_1])
+    cache.put("GB", "12345678", 0, 1, None, [test_score_1])
+    cache.put("GB", "87654321", 0, 100, None, [])
+    cache.invalidate([("GB", "12345678"), ("GB", "12345678")])
+    assert cache.get("GB", "12345678", 0, 100) is None
+    assert cache.get("GB", "12345678", 0, 1) is None
+    assert cache.get("GB", "87654321", 0, 100) == []
+    assert cache.statistics()["invalidations"] == 2
+
+
+@pytest.mark.unit
+def test_lru_score_history_backend__evicts_least_recently_used(test_score_1):
+    cache = ScoreHistoryCache(LruScoreHistoryBackend(max_entries=2, ttl_seconds=60))
+    cache.put("GB", "1", 0, 100, None, [test_score_1])
+    cache.put("GB", "2", 0, 100, None, [test_score_1])
+    cache.get("GB", "1", 0, 100)
+    cache.put("GB", "3", 0, 100, None, [test_score_1])
+    assert cache.get("GB", "2", 0, 100) is None
+    assert cache.get("GB", "1", 0, 100) == [test_score_1]
+    assert cache.statistics()["size"] == 2
+    assert cache.statistics()["evictions"] == 1
+    cache.invalidate([("GB", "2")])
+    assert cache.statistics()["invalidations"] == 0
+
+
+@pytest.mark.unit
+def test_lru_score_history_backend__expired_entry(mocker, test_score_1):
+    mock_time = mocker.patch("src.persistence.utilities.score_history_cache.time.monotonic", return_value=100.0)
+    cache = ScoreHistoryCache(LruScoreHistoryBackend(max_entries=10, ttl_seconds=10))
+    cache.put("GB", "1", 0, 100, None, [test_score_1])
+    mock_time.return_value = 111.0
+    assert cache.get("GB", "1", 0, 100) is None
+    assert cache.statistics()["evictions"] == 1
+    assert cache.statistics()["size"] == 0
+
+
+@pytest.mark.unit
+def test_lru_score_history_backend__disabled_with_zero_size(test_score_1):
+    cache = ScoreHistoryCache(LruScoreHistoryBackend(max_entries=0, ttl_seconds=60))
+    cache.put("GB", "1", 0, 100, None, [test_score_1])
+    assert cache.get("GB", "1", 0, 100) is None
+
+
+@pytest.mark.unit
+@pytest.mark.anyio
+async def test_score_history_cache__shared_invalidate_async_off_event_loop(test_score_1):
+    client = LocalRedis()
+    cache = ScoreHistoryCache(SharedScoreHistoryBackend(client=client, ttl_seconds=60))
+    cache.put("GB", "12345678", 0, 100, None, [test_score_1])
+    await cache.invalidate_async([("GB", "12345678")])
+    assert client.delete_thread is not threading.current_thread()
+    assert cache.get("GB", "12345678", 0, 100) is None
+    assert cache.statistics()["invalidations"] == 1
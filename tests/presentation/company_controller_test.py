@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.persistence.utilities.pagination import decode_cursor
+from src.persistence.utilities.row_version import get_row_version
+
+
+@pytest.fixture(scope="module")
+def test_app():
+    client = TestClient(app)
+    yield client
+
+
+@pytest.mark.unit
+def test_get_all_companies__conditional_request(test_app, mocker, test_company_1):
+    mock_method = mocker.patch("src.presentation.company_controller.get_companies", return_value=[test_company_1])
+    mock_version_method = mocker.patch("src.presentation.company_controller.get_companies_version",
+                                       return_value=(get_row_version([test_company_1]), get_row_version([])))
+    response = test_app.get("/company")
+    assert response.status_code == 200
+    assert "Last-Modified" in response.headers
+    not_modified_response = test_app.get("/company", headers={"If-None-Match": response.headers["ETag"]})
+    assert not_modified_response.status_code == 304
+    assert test_app.get("/company", headers={"If-Modified-Since": response.headers["Last-Modified"]}) \
+               .status_code == 304
+    mock_method.assert_called_once()
+    assert mock_version_method.call_count == 2
+
+
+@pytest.mark.unit
+def test_get_all_companies__without_scores(test_app, mocker, test_company_1):
+    mock_method = mocker.patch("src.presentation.company_controller.get_companies", return_value=[test_company_1])
+    response = test_app.get("/company?include_scores=false&limit=1")
+    assert response.status_code == 200
+    assert [set(c) for c in response.json()] == [{"id", "company_number", "country_alpha_2_iso_code", "name",
+                                                  "created_at", "updated_at"}]
+    assert decode_cursor(response.headers["X-Next-Cursor"], int) == test_company_1.id
+    assert mock_method.call_args.kwargs["include_scores"] is False
+
+
+@pytest.mark.unit
+def test_get_all_companies__openapi_schema_covers_both_item_types(test_app):
+    schema = test_app.get("/openapi.json").json()["paths"]["/company"]["get"]["responses"]["200"]
+    assert [s["items"]["$ref"] for s in schema["content"]["application/json"]["schema"]["anyOf"]] == \
+           ["#/components/schemas/Company", "#/components/schemas/CompanySummary"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("limit", [0, -1])
+def test_get_all_companies__limit_below_one_rejected(test_app, mocker, limit):
+    mock_method = mocker.patch("src.presentation.company_controller.get_companies", return_value=[])
+    response = test_app.get("/company?limit=" + str(limit))
+    assert response.status_code == 422
+    assert "X-Next-Cursor" not in response.headers
+    mock_method.assert_not_called()
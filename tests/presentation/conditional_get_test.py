@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from src.persistence.utilities.row_version import RowVersion
+from src.presentation.conditional_get import get_etag, get_last_modified, is_not_modified, not_modified
+
+
+def request_with(headers: dict):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+@pytest.fixture
+def version():
+    return RowVersion(2, 7, datetime(2023, 3, 1, 12, 30, 15, 500, tzinfo=timezone.utc))
+
+
+@pytest.mark.unit
+def test_get_etag__strong_and_changes_with_version(version):
+    etag = get_etag(version)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert get_etag(version) == etag
+    assert get_etag(version._replace(max_id=8)) != etag
+    assert get_etag(version, RowVersion(0, None, None)) != etag
+
+
+@pytest.mark.unit
+def test_get_last_modified__latest_timestamp_in_seconds(version):
+    assert get_last_modified(version, RowVersion(0, None, None)) == datetime(2023, 3, 1, 12, 30, 15,
+                                                                             tzinfo=timezone.utc)
+    assert get_last_modified(RowVersion(0, None, None)) is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("headers,expected", [
+    ({}, False),
+    ({"If-None-Match": "ETAG"}, True),
+    ({"If-None-Match": '"other", ETAG'}, True),
+    ({"If-None-Match": "W/ETAG"}, True),
+    ({"If-None-Match": "*"}, True),
+    ({"If-None-Match": '"other"'}, False),
+    ({"If-None-Match": '"other"', "If-Modified-Since": "Wed, 01 Mar 2023 12:30:15 GMT"}, False),
+    ({"If-Modified-Since": "Wed, 01 Mar 2023 12:30:15 GMT"}, True),
+    ({"If-Modified-Since": "Wed, 01 Mar 2023 12:30:14 GMT"}, False),
+    ({"If-Modified-Since": "not a date"}, False)])
+def test_is_not_modified(version, headers, expected):
+    etag = get_etag(version)
+    headers = {k: v.replace("ETAG", etag) for k, v in headers.items()}
+    assert is_not_modified(request_with(headers), etag, get_last_modified(version)) is expected
+
+
+@pytest.mark.unit
+def test_not_modified__sets_validators(version):
+    response = not_modified(get_etag(version), get_last_modified(version))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == get_etag(version)
+    assert response.headers["Last-Modified"] == "Wed, 01 Mar 2023 12:30:15 GMT"
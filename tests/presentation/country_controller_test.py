@@ -3,6 +3,7 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
 
 from main import app
+from src.persistence.utilities.pagination import decode_cursor
 
 
 @pytest.fixture(scope="module")
@@ -49,6 +50,35 @@ def test_get_all_countries__with_no_existing_countries(test_app, mocker):
     mock_method.assert_called_once()
 
 
+@pytest.mark.unit
+def test_get_all_countries__full_page_returns_next_cursor(test_app, mocker, test_country_1, test_country_2):
+    mock_method = mocker.patch("src.presentation.country_controller.get_countries",
+                               return_value=[test_country_1, test_country_2])
+    response = test_app.get("/country?limit=2")
+    assert response.status_code == 200
+    assert decode_cursor(response.headers["X-Next-Cursor"], str) == test_country_2.alpha_2_iso_code
+    mock_method.assert_called_once()
+    response = test_app.get("/country?limit=2&cursor=" + response.headers["X-Next-Cursor"])
+    assert response.status_code == 200
+    assert mock_method.call_args.kwargs["after_alpha_2_iso_code"] == test_country_2.alpha_2_iso_code
+
+
+@pytest.mark.unit
+def test_get_all_countries__last_page_has_no_next_cursor(test_app, mocker, test_country_1):
+    mocker.patch("src.presentation.country_controller.get_countries", return_value=[test_country_1])
+    response = test_app.get("/country?limit=2")
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.unit
+def test_get_all_countries__invalid_cursor(test_app, mocker):
+    mock_method = mocker.patch("src.presentation.country_controller.get_countries")
+    response = test_app.get("/country?cursor=not-a-cursor")
+    assert response.status_code == 400
+    mock_method.assert_not_called()
+
+
 @pytest.mark.unit
 def test_create_new_country__with_valid_country(test_app, mocker, test_country_create_1, test_country_1):
     mock_get_method = mocker.patch("src.presentation.country_controller.get_country", return_value=None)
@@ -74,6 +104,18 @@ def test_create_new_country__with_invalid_country(test_app, mocker, test_country
     mock_create_method.assert_not_called()
 
 
+@pytest.mark.unit
+def test_create_new_country__with_invalid_company_number_regex(test_app, mocker, test_country_create_1):
+    mock_get_method = mocker.patch("src.presentation.country_controller.get_country", return_value=None)
+    mock_create_method = mocker.patch("src.presentation.country_controller.create_country")
+    json_country_create = jsonable_encoder(test_country_create_1)
+    json_country_create["company_number_regex"] = "^([a-zA-Z]{2}[0-9]{6}|[0-9]{8}$"
+    response = test_app.post("/country", json=json_country_create)
+    assert response.status_code == 422
+    mock_get_method.assert_not_called()
+    mock_create_method.assert_not_called()
+
+
 @pytest.mark.unit
 def test_create_new_country__with_existing_country(test_app, mocker, test_country_create_1, test_country_1):
     mock_get_method = mocker.patch("src.presentation.country_controller.get_country", return_value=test_country_1)
@@ -81,3 +123,11 @@ def test_create_new_country__with_existing_country(test_app, mocker, test_countr
     response = test_app.post("/country", json=json_country_create)
     assert response.status_code == 400
     mock_get_method.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("limit", [0, -1])
+def test_get_all_countries__limit_below_one_rejected(test_app, mocker, limit):
+    mock_method = mocker.patch("src.presentation.country_controller.get_countries", return_value=[])
+    assert test_app.get("/country?limit=" + str(limit)).status_code == 422
+    mock_method.assert_not_called()
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from main import app
+from src.business.pydantic_schemas.job import Job
+
+
+@pytest.fixture(scope="module")
+def test_app():
+    client = TestClient(app)
+    yield client
+
+
+@pytest.fixture
+def test_job():
+    return Job(id=7, kind="scores", status="queued", total_items=1, processed_items=0, cancel_requested=False,
+               created_at=datetime.now())
+
+
+@pytest.mark.unit
+def test_submit_scores_job__valid_request(test_app, mocker, test_job, test_batch_item_1):
+    mock_method = mocker.patch("src.presentation.job_controller.submit_score_job", return_value=test_job)
+    response = test_app.post("/jobs/scores", json={"items": jsonable_encoder([test_batch_item_1])})
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/jobs/7"
+    assert response.json() == jsonable_encoder(test_job)
+    mock_method.assert_called_once()
+
+
+@pytest.mark.unit
+def test_submit_scores_job__invalid_request(test_app, mocker):
+    mock_method = mocker.patch("src.presentation.job_controller.submit_score_job")
+    response = test_app.post("/jobs/scores", json={"items": [{"country_iso_code": "GB"}]})
+    assert response.status_code == 422
+    mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+def test_get_job_status__existing_and_missing_job(test_app, mocker, test_job):
+    mocker.patch("src.presentation.job_controller.get_job", side_effect=[test_job, None])
+    assert test_app.get("/jobs/7").json() == jsonable_encoder(test_job)
+    assert test_app.get("/jobs/8").status_code == 404
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("status, expected_status_code", [("cancelled", 200), ("running", 200), ("succeeded", 409)])
+def test_cancel_scores_job(test_app, mocker, test_job, status, expected_status_code):
+    mocker.patch("src.presentation.job_controller.cancel_job", return_value=test_job.copy(update={"status": status}))
+    response = test_app.post("/jobs/7/cancel")
+    assert response.status_code == expected_status_code
+
+
+@pytest.mark.unit
+def test_cancel_scores_job__missing_job(test_app, mocker):
+    mocker.patch("src.presentation.job_controller.cancel_job", return_value=None)
+    assert test_app.post("/jobs/8/cancel").status_code == 404
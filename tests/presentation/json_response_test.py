@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from main import app
+from src.business.pydantic_schemas.score import ScoreCreate
+from src.db.db_setup import get_session
+from src.db.models.country import Country
+from src.persistence.utilities.company_crud import create_companies
+from src.persistence.utilities.score_crud import create_scores
+from src.presentation import json_response
+from src.presentation.json_response import FastJSONResponse
+
+
+@pytest.fixture(scope="module")
+def test_app():
+    client = TestClient(app)
+    yield client
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, mocker):
+    if request.param == "json":
+        mocker.patch("src.presentation.json_response.orjson", None)
+    return request.param
+
+
+@pytest.fixture
+def seeded_session_local(sqlite_session_local, test_company_create_1, test_company_create_2):
+    with sqlite_session_local() as db:
+        db.add(Country(alpha_2_iso_code="DE", name="Deutschland – Ärger", company_number_regex=None))
+        companies = create_companies(db=db, companies=[test_company_create_1, test_company_create_2])
+        create_scores(db=db, scores=[ScoreCreate(company_id=c.id, year=year, zscore=round(i * 1.37 - year / 1000, 2))
+                                     for i, c in enumerate(companies) for year in (2021, 2019, 2020)])
+        db.commit()
+
+    def get_sqlite_session():
+        db = sqlite_session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_session] = get_sqlite_session
+    yield sqlite_session_local
+    app.dependency_overrides.pop(get_session)
+
+
+@pytest.mark.unit
+def test_fast_json_response__same_bytes_as_json_response(encoder):
+    content = [{"name": "Société générale", "zscore": 6.54, "negative": -0.5, "none": None, "nested": [1, True],
+                "created_at": datetime(2023, 3, 1, 12, 30, 15), "updated_at": datetime(2023, 3, 1, 12, 30, 15, 500)}]
+    assert FastJSONResponse(content).body == JSONResponse(
+        [{**c, "created_at": c["created_at"].isoformat(), "updated_at": c["updated_at"].isoformat()}
+         for c in content]).body
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("url", ["/company", "/company?limit=1", "/company?skip=1",
+                                 "/company?include_scores=false", "/country", "/country?limit=1"])
+def test_list_endpoints__fast_path_returns_identical_bytes(test_app, mocker, seeded_session_local, encoder, url):
+    settings = mocker.patch("src.db.config.get_settings").return_value
+    settings.fast_json_responses = False
+    response = test_app.get(url)
+    settings.fast_json_responses = True
+    fast_response = test_app.get(url)
+    assert fast_response.status_code == response.status_code == 200
+    assert fast_response.content == response.content
+    for header in ("content-type", "content-length", "etag", "last-modified", "x-next-cursor"):
+        assert fast_response.headers.get(header) == response.headers.get(header)
+
+
+@pytest.mark.unit
+def test_fast_json_response__large_floats_same_value(encoder):
+    content = [{"zscore": 1e20}, {"zscore": -2.5e17}, {"zscore": 1.5e-05}]
+    body = FastJSONResponse(content).body
+    assert json.loads(body) == json.loads(JSONResponse(content).body) == content
+    if json_response.orjson is None:
+        assert body == JSONResponse(content).body
+    else:
+        assert body == b'[{"zscore":1e20},{"zscore":-2.5e17},{"zscore":0.000015}]'
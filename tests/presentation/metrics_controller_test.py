@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from main import app
+from src.db.pool_metrics import TimedQueuePool
+
+
+@pytest.fixture(scope="module")
+def test_app():
+    client = TestClient(app)
+    yield client
+
+
+@pytest.fixture
+def pooled_engine(mocker):
+    # The configured engine has no pool statistics with in-memory SQLite, so the pool endpoints get their own
+    mocker.patch("src.presentation.metrics_controller.engine", create_engine("sqlite://", poolclass=TimedQueuePool))
+    mocker.patch("src.presentation.metrics_controller.async_engine", None)
+
+
+@pytest.mark.unit
+def test_get_pool_metrics(test_app, pooled_engine):
+    response = test_app.get("/metrics/pool")
+    assert response.status_code == 200
+    assert response.json()["async"] is None
+    assert set(response.json()["sync"]) == {"pool_size", "max_overflow", "checked_out", "checked_in", "overflow",
+                                            "checkouts", "timeouts", "wait_seconds_total", "wait_seconds_avg",
+                                            "wait_seconds_max"}
+
+
+@pytest.mark.unit
+def test_get_cache_metrics(test_app):
+    response = test_app.get("/metrics/cache")
+    assert response.status_code == 200
+    for cache in ("country", "score_history"):
+        assert set(response.json()[cache]) == {"size", "hits", "misses", "evictions", "invalidations", "hit_ratio"}
+
+
+@pytest.mark.unit
+def test_get_prometheus_metrics(test_app, pooled_engine):
+    test_app.get("/metrics/pool")
+    response = test_app.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    for metric in ("http_requests_total", "http_request_duration_seconds", "http_requests_in_progress",
+                   "scores_calculated_total", "scores_persisted_total", "companies_created_total",
+                   "financials_rejected_total", "db_pool_checked_out"):
+        assert "# TYPE " + metric + " " in response.text
+    assert 'http_requests_total{method="GET",route="/metrics/pool",status="200"}' in response.text
+    assert 'db_pool_size{pool="sync"}' in response.text
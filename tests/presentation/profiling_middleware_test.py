@@ -0,0 +1,102 @@
+import marshal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.db import config
+from src.db.db_setup import run_in_session, get_session
+from src.persistence.utilities.company_crud import create_company
+from src.presentation import profile_controller
+from src.presentation.company_controller import company_router
+from src.presentation.profile_controller import profile_router
+from src.presentation.profiling_middleware import ProfilingMiddleware, ProfileStore
+
+
+def score_in_threadpool(db, n: int):
+    return sum(range(n))
+
+
+def create_test_app(mocker, token: str | None, sample_rate: float):
+    store = ProfileStore(max_profiles=2)
+    mocker.patch.object(profile_controller, "profile_store", store)
+    mocker.patch.object(config.get_settings(), "profiling_token", token)
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"result": await run_in_session(None, score_in_threadpool, n=100)}
+
+    app.include_router(profile_router)
+    app.add_middleware(ProfilingMiddleware, token=token, sample_rate=sample_rate, store=store)
+    return TestClient(app), store
+
+
+@pytest.mark.unit
+def test_profiling_middleware__profiles_requests_with_token(mocker):
+    client, store = create_test_app(mocker, token="secret", sample_rate=0.0)
+    assert "x-profile-id" not in client.get("/work").headers
+    assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "wrong"}).headers
+    response = client.get("/work", headers={"X-Profile": "secret"})
+    assert response.json() == {"result": 4950}
+    profile_id = response.headers["x-profile-id"]
+    headers = {"X-Profile": "secret"}
+    assert [p["route"] for p in client.get("/profiles", headers=headers).json()] == ["GET /work"]
+
+    download = client.get("/profiles/" + profile_id, headers=headers)
+    assert download.headers["content-disposition"] == 'attachment; filename="profile-' + profile_id + '.pstats"'
+    assert "score_in_threadpool" in {f[2] for f in marshal.loads(download.content)}
+    assert "score_in_threadpool" in client.get("/profiles/" + profile_id, headers=headers,
+                                               params={"format": "text", "limit": 1000}).text
+    assert client.get("/profiles/999", headers=headers).status_code == 404
+
+
+@pytest.mark.unit
+def test_profile_controller__requires_token(mocker):
+    client, store = create_test_app(mocker, token="secret", sample_rate=1.0)
+    profile_id = client.get("/work").headers["x-profile-id"]
+    for path in ("/profiles", "/profiles/" + profile_id):
+        assert client.get(path).status_code == 403
+        assert client.get(path, headers={"X-Profile": "wrong"}).status_code == 403
+        assert client.get(path, headers={"X-Profile": "secret"}).status_code == 200
+
+
+@pytest.mark.unit
+def test_profile_controller__no_access_without_configured_token(mocker):
+    client, store = create_test_app(mocker, token=None, sample_rate=1.0)
+    client.get("/work")
+    assert client.get("/profiles").status_code == 403
+    assert client.get("/profiles", headers={"X-Profile": ""}).status_code == 403
+
+
+@pytest.mark.unit
+def test_profiling_middleware__sample_rate_and_store_limit(mocker):
+    client, store = create_test_app(mocker, token=None, sample_rate=1.0)
+    profile_ids = [client.get("/work").headers["x-profile-id"] for _ in range(3)]
+    assert [p.id for p in store.list()] == [int(profile_ids[2]), int(profile_ids[1])]
+
+
+@pytest.mark.unit
+def test_profiling_middleware__profiles_db_backed_route(mocker, sqlite_session_local, test_company_create_1):
+    with sqlite_session_local() as db:
+        create_company(db=db, company=test_company_create_1)
+
+    def get_sqlite_session():
+        db = sqlite_session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    store = ProfileStore(max_profiles=2)
+    app = FastAPI()
+    app.include_router(company_router)
+    app.add_middleware(ProfilingMiddleware, token="secret", store=store)
+    app.dependency_overrides[get_session] = get_sqlite_session
+    response = TestClient(app).get("/company", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    assert [c["company_number"] for c in response.json()] == ["12345678"]
+    profile = store.get(int(response.headers["x-profile-id"]))
+    assert profile.status == 200
+    # The query ran in the threadpool and is part of the profile
+    assert any(f[0].endswith("company_crud.py") for f in profile.profile.stats().stats)
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.db.db_setup import get_session
+from src.db.query_metrics import instrument_engine
+from src.persistence.utilities.company_crud import create_company
+
+
+@pytest.fixture(scope="module")
+def test_app():
+    client = TestClient(app)
+    yield client
+
+
+@pytest.fixture
+def instrumented_session_local(sqlite_session_local, test_company_create_1):
+    instrument_engine(sqlite_session_local.kw["bind"])
+    with sqlite_session_local() as db:
+        create_company(db=db, company=test_company_create_1)
+
+    def get_sqlite_session():
+        db = sqlite_session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_session] = get_sqlite_session
+    yield sqlite_session_local
+    app.dependency_overrides.pop(get_session)
+
+
+@pytest.mark.unit
+def test_query_metrics_middleware__server_timing_and_route_statistics(test_app, instrumented_session_local):
+    assert test_app.delete("/metrics/queries").status_code == 204
+    for _ in range(3):
+        response = test_app.get("/company")
+        assert response.status_code == 200
+        assert re.fullmatch(r'db;dur=[0-9.]+;desc="2 queries", db-slowest;dur=[0-9.]+, db-pool;dur=[0-9.]+, '
+                            r'app;dur=[0-9.]+', response.headers["Server-Timing"])
+    test_app.get("/company/GB/12345678")
+    test_app.get("/not-a-route")
+    statistics = {s["route"]: s for s in test_app.get("/metrics/queries").json()}
+    assert statistics["GET /company"]["requests"] == 3
+    assert statistics["GET /company"]["queries_total"] == 6
+    assert statistics["GET /company"]["slowest_statement"].startswith("SELECT")
+    assert statistics["GET /company/{country_iso_code}/{company_number}"]["requests"] == 1
+    assert statistics["GET <unmatched>"]["queries_total"] == 0
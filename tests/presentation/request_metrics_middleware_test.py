@@ -0,0 +1,42 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.business.app_metrics import http_requests_total, http_request_duration_seconds, http_requests_in_progress
+from src.presentation.request_metrics_middleware import RequestMetricsMiddleware
+
+
+@pytest.fixture
+def test_app():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    @app.get("/error")
+    async def get_error():
+        raise RuntimeError("Failed")
+
+    app.add_middleware(RequestMetricsMiddleware)
+    http_requests_total.reset()
+    http_request_duration_seconds.reset()
+    yield TestClient(app, raise_server_exceptions=False)
+    http_requests_total.reset()
+    http_request_duration_seconds.reset()
+
+
+@pytest.mark.unit
+def test_request_metrics_middleware__counts_requests_by_route_and_status(test_app):
+    for item_id in (1, 2, 0):
+        test_app.get("/items/" + str(item_id))
+    test_app.get("/error")
+    test_app.get("/not-a-route")
+    assert http_requests_total.value(("GET", "/items/{item_id}", "200")) == 2
+    assert http_requests_total.value(("GET", "/items/{item_id}", "404")) == 1
+    assert http_requests_total.value(("GET", "/error", "500")) == 1
+    assert http_requests_total.value(("GET", "<unmatched>", "404")) == 1
+    assert http_request_duration_seconds.count(("GET", "/items/{item_id}")) == 3
+    assert http_requests_in_progress.value() == 0
@@ -1,9 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
 import pytest
 from fastapi.encoders import jsonable_encoder
 
 from fastapi.testclient import TestClient
 
 from main import app
+from src.business.company_service import get_company_by_company_number_and_iso_code
+from src.business.pydantic_schemas.batch_score import BatchScoreReport, BatchScoreResult
+from src.business.pydantic_schemas.score_import import ScoreImportReport, ScoreImportError
+from src.db.db_setup import get_session
+from src.db.models.company import Company
+from src.db.models.score import Score
+from src.persistence.utilities.row_version import get_row_version
+from src.persistence.utilities.score_history_cache import score_history_cache
 
 
 @pytest.fixture(scope="module")
@@ -12,6 +23,13 @@ def test_app():
     yield client
 
 
+@pytest.fixture(autouse=True)
+def clear_score_history_cache():
+    score_history_cache.clear()
+    yield
+    score_history_cache.clear()
+
+
 @pytest.mark.unit
 def test_calculate_score__valid_request_1(test_app, mocker, test_company_1, test_financials_1, test_score_base_1):
     mock_method_1 = mocker.patch("src.presentation.score_controller.get_or_create_company", return_value=test_company_1)
@@ -108,6 +126,52 @@ def test_get_scores_by_company__existing_company_with_score(test_app, mocker, te
     mock_score_method.assert_called_once()
 
 
+@pytest.mark.unit
+def test_get_scores_by_company__served_from_cache(test_app, mocker, test_company_create_1, test_company_1,
+                                                  test_score_1):
+    mock_company_method = mocker.patch("src.presentation.score_controller.get_company_by_company_number_and_iso_code",
+                                       return_value=test_company_1)
+    mock_score_method = mocker.patch("src.presentation.score_controller.get_scores_by_company_id",
+                                     return_value=[test_score_1])
+    url = "/company/" + test_company_create_1.country_alpha_2_iso_code + "/" + test_company_create_1.company_number
+    first_response = test_app.get(url)
+    second_response = test_app.get(url)
+    assert second_response.status_code == 200
+    assert second_response.json() == first_response.json() == {"scores": [jsonable_encoder(test_score_1)]}
+    mock_company_method.assert_called_once()
+    mock_score_method.assert_called_once()
+    assert test_app.get(url + "?limit=1").json() == first_response.json()
+    assert mock_score_method.call_count == 2
+    score_history_cache.invalidate([(test_company_create_1.country_alpha_2_iso_code,
+                                     test_company_create_1.company_number)])
+    test_app.get(url)
+    assert mock_score_method.call_count == 3
+
+
+@pytest.mark.unit
+def test_get_scores_by_company__conditional_request(test_app, mocker, test_company_create_1, test_company_1,
+                                                    test_score_1):
+    mocker.patch("src.presentation.score_controller.get_company_by_company_number_and_iso_code",
+                 return_value=test_company_1)
+    mock_score_method = mocker.patch("src.presentation.score_controller.get_scores_by_company_id",
+                                     return_value=[test_score_1])
+    mock_version_method = mocker.patch("src.presentation.score_controller.get_scores_version_by_company",
+                                       return_value=get_row_version([test_score_1]))
+    url = "/company/" + test_company_create_1.country_alpha_2_iso_code + "/" + test_company_create_1.company_number
+    response = test_app.get(url)
+    assert response.status_code == 200
+    mock_version_method.assert_not_called()
+    etag = response.headers["ETag"]
+    not_modified_response = test_app.get(url, headers={"If-None-Match": etag})
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["ETag"] == etag
+    assert not_modified_response.content == b""
+    assert test_app.get(url, headers={"If-Modified-Since": response.headers["Last-Modified"]}).status_code == 304
+    assert mock_score_method.call_count == 1
+    mock_version_method.return_value = mock_version_method.return_value._replace(count=2)
+    assert test_app.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
 @pytest.mark.unit
 def test_get_scores_by_company__company_does_not_exist(test_app, mocker, test_company_create_1):
     mock_method = mocker.patch("src.presentation.score_controller.get_company_by_company_number_and_iso_code",
@@ -127,3 +191,145 @@ def test_get_scores_by_company__invalid_request(test_app, mocker, test_input):
     response = test_app.get("/company/" + test_input + "/12345678")
     assert response.status_code == 422
     mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+def test_calculate_batch_scores__valid_request(test_app, mocker, test_batch_item_1, test_batch_item_2,
+                                               test_score_list):
+    report = BatchScoreReport(succeeded=1, failed=1, results=[
+        BatchScoreResult(country_iso_code=test_batch_item_1.country_iso_code,
+                         company_number=test_batch_item_1.company_number, success=True, scores=test_score_list),
+        BatchScoreResult(country_iso_code=test_batch_item_2.country_iso_code,
+                         company_number=test_batch_item_2.company_number, success=False, detail="Failed")])
+    mock_method = mocker.patch("src.presentation.score_controller.request_batch_scores", return_value=report)
+    response = test_app.post("/scores/batch",
+                             json={"items": jsonable_encoder([test_batch_item_1, test_batch_item_2])})
+    assert response.status_code == 200
+    assert response.json() == jsonable_encoder(report)
+    mock_method.assert_called_once()
+
+
+@pytest.mark.unit
+def test_calculate_batch_scores__invalid_request(test_app, mocker):
+    mock_method = mocker.patch("src.presentation.score_controller.request_batch_scores")
+    response = test_app.post("/scores/batch", json={"items": [{"country_iso_code": "GB"}]})
+    assert response.status_code == 422
+    mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("export_format, media_type", [("ndjson", "application/x-ndjson"), ("csv", "text/csv")])
+def test_export_all_scores__valid_request(test_app, mocker, export_format, media_type):
+    mock_method = mocker.patch("src.presentation.score_controller.export_scores", return_value=iter(["a\n", "b\n"]))
+    response = test_app.get("/scores/export?format=" + export_format + "&country=GB&year_from=2019&year_to=2021")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert response.text == "a\nb\n"
+    assert mock_method.call_args.kwargs["export_format"] == export_format
+    assert mock_method.call_args.kwargs["country_iso_code"] == "GB"
+    assert mock_method.call_args.kwargs["year_from"] == 2019
+    assert mock_method.call_args.kwargs["year_to"] == 2021
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("query", ["format=xml", "country=gb", "year_from=abc"])
+def test_export_all_scores__invalid_request(test_app, mocker, query):
+    mock_method = mocker.patch("src.presentation.score_controller.export_scores")
+    response = test_app.get("/scores/export?" + query)
+    assert response.status_code == 422
+    mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+def test_import_all_scores__valid_request(test_app, mocker):
+    report = ScoreImportReport(rows=2, succeeded=1, failed=1, errors=[ScoreImportError(line=2, detail="Failed")])
+    mock_method = mocker.patch("src.presentation.score_controller.import_scores_stream", return_value=report)
+    response = test_app.post("/scores/import?format=csv&chunk_size=500", content=b"header\nrow\nrow\n")
+    assert response.status_code == 200
+    assert response.json() == jsonable_encoder(report)
+    assert mock_method.call_args.kwargs["import_format"] == "csv"
+    assert mock_method.call_args.kwargs["chunk_size"] == 500
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("query", ["format=xml", "chunk_size=0"])
+def test_import_all_scores__invalid_request(test_app, mocker, query):
+    mock_method = mocker.patch("src.presentation.score_controller.import_scores_stream")
+    response = test_app.post("/scores/import?" + query, content=b"")
+    assert response.status_code == 422
+    mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+def test_calculate_score__parallel_requests_for_same_new_company(test_app, mocker, sqlite_session_local,
+                                                                 test_financials_1):
+    def get_sqlite_session():
+        db = sqlite_session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # Hold every request after its lookup until all of them have seen that the company doesn't exist yet
+    barrier = Barrier(8, timeout=10)
+
+    def get_company_then_wait(**kwargs):
+        existing_company = get_company_by_company_number_and_iso_code(**kwargs)
+        barrier.wait()
+        return existing_company
+
+    mocker.patch("src.business.company_service.get_company_by_company_number_and_iso_code",
+                 side_effect=get_company_then_wait)
+    app.dependency_overrides[get_session] = get_sqlite_session
+    json_financials = {"financials": [jsonable_encoder(test_financials_1)]}
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: test_app.post("/company/GB/87654321", json=json_financials),
+                                          range(8)))
+    finally:
+        app.dependency_overrides.pop(get_session)
+    assert [r.status_code for r in responses] == [200] * 8
+    with sqlite_session_local() as db:
+        assert db.query(Company).filter(Company.company_number == "87654321").count() == 1
+        assert db.query(Score).count() == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("limit", [0, -1])
+def test_get_scores_by_company__limit_below_one_rejected(test_app, mocker, limit):
+    mock_method = mocker.patch("src.presentation.score_controller.get_scores_by_company_id", return_value=[])
+    assert test_app.get("/company/GB/12345678?limit=" + str(limit)).status_code == 422
+    mock_method.assert_not_called()
+
+
+@pytest.mark.unit
+def test_calculate_score__invalidates_score_history_cache(test_app, mocker, test_company_1, test_financials_1,
+                                                          test_score_base_1):
+    mocker.patch("src.presentation.score_controller.get_or_create_company", return_value=test_company_1)
+    mocker.patch("src.presentation.score_controller.validate_financials", return_value=True)
+    mocker.patch("src.presentation.score_controller.request_scores", return_value=[test_score_base_1])
+    mock_invalidate = mocker.patch.object(score_history_cache, "invalidate_async")
+    response = test_app.post("/company/" +
+                             test_company_1.country_alpha_2_iso_code + "/" +
+                             test_company_1.company_number,
+                             json={"financials": [jsonable_encoder(test_financials_1)]})
+    assert response.status_code == 200
+    mock_invalidate.assert_awaited_once_with([(test_company_1.country_alpha_2_iso_code,
+                                               test_company_1.company_number)])
+
+
+@pytest.mark.unit
+def test_calculate_batch_scores__invalidates_score_history_cache(test_app, mocker, test_batch_item_1,
+                                                                 test_batch_item_2, test_score_list):
+    report = BatchScoreReport(succeeded=1, failed=1, results=[
+        BatchScoreResult(country_iso_code=test_batch_item_1.country_iso_code,
+                         company_number=test_batch_item_1.company_number, success=True, scores=test_score_list),
+        BatchScoreResult(country_iso_code=test_batch_item_2.country_iso_code,
+                         company_number=test_batch_item_2.company_number, success=False, detail="Failed")])
+    mocker.patch("src.presentation.score_controller.request_batch_scores", return_value=report)
+    mock_invalidate = mocker.patch.object(score_history_cache, "invalidate_async")
+    response = test_app.post("/scores/batch",
+                             json={"items": jsonable_encoder([test_batch_item_1, test_batch_item_2])})
+    assert response.status_code == 200
+    mock_invalidate.assert_awaited_once_with([(test_batch_item_1.country_iso_code,
+                                               test_batch_item_1.company_number)])